@@ -0,0 +1,244 @@
+import argparse
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from backend.listing_store import normalize_link
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serializes writers
+    fcntl = None
+
+# === Settings ===
+APPLICATION_LEDGER_PATH = os.getenv("APPLICATION_LEDGER_PATH", "applications.jsonl")
+LEGACY_LOG_PATH = "submitted_log.txt"
+LEGACY_DETAILS_PATH = "submitted_details.json"
+
+# Windows opens low-level descriptors in text mode unless asked not to
+O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def read_at(fd, size, offset):
+    """Up to `size` bytes from `offset`; os.pread is not available on Windows."""
+    os.lseek(fd, offset, os.SEEK_SET)
+    chunks = []
+    while size > 0:
+        chunk = os.read(fd, size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class ApplicationLedger:
+    """Append-only JSONL record of applications, indexed in memory by normalized link.
+
+    Every record is flushed and fsync'ed before `record` returns, so a crash can at
+    worst leave one torn last line, which is skipped on load. Later lines for the
+    same link win; `compact` drops the superseded ones. Lines appended by other
+    processes are picked up by `refresh` and before every append.
+    """
+
+    def __init__(self, path=APPLICATION_LEDGER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = {}
+        self._lines = 0
+        # Bytes of the file already indexed; anything after it was written by another process
+        self._offset = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            self._read_new(f.fileno())
+
+    def _read_new(self, fd):
+        """Index complete lines past `_offset`; a torn last line is left for the next read."""
+        size = os.fstat(fd).st_size
+        if size <= self._offset:
+            return
+        data = read_at(fd, size - self._offset, self._offset)
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping unreadable ledger line in {self.path}")
+                continue
+            # Hand-edited or migrated lines may lack the normalized link
+            if not isinstance(entry, dict) or not entry.get("key"):
+                print(f"⚠️ Skipping ledger line without a key in {self.path}")
+                continue
+            self._index[entry["key"]] = entry
+            self._lines += 1
+        self._offset += end
+
+    def refresh(self):
+        """Pick up applications recorded by other processes since the last read."""
+        if not os.path.exists(self.path):
+            return 0
+        with self._lock:
+            before = self._lines
+            with open(self.path, "rb") as f:
+                self._read_new(f.fileno())
+            return self._lines - before
+
+    def _append(self, entries):
+        payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        # Open with O_APPEND so writes from other processes interleave by whole lines
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND | O_BINARY, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            # Index what other processes appended first, so the offset stays in step
+            self._read_new(fd)
+            # Terminate a torn last line from a crash so it doesn't swallow this record
+            size = os.fstat(fd).st_size
+            if size and read_at(fd, 1, size - 1) != b"\n":
+                payload = "\n" + payload
+            data = payload.encode("utf-8")
+            os.write(fd, data)
+            os.fsync(fd)
+            self._offset = size + len(data)
+        finally:
+            os.close(fd)
+
+    # === Lookups ===
+    def has_applied(self, link):
+        return normalize_link(link) in self._index
+
+    __contains__ = has_applied
+
+    def get(self, link):
+        return self._index.get(normalize_link(link))
+
+    def entries(self):
+        with self._lock:
+            return list(self._index.values())
+
+    def __len__(self):
+        return len(self._index)
+
+    # === Writes ===
+    def record(self, link, title="Unknown Title", company="Unknown Company", status="applied", timestamp=None):
+        entry = {
+            "key": normalize_link(link),
+            "title": title,
+            "company": company,
+            "link": link,
+            "status": status,
+            "timestamp": timestamp or datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._append([entry])
+            self._index[entry["key"]] = entry
+            self._lines += 1
+        return entry
+
+    def compact(self):
+        """Rewrite the ledger with one line per link, replacing the file atomically.
+
+        Run it while no other process is applying; their appends to the old file would be lost.
+        """
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(prefix=".ledger-", suffix=".jsonl", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    for entry in self._index.values():
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+            dropped = self._lines - len(self._index)
+            self._lines = len(self._index)
+            self._offset = os.path.getsize(self.path)
+            return dropped
+
+    def migrate_legacy(self, log_path=LEGACY_LOG_PATH, details_path=LEGACY_DETAILS_PATH):
+        """Import submitted_details.json and submitted_log.txt; links already in the ledger are skipped."""
+        new_entries = {}
+
+        if os.path.exists(details_path):
+            try:
+                with open(details_path, "r", encoding="utf-8") as f:
+                    details = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Could not read {details_path}: {e}")
+                details = []
+            for item in details:
+                link = item.get("link", "")
+                key = normalize_link(link)
+                if key and key not in self._index:
+                    new_entries[key] = {
+                        "key": key,
+                        "title": item.get("title", "Unknown Title"),
+                        "company": item.get("company", "Unknown Company"),
+                        "link": link,
+                        "status": "applied",
+                        "timestamp": item.get("timestamp"),
+                    }
+
+        if os.path.exists(log_path):
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    key = normalize_link(line)
+                    if key and key not in self._index and key not in new_entries:
+                        new_entries[key] = {
+                            "key": key,
+                            "title": "Unknown Title",
+                            "company": "Unknown Company",
+                            "link": line.strip(),
+                            "status": "applied",
+                            "timestamp": None,
+                        }
+
+        if new_entries:
+            with self._lock:
+                self._append(new_entries.values())
+                self._index.update(new_entries)
+                self._lines += len(new_entries)
+            print(f"📥 Migrated {len(new_entries)} applications into {self.path}")
+        return len(new_entries)
+
+    def stats(self):
+        return {"path": self.path, "applications": len(self._index), "lines": self._lines}
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_application_ledger():
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = ApplicationLedger()
+            _ledger.migrate_legacy()
+        return _ledger
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the application ledger.")
+    parser.add_argument("command", choices=["compact", "migrate", "stats"])
+    args = parser.parse_args()
+
+    ledger = ApplicationLedger()
+    if args.command == "compact":
+        print(f"🧹 Compacted {ledger.path}: dropped {ledger.compact()} superseded line(s).")
+    elif args.command == "migrate":
+        print(f"📥 Migrated {ledger.migrate_legacy()} application(s).")
+    else:
+        print(ledger.stats())
@@ -1,81 +1,81 @@
-def auto_apply(max_jobs=1):
-    import os
-    import csv
-    import time
-    import json
+import os
+import threading
+import time
+
+# === Settings ===
+# Parallel Chrome workers per run; capped by the driver pool size.
+APPLY_WORKERS = int(os.getenv("APPLY_WORKERS", "1"))
+APPLY_WORKERS_CAP = int(os.getenv("APPLY_WORKERS_CAP", "4"))
+# Applications started per minute across all workers, with short bursts up to APPLY_BURST.
+APPLY_RATE_PER_MINUTE = float(os.getenv("APPLY_RATE_PER_MINUTE", "6"))
+APPLY_BURST = int(os.getenv("APPLY_BURST", "2"))
+# Consecutive failures that stop one worker, and that stop every worker.
+MAX_FAILURES = int(os.getenv("APPLY_MAX_FAILURES", "3"))
+GLOBAL_MAX_FAILURES = int(os.getenv("APPLY_GLOBAL_MAX_FAILURES", "5"))
+
+APPLIED = "applied"
+ALREADY_APPLIED = "already_applied"
+FAILED = "failed"
+
+
+def auto_apply(max_jobs=1, cancel_event=None, workers=APPLY_WORKERS, listings=None, resume_text="", titles=()):
+    """Apply to the best-ranked stored internships with `workers` Chrome sessions in parallel.
+
+    Workers share one queue of pending listings and one token bucket. A worker stops
+    after MAX_FAILURES consecutive failures, and every worker stops after
+    GLOBAL_MAX_FAILURES consecutive failures across all of them.
+
+    Stored listings are tried best match for `resume_text` and `titles` first, newest
+    first without them. `listings` replaces the stored listings with any iterable of
+    listing dicts; it may block while it waits for the next one (e.g. listings still
+    being scraped).
+    """
     import traceback
-    from datetime import datetime
-    from dotenv import load_dotenv
-    from together import Together
-    from selenium import webdriver
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-
-    load_dotenv()
-    TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
-    EMAIL = os.getenv("INTERNSHALA_EMAIL")
-    PASSWORD = os.getenv("INTERNSHALA_PASSWORD")
-
-    client = Together(api_key=TOGETHER_API_KEY)
-
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    driver = webdriver.Chrome(options=options)
+    from backend.browser_profile import page_weights, record_page_weight
+    from backend.driver_pool import get_driver_pool
+    from backend.metrics import applications, stage_timer
+    from backend.ranking import iter_ranked_listings
+    from backend.application_ledger import get_application_ledger
+    from backend.internshala_session import LoginError, get_internshala_session
+    from backend.listing_store import normalize_link
+    from backend.throttle import CircuitBreaker, TokenBucket
+    from backend.waits import (
+        any_of, in_viewport, page_source_contains, url_contains_any, wait_for, wait_for_dismissed,
+        wait_for_element, wait_for_page, wait_stats,
+    )
 
     MAX_APPLICATIONS = max_jobs
-    MAX_FAILURES = 3
-    applications_done = 0
-    consecutive_failures = 0
     applied_jobs = []
 
-    def log_submission(link, title="Unknown Title", company="Unknown Company"):
-        with open("submitted_log.txt", "a", encoding="utf-8") as log_file:
-            log_file.write(f"{link.strip().rstrip('/')}\n")
-
-        entry = {
-            "title": title,
-            "company": company,
-            "link": link,
-            "timestamp": datetime.now().isoformat()
-        }
-
-        file_path = "submitted_details.json"
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-            except:
-                existing = []
-        else:
-            existing = []
-
-        existing.append(entry)
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(existing, f, indent=2)
-
-        applied_jobs.append(entry)
-
-    def close_popup_modal():
+    def log_submission(link, title="Unknown Title", company="Unknown Company", status="applied"):
+        entry = ledger.record(link, title, company, status=status)
+        with progress:
+            applied_jobs.append({
+                "title": entry["title"],
+                "company": entry["company"],
+                "link": entry["link"],
+                "timestamp": entry["timestamp"],
+            })
+
+    def close_popup_modal(driver):
         try:
             close_btn = driver.find_element(By.ID, "close_popup")
             driver.execute_script("arguments[0].click();", close_btn)
             print("✅ Closed popup modal.")
-            time.sleep(1)
+            wait_for_dismissed(driver, (By.ID, "close_popup"), fixed=1)
         except:
             try:
                 generic_close = driver.find_elements(By.XPATH, "//button[contains(text(),'×') or contains(text(),'Close')]")
                 if generic_close:
                     driver.execute_script("arguments[0].click();", generic_close[0])
                     print("✅ Closed generic modal.")
-                    time.sleep(1)
+                    wait_for(driver, "modal_dismissed", EC.invisibility_of_element(generic_close[0]), kind="modal", fixed=1)
             except:
                 print("⚠️ No modal to close.")
 
-    def click_apply_now():
+    def click_apply_now(driver):
         try:
             apply_btn = driver.find_element(By.CLASS_NAME, "apply_now_btn")
             if "disabled" in apply_btn.get_attribute("class") and "already applied" in apply_btn.text.lower():
@@ -86,9 +86,9 @@ def auto_apply(max_jobs=1):
 
         for attempt in range(3):
             try:
-                apply_btn = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.ID, "top_easy_apply_button"))
-                )
+                apply_btn = wait_for_element(driver, (By.ID, "top_easy_apply_button"), name="apply_button", clickable=True)
+                if apply_btn is None:
+                    raise Exception("Apply button not clickable.")
                 apply_btn.click()
                 print("✅ Clicked top_easy_apply_button.")
                 return True
@@ -100,12 +100,16 @@ def auto_apply(max_jobs=1):
                     return True
                 except:
                     print(f"⚠️ Attempt {attempt + 1}: Apply Now button not clickable.")
-                    time.sleep(2)
+                    wait_for_page(driver, name="apply_retry", fixed=2)
         return False
 
-    def handle_additional_questions():
+    def handle_additional_questions(driver):
         incomplete_block = False
 
+        # The form is rendered once its submit button is there
+        if wait_for_element(driver, (By.ID, "submit"), name="application_form") is None:
+            print("⚠️ Application form did not appear.")
+
         try:
             availability_radio = driver.find_element(By.ID, "radio1")
             driver.execute_script("arguments[0].click();", availability_radio)
@@ -123,9 +127,10 @@ def auto_apply(max_jobs=1):
             print("ℹ️ Availability textarea not found.")
 
         try:
-            question_blocks = WebDriverWait(driver, 5).until(
-                EC.presence_of_all_elements_located((By.CLASS_NAME, "additional_question"))
-            )
+            # The form is already on the page, so no questions means none to wait for
+            question_blocks = driver.find_elements(By.CLASS_NAME, "additional_question")
+            if not question_blocks:
+                print("ℹ️ No additional question blocks found.")
 
             for block in question_blocks:
                 handled = False
@@ -164,136 +169,266 @@ def auto_apply(max_jobs=1):
 
         return not incomplete_block
 
-    def attempt_login(max_attempts=3):
-        for attempt in range(max_attempts):
-            try:
-                WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.ID, "modal_email")))
-                driver.find_element(By.ID, "modal_email").send_keys(EMAIL)
-                driver.find_element(By.ID, "modal_password").send_keys(PASSWORD)
-                driver.find_element(By.ID, "modal_login_submit").click()
-                print(f"🔐 Login attempt {attempt+1} submitted.")
-                time.sleep(5)
-                if not driver.find_elements(By.ID, "modal_login_submit"):
-                    print("✅ Login successful.")
-                    return True
-            except Exception as e:
-                print(f"⚠️ Login attempt {attempt+1} failed: {e}")
-                time.sleep(3)
-        print("⛔ Login failed after multiple attempts.")
-        return False
-
-    submitted_links = set()
-    if os.path.exists("submitted_log.txt"):
-        with open("submitted_log.txt", "r", encoding="utf-8") as f:
-            submitted_links = set(line.strip().rstrip('/') for line in f)
-
-    with open("internshala_internships.csv", newline='', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        internships = list(reader)
-
-    for job in internships:
+    def open_listing(driver, link):
+        with stage_timer("apply_page_load"):
+            driver.get(link)
+            # The listing is usable once it shows an apply button, or a login prompt instead of one
+            wait_for(driver, "listing_ready", any_of(
+                EC.presence_of_element_located((By.ID, "top_easy_apply_button")),
+                EC.presence_of_element_located((By.CLASS_NAME, "apply_now_btn")),
+                login_requested,
+            ), kind="page_ready", fixed=4)
+
+    def login_requested(driver):
+        # Logged-out visitors get the login prompt instead of the application form
+        return bool(driver.find_elements(By.XPATH, "//div[@id='login-link-container']/span")
+                    or driver.find_elements(By.ID, "modal_login_submit"))
+
+    def apply_to(driver, job):
+        """One application on `driver`; returns APPLIED, ALREADY_APPLIED or FAILED."""
         internship_link = job["Link"].strip().rstrip("/")
         internship_title = job.get("Title", "Unknown Title")
         internship_company = job.get("Company", "Unknown Company")
 
-        if internship_link in submitted_links:
-            print(f"⏭️ Already applied: {internship_link}")
-            continue
-
-        if applications_done >= MAX_APPLICATIONS:
-            print(f"\n✅ Reached max limit of {MAX_APPLICATIONS} applications. Exiting.")
-            break
-
-        if consecutive_failures >= MAX_FAILURES:
-            print(f"\n⛔ Reached {MAX_FAILURES} consecutive failures. Exiting script.")
-            break
-
         print(f"\n🚀 Applying to: {internship_title} at {internship_company}\n🔗 {internship_link}")
         try:
-            driver.get(internship_link)
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(4)
-            close_popup_modal()
-
-            apply_status = click_apply_now()
-            if apply_status == "already_applied":
-                log_submission(internship_link, internship_title, internship_company)
-                continue
-            elif not apply_status:
-                consecutive_failures += 1
-                print(f"❌ Failed to click Apply Now. Consecutive failures: {consecutive_failures}")
-                continue
-            else:
-                consecutive_failures = 0
-
-            try:
-                login_link = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[@id='login-link-container']/span"))
-                )
-                driver.execute_script("arguments[0].click();", login_link)
-                print("🪪 Clicked 'Already registered? Login'.")
-                time.sleep(2)
-            except:
-                print("ℹ️ Login link not found or already logged in.")
-
-            if not attempt_login():
-                continue
+            open_listing(driver, internship_link)
+            record_page_weight(driver, "apply")
+            close_popup_modal(driver)
 
-            driver.get(internship_link)
-            time.sleep(4)
-            close_popup_modal()
-
-            apply_status = click_apply_now()
+            apply_status = click_apply_now(driver)
             if apply_status == "already_applied":
-                log_submission(internship_link, internship_title, internship_company)
-                continue
+                log_submission(internship_link, internship_title, internship_company, status="already_applied")
+                return ALREADY_APPLIED
             elif not apply_status:
-                print(f"❌ Failed to click Apply Now after login. Consecutive failures: {consecutive_failures}")
-                continue
-            else:
-                consecutive_failures = 0
-
-            if not handle_additional_questions():
+                print("❌ Failed to click Apply Now.")
+                return FAILED
+
+            # Session expired mid-run: log in again on this driver and reopen the listing once
+            if login_requested(driver):
+                print("🔑 Internshala asked to log in again.")
+                session.expire(driver)
+
+                open_listing(driver, internship_link)
+                close_popup_modal(driver)
+
+                apply_status = click_apply_now(driver)
+                if apply_status == "already_applied":
+                    log_submission(internship_link, internship_title, internship_company, status="already_applied")
+                    return ALREADY_APPLIED
+                elif not apply_status:
+                    print("❌ Failed to click Apply Now after login.")
+                    return FAILED
+
+            with stage_timer("form_fill"):
+                form_complete = handle_additional_questions(driver)
+            if not form_complete:
                 print("⚠️ Could not complete additional questions. Skipping application.")
-                consecutive_failures += 1
-                continue
+                return FAILED
 
             try:
-                submit_btn = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.ID, "submit"))
-                )
-                driver.execute_script("arguments[0].scrollIntoView(true);", submit_btn)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", submit_btn)
-                print("✅ Submit clicked. Waiting for confirmation...")
-
-                time.sleep(5)
-                current_url = driver.current_url
-                if "matching-preferences" in current_url or "application submitted" in driver.page_source.lower():
-                    print(f"🎉 Success: Applied to {internship_title} at {internship_company}.")
-                    log_submission(internship_link, internship_title, internship_company)
-                    applications_done += 1
-                    time.sleep(2)
-                    continue
-                else:
-                    raise Exception("Application submission not confirmed.")
+                with stage_timer("submit"):
+                    submit_btn = wait_for_element(driver, (By.ID, "submit"), name="submit_button", clickable=True)
+                    if submit_btn is None:
+                        raise Exception("Submit button not clickable.")
+                    driver.execute_script("arguments[0].scrollIntoView(true);", submit_btn)
+                    wait_for(driver, "submit_in_view", in_viewport(submit_btn), kind="modal", fixed=1)
+                    driver.execute_script("arguments[0].click();", submit_btn)
+                    print("✅ Submit clicked. Waiting for confirmation...")
+
+                    confirmed = wait_for(driver, "submission_confirmed", any_of(
+                        url_contains_any("matching-preferences"), page_source_contains("application submitted"),
+                    ), kind="navigation", fixed=5)
+                    if not confirmed:
+                        raise Exception("Application submission not confirmed.")
+                print(f"🎉 Success: Applied to {internship_title} at {internship_company}.")
+                log_submission(internship_link, internship_title, internship_company)
+                return APPLIED
 
             except Exception as e:
                 print("⛔ Submit failed or confirmation not detected.")
                 traceback.print_exc()
-                consecutive_failures += 1
-                continue
+                return FAILED
 
+        except LoginError:
+            raise
         except Exception as general_err:
             print("🚨 Unexpected error:", general_err)
             traceback.print_exc()
-            consecutive_failures += 1
-            continue
+            return FAILED
+
+    ledger = get_application_ledger()
+    session = get_internshala_session()
+    pool = get_driver_pool("apply")
+
+    # Best match for the resume first (newest first without one), read lazily
+    internships = iter(listings) if listings is not None else iter_ranked_listings(
+        type_="internship", resume_text=resume_text, titles=titles
+    )
+
+    # === Shared work queue ===
+    progress = threading.Condition()
+    source_lock = threading.Lock()
+    claimed = set()
+    counts = {APPLIED: 0, ALREADY_APPLIED: 0, FAILED: 0, "in_flight": 0}
+    stop_reason = []
+    rate_limiter = TokenBucket(rate=APPLY_RATE_PER_MINUTE / 60, capacity=APPLY_BURST)
+    global_breaker = CircuitBreaker(GLOBAL_MAX_FAILURES, name="global")
+
+    def stopped():
+        return bool(stop_reason) or (cancel_event is not None and cancel_event.is_set())
+
+    def claim_listing():
+        """Next listing nobody has applied to or claimed; None once the run should end."""
+        with progress:
+            # Only start as many applications as can still count towards the limit
+            while counts[APPLIED] + counts["in_flight"] >= MAX_APPLICATIONS:
+                if counts[APPLIED] >= MAX_APPLICATIONS or stopped():
+                    return None
+                progress.wait(timeout=1)
+            if stopped():
+                return None
+            counts["in_flight"] += 1
+
+        # The source may block (listings still being scraped), so it is read outside `progress`
+        try:
+            with source_lock:
+                # Pick up applications other processes recorded since the last look
+                ledger.refresh()
+                for job in internships:
+                    if stopped():
+                        break
+                    key = normalize_link(job["Link"])
+                    if key in claimed:
+                        continue
+                    if ledger.has_applied(job["Link"]):
+                        print(f"⏭️ Already applied: {job['Link']}")
+                        continue
+                    claimed.add(key)
+                    return job
+        except BaseException:
+            # Give the slot back, or the other workers wait on it until the run is stopped
+            finish(None)
+            raise
+        finish(None)
+        return None
+
+    def finish(outcome):
+        with progress:
+            counts["in_flight"] -= 1
+            if outcome is not None:
+                counts[outcome] += 1
+            progress.notify_all()
+        if outcome is not None:
+            applications.inc(outcome=outcome)
+
+    def run_worker(worker_id):
+        breaker = CircuitBreaker(MAX_FAILURES, name=f"worker-{worker_id}")
+        stats = {"worker": worker_id, "applied": 0, "already_applied": 0, "failed": 0, "seconds": 0.0}
+        try:
+            # Borrow a warm headless Chrome session from the shared pool
+            driver = pool.acquire()
+        except Exception as e:
+            print(f"⚠️ Worker {worker_id} could not get a Chrome session: {e}")
+            stats["error"] = str(e)
+            return stats
 
-    driver.quit()
-    print(f"\n✅ Done applying to {applications_done} internship(s).")
+        try:
+            # Log in once (or reuse the saved session) before the first listing is opened
+            session.ensure(driver)
+
+            while True:
+                job = claim_listing()
+                if job is None:
+                    break
+                # Cancelled while waiting for a token: hand the claim back without an outcome
+                if not rate_limiter.acquire(cancel_event=cancel_event):
+                    finish(None)
+                    break
+
+                started = time.perf_counter()
+                outcome = apply_to(driver, job)
+                stats["seconds"] += time.perf_counter() - started
+                stats[outcome] += 1
+                finish(outcome)
+
+                if outcome == FAILED:
+                    # Only one failure opens the global breaker: stop everyone before this worker's own check
+                    if global_breaker.record_failure():
+                        print(f"\n⛔ {GLOBAL_MAX_FAILURES} consecutive failures across workers. Stopping all workers.")
+                        with progress:
+                            stop_reason.append("too many failures")
+                            progress.notify_all()
+                    if breaker.record_failure():
+                        print(f"\n⛔ Worker {worker_id}: {MAX_FAILURES} consecutive failures. Stopping this worker.")
+                        break
+                    if stopped():
+                        break
+                else:
+                    breaker.record_success()
+                    global_breaker.record_success()
+        except LoginError as e:
+            print(f"⛔ {e}")
+            stats["error"] = f"Login failed: {e}"
+            with progress:
+                stop_reason.append(stats["error"])
+                progress.notify_all()
+        finally:
+            pool.release(driver)
+
+        stats["seconds"] = round(stats["seconds"], 2)
+        stats["breaker"] = breaker.stats()
+        return stats
+
+    worker_count = max(1, min(workers, pool.size, MAX_APPLICATIONS))
+    print(f"🤖 Auto-apply with {worker_count} worker(s), up to {MAX_APPLICATIONS} application(s).")
+    run_started = time.perf_counter()
+    worker_stats = [None] * worker_count
+
+    def run_slot(index):
+        try:
+            worker_stats[index] = run_worker(index + 1)
+        except Exception as e:
+            # A crashed worker must not take the others down; its slot records why it stopped
+            print(f"❌ Worker {index + 1} crashed: {e}")
+            worker_stats[index] = {"worker": index + 1, "error": f"Worker crashed: {e}"}
+            with progress:
+                progress.notify_all()
+
+    threads = [threading.Thread(target=run_slot, args=(i,), name=f"apply-{i + 1}") for i in range(worker_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - run_started
+
+    if cancel_event is not None and cancel_event.is_set():
+        print(f"\n🛑 Auto-apply cancelled after {counts[APPLIED]} application(s).")
+
+    throughput = {
+        "workers": worker_count,
+        "applied": counts[APPLIED],
+        "already_applied": counts[ALREADY_APPLIED],
+        "failed": counts[FAILED],
+        "seconds": round(elapsed, 2),
+        "applications_per_minute": round(counts[APPLIED] / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "seconds_per_application": round(elapsed / counts[APPLIED], 2) if counts[APPLIED] else None,
+        "rate_limiter": rate_limiter.stats(),
+        "global_breaker": global_breaker.stats(),
+        "per_worker": worker_stats,
+        # Since the backend started: time spent in each named wait, and page weight per component
+        "waits": wait_stats.snapshot(),
+        "page_weight": page_weights.snapshot(),
+        "browser_profile": pool.profile.describe(),
+    }
+
+    print(f"\n✅ Done applying to {counts[APPLIED]} internship(s).")
+    login_errors = [stats["error"] for stats in worker_stats if stats and stats.get("error", "").startswith("Login failed")]
+    if login_errors and not counts[APPLIED]:
+        return {"status": "fail", "message": login_errors[0], "applied": applied_jobs, "stats": throughput}
     return {
         "status": "success",
-        "message": f"Applied to {applications_done} internship(s).",
-        "applied": applied_jobs
-    }
\ No newline at end of file
+        "message": f"Applied to {counts[APPLIED]} internship(s).",
+        "applied": applied_jobs,
+        "stats": throughput,
+    }
@@ -0,0 +1,187 @@
+import os
+import threading
+
+# === Settings ===
+# Every setting is read from BROWSER_<NAME>, and a component (scraper, apply) can
+# override it with BROWSER_<COMPONENT>_<NAME>, e.g. BROWSER_APPLY_BLOCK_IMAGES=0.
+
+# URL patterns per resource type, for Network.setBlockedURLs (which only matches URLs)
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*"],
+    "stylesheet": ["*.css*"],
+}
+# Analytics, ads and chat widgets the scraper and the apply flow never need
+THIRD_PARTY_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*/gtag/js*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*", "*connect.facebook.*",
+    "*hotjar.com*", "*clarity.ms*", "*mixpanel.com*", "*segment.io*", "*intercom.io*",
+    "*moengage.com*", "*webengage.com*", "*branch.io*",
+]
+
+# Bytes and requests the current page loaded, from the Resource Timing API
+PAGE_WEIGHT_JS = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return {requests: entries.length, bytes: entries.reduce((total, entry) => total + (entry.transferSize || 0), 0)};
+"""
+
+
+def profile_setting(name, default, component=None):
+    if component:
+        value = os.getenv(f"BROWSER_{component.upper()}_{name}")
+        if value is not None:
+            return value
+    return os.getenv(f"BROWSER_{name}", default)
+
+
+def as_flag(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def as_list(value):
+    return tuple(item.strip() for item in str(value).split(",") if item.strip())
+
+
+class BrowserProfile:
+    """Chrome launch settings shared by every pooled session.
+
+    Defaults are the lightweight profile: headless, `eager` page loads (DOM ready,
+    no waiting for images), images and extensions off, and fonts, media and known
+    analytics/ad scripts blocked by URL pattern.
+    """
+
+    def __init__(self, headless=True, page_load_strategy="eager", block_images=True, disable_extensions=True,
+                 blocked_types=("image", "font", "media"), block_third_party=True, blocked_urls=(),
+                 window_size="1920,1080"):
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.disable_extensions = disable_extensions
+        self.blocked_types = tuple(blocked_types)
+        self.block_third_party = block_third_party
+        self.blocked_urls = tuple(blocked_urls)
+        self.window_size = window_size
+
+    @classmethod
+    def from_env(cls, component=None):
+        def setting(name, default):
+            return profile_setting(name, default, component)
+
+        return cls(
+            headless=as_flag(setting("HEADLESS", "1")),
+            page_load_strategy=setting("PAGE_LOAD_STRATEGY", "eager"),
+            block_images=as_flag(setting("BLOCK_IMAGES", "1")),
+            disable_extensions=as_flag(setting("DISABLE_EXTENSIONS", "1")),
+            blocked_types=as_list(setting("BLOCKED_TYPES", "image,font,media")),
+            block_third_party=as_flag(setting("BLOCK_THIRD_PARTY", "1")),
+            blocked_urls=as_list(setting("BLOCKED_URLS", "")),
+            window_size=setting("WINDOW_SIZE", "1920,1080"),
+        )
+
+    @classmethod
+    def full(cls):
+        """A regular browser that loads everything; the baseline for comparisons."""
+        return cls(page_load_strategy="normal", block_images=False, disable_extensions=False, blocked_types=(),
+                   block_third_party=False)
+
+    def key(self):
+        return (self.headless, self.page_load_strategy, self.block_images, self.disable_extensions,
+                self.blocked_types, self.block_third_party, self.blocked_urls, self.window_size)
+
+    def blocked_patterns(self):
+        patterns = []
+        for type_ in self.blocked_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(type_, []))
+        if self.block_third_party:
+            patterns.extend(THIRD_PARTY_PATTERNS)
+        patterns.extend(self.blocked_urls)
+        return patterns
+
+    def chrome_options(self):
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument(f"--window-size={self.window_size}")
+        options.page_load_strategy = self.page_load_strategy
+        if self.disable_extensions:
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-component-extensions-with-background-pages")
+        if self.block_images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return options
+
+    def configure(self, driver):
+        """Per-session setup that needs a running browser: the URL block list."""
+        patterns = self.blocked_patterns()
+        if not patterns or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    def describe(self):
+        return {
+            "headless": self.headless,
+            "page_load_strategy": self.page_load_strategy,
+            "block_images": self.block_images,
+            "disable_extensions": self.disable_extensions,
+            "blocked_types": list(self.blocked_types),
+            "block_third_party": self.block_third_party,
+            "blocked_patterns": len(self.blocked_patterns()),
+        }
+
+
+# === Page weight ===
+def page_weight(driver):
+    """{"requests", "bytes"} loaded by the current page; zeros if the browser cannot tell."""
+    try:
+        weight = driver.execute_script(PAGE_WEIGHT_JS) or {}
+    except Exception:
+        weight = {}
+    return {"requests": int(weight.get("requests") or 0), "bytes": int(weight.get("bytes") or 0)}
+
+
+class PageWeightStats:
+    """Requests and bytes per page, per component."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._components = {}
+
+    def record(self, component, weight):
+        with self._lock:
+            entry = self._components.setdefault(component, {"pages": 0, "requests": 0, "bytes": 0})
+            entry["pages"] += 1
+            entry["requests"] += weight["requests"]
+            entry["bytes"] += weight["bytes"]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                component: {
+                    **entry,
+                    "requests_per_page": round(entry["requests"] / entry["pages"], 1),
+                    "kb_per_page": round(entry["bytes"] / entry["pages"] / 1024, 1),
+                }
+                for component, entry in self._components.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._components.clear()
+
+
+page_weights = PageWeightStats()
+
+
+def record_page_weight(driver, component):
+    weight = page_weight(driver)
+    page_weights.record(component, weight)
+    return weight
@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and an optional SQLite layer.
+
+    Entries are kept in memory up to `maxsize` (least recently used evicted first).
+    With `path` set, values are also written to disk as JSON so they survive restarts;
+    expired rows are pruned on write and the table keeps at most `disk_maxsize` rows.
+    Disk reads and writes happen outside the lock, so memory hits never wait on them.
+    `get_or_compute` makes concurrent callers for the same key share one computation.
+    """
+
+    def __init__(self, maxsize=256, ttl=86400, path=None, name="cache", disk_maxsize=10000):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.name = name
+        self.disk_maxsize = disk_maxsize
+
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "shared_inflight": 0, "evictions": 0}
+
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+
+    # === Disk layer ===
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _disk_get(self, key, now):
+        if not self.path:
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _disk_set(self, key, value, expires_at):
+        if not self.path:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            # Rows expiring last were written last; drop the oldest past the cap
+            conn.execute(
+                "DELETE FROM entries WHERE key NOT IN (SELECT key FROM entries ORDER BY expires_at DESC LIMIT ?)",
+                (self.disk_maxsize,),
+            )
+
+    # === Memory layer ===
+    def _memory_set(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _memory_get(self, key, now):
+        """Returns (found, value). Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, entry[0]
+            del self._entries[key]
+        return False, None
+
+    def _load(self, key, now):
+        """Returns (found, value) from disk, copying a hit into memory. Called without the lock."""
+        stored = self._disk_get(key, now)
+        if stored is None:
+            return False, None
+        with self._lock:
+            self._memory_set(key, *stored)
+            self._stats["disk_hits"] += 1
+        return True, stored[0]
+
+    # === Public API ===
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            found, value = self._memory_get(key, now)
+        if not found:
+            found, value = self._load(key, now)
+        if not found:
+            with self._lock:
+                self._stats["misses"] += 1
+        return value if found else default
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._memory_set(key, value, expires_at)
+        self._disk_set(key, value, expires_at)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Return the cached value or call `compute()` once, even with many concurrent callers.
+
+        Exceptions from `compute` are not cached and are raised to every waiting caller.
+        Returns (value, cached) where `cached` is False only for the caller that computed it.
+        """
+        now = time.time()
+        with self._lock:
+            found, value = self._memory_get(key, now)
+            if found:
+                return value, True
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._stats["shared_inflight"] += 1
+
+        if not owner:
+            return future.result(), True
+
+        try:
+            # The owner checks the disk, so concurrent callers wait on one read as well
+            found, value = self._load(key, now)
+            if found:
+                future.set_result(value)
+                return value, True
+            with self._lock:
+                self._stats["misses"] += 1
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            # Waiting callers get the value even if storing it fails below
+            future.set_result(value)
+            try:
+                self.set(key, value, ttl=ttl)
+            except Exception as e:
+                print(f"⚠️ Could not store {self.name} cache entry: {e}")
+            return value, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM entries")
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] + self._stats["disk_hits"]) / lookups if lookups else 0.0
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                **self._stats,
+                "hit_rate": round(hit_rate, 3),
+            }
@@ -0,0 +1,151 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.metrics import stage_timer
+
+# === Settings ===
+# "http" fetches detail pages with a pooled keep-alive client, "selenium" keeps the old tab-per-card path.
+DETAIL_FETCH_MODE = os.getenv("DETAIL_FETCH_MODE", "http").lower()
+DETAIL_FETCH_WORKERS = int(os.getenv("DETAIL_FETCH_WORKERS", "8"))
+DETAIL_FETCH_TIMEOUT = float(os.getenv("DETAIL_FETCH_TIMEOUT", "10"))
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Same locators the Selenium path uses, so both modes read the same nodes.
+DESCRIPTION_XPATH = "//div[@class='text-container']"
+SKILLS_XPATH = "//div[contains(text(),'Skill(s) required')]/following-sibling::div"
+WHO_CAN_APPLY_XPATH = "//div[contains(text(),'Who can apply')]/following-sibling::div"
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+HIDDEN_TAGS = {"script", "style", "noscript", "template", "head"}
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+# Source whitespace, newlines included, renders as one space; non-breaking spaces survive until the end
+_COLLAPSIBLE = re.compile(r"[ \t\n\r\f\v]+")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Process-wide keep-alive session, sized to the detail worker count."""
+    global _session
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _session_lock:
+        if _session is not None:
+            return _session
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(DETAIL_FETCH_WORKERS, 1))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": USER_AGENT})
+        _session = session
+        return _session
+
+
+# === Text helpers ===
+def is_hidden(node):
+    # Comments and processing instructions have a non-string tag and no rendered text
+    if not isinstance(node.tag, str):
+        return True
+    return node.tag in HIDDEN_TAGS or node.get("hidden") is not None or bool(_HIDDEN_STYLE.search(node.get("style") or ""))
+
+
+def element_text(element):
+    """Approximate Selenium's `.text`: block elements break lines, whitespace collapses,
+    and nodes hidden by tag, `hidden` attribute or inline style are left out."""
+    parts = []
+
+    def walk(node):
+        if is_hidden(node):
+            return
+        tag = node.tag
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        if node.text:
+            parts.append(_COLLAPSIBLE.sub(" ", node.text))
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(_COLLAPSIBLE.sub(" ", child.tail))
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+
+    walk(element)
+    lines = [re.sub(r"[ \t\r\f\v\xa0]+", " ", line).strip() for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def first_text(tree, xpath):
+    nodes = tree.xpath(xpath)
+    if not nodes:
+        return None
+    return element_text(nodes[0])
+
+
+# === Detail pages ===
+def parse_html(page_html, encoding="utf-8"):
+    from lxml import html as lxml_html
+
+    if isinstance(page_html, bytes):
+        return lxml_html.fromstring(page_html, parser=lxml_html.HTMLParser(encoding=encoding))
+    return lxml_html.fromstring(page_html)
+
+
+def response_encoding(response):
+    # requests falls back to ISO-8859-1 when the header has no charset; Internshala serves UTF-8
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return response.encoding
+    return "utf-8"
+
+
+def parse_detail_page(page_html, encoding="utf-8"):
+    """Returns description/skills/who-can-apply, or None when the page needs JavaScript."""
+    tree = parse_html(page_html, encoding)
+    description = first_text(tree, DESCRIPTION_XPATH)
+    skills = first_text(tree, SKILLS_XPATH)
+    who_can_apply = first_text(tree, WHO_CAN_APPLY_XPATH)
+
+    # None of the sections in the static HTML means the body is rendered client-side.
+    if description is None and skills is None and who_can_apply is None:
+        return None
+
+    return {
+        "Skills": skills or "N/A",
+        "Who can apply": who_can_apply or "N/A",
+        "Description": description or "N/A",
+    }
+
+
+def fetch_detail(link):
+    if not link:
+        return None
+    try:
+        with stage_timer("detail_fetch"):
+            response = get_http_session().get(link, timeout=DETAIL_FETCH_TIMEOUT)
+            if response.status_code != 200:
+                print(f"⚠️ Detail fetch got HTTP {response.status_code} for {link}")
+                return None
+            return parse_detail_page(response.content, response_encoding(response))
+    except Exception as e:
+        print(f"⚠️ Detail fetch failed for {link}: {e}")
+        return None
+
+
+def fetch_details(links):
+    """Fetch detail pages concurrently. Result order matches `links`; None marks a page for Selenium."""
+    if not links:
+        return []
+    workers = max(1, min(DETAIL_FETCH_WORKERS, len(links)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch_detail, links))
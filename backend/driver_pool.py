@@ -0,0 +1,264 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.browser_profile import BrowserProfile
+from backend.metrics import chrome_sessions_closed, chrome_sessions_started, register_gauge
+from backend.profiling import span
+
+# === Settings ===
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+DRIVER_MAX_PAGE_LOADS = int(os.getenv("DRIVER_MAX_PAGE_LOADS", "50"))
+DRIVER_MAX_MEMORY_MB = float(os.getenv("DRIVER_MAX_MEMORY_MB", "512"))
+DRIVER_BORROW_TIMEOUT = float(os.getenv("DRIVER_BORROW_TIMEOUT", "300"))
+DRIVER_POOL_PREWARM = int(os.getenv("DRIVER_POOL_PREWARM", str(DRIVER_POOL_SIZE)))
+
+
+class PooledSession:
+    def __init__(self, driver):
+        self.driver = driver
+        self.page_loads = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """Process-wide pool of warm headless Chrome sessions.
+
+    Sessions are health-checked before they are handed out and recycled after
+    `max_page_loads` navigations or once the page heap grows past `max_memory_mb`.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_page_loads=DRIVER_MAX_PAGE_LOADS,
+                 max_memory_mb=DRIVER_MAX_MEMORY_MB, profile=None, name="default"):
+        self.name = name
+        self.size = max(1, size)
+        self.max_page_loads = max_page_loads
+        self.max_memory_mb = max_memory_mb
+        self.profile = profile or BrowserProfile.from_env()
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._borrowed = {}
+        # Drivers still borrowed when the pool was closed; their slots come back on release
+        self._closed_borrowed = set()
+        self._count = 0
+        self._closed = False
+
+    # === Session lifecycle ===
+    def _create(self):
+        from selenium import webdriver
+        from selenium.webdriver.remote.command import Command
+
+        driver = webdriver.Chrome(options=self.profile.chrome_options())
+        chrome_sessions_started.inc()
+        try:
+            self.profile.configure(driver)
+        except Exception as e:
+            print(f"⚠️ Could not apply the browser profile's URL block list: {e}")
+        session = PooledSession(driver)
+
+        # Count navigations so the session can be recycled after N page loads
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            if driver_command == Command.GET:
+                session.page_loads += 1
+            with span("webdriver", driver_command):
+                return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        return session
+
+    def _discard(self, session):
+        with self._lock:
+            self._count -= 1
+        chrome_sessions_closed.inc()
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"⚠️ Error closing Chrome session: {e}")
+
+    def _is_healthy(self, session):
+        try:
+            session.driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def _memory_mb(self, session):
+        try:
+            used = session.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0;"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def _needs_recycle(self, session):
+        if self.max_page_loads and session.page_loads >= self.max_page_loads:
+            return True
+        if self.max_memory_mb and self._memory_mb(session) >= self.max_memory_mb:
+            return True
+        return False
+
+    def _reset(self, session):
+        """Close tabs a borrower left open and return focus to the first one."""
+        driver = session.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+    # === Public API ===
+    def start(self, count=DRIVER_POOL_PREWARM):
+        """Pre-warm sessions in a background thread so the first borrower skips the cold start."""
+        target = min(count, self.size)
+
+        def warm():
+            while True:
+                with self._lock:
+                    if self._closed or self._count >= target:
+                        return
+                    self._count += 1
+                try:
+                    self._idle.put(self._create())
+                except Exception as e:
+                    with self._lock:
+                        self._count -= 1
+                    print(f"⚠️ Could not pre-warm Chrome session: {e}")
+                    return
+
+        thread = threading.Thread(target=warm, name="driver-pool-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def acquire(self, timeout=DRIVER_BORROW_TIMEOUT):
+        if self._closed:
+            raise RuntimeError("Driver pool is closed.")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No Chrome session available after {timeout}s.")
+
+        try:
+            while True:
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    with self._lock:
+                        self._count += 1
+                    try:
+                        session = self._create()
+                    except Exception:
+                        with self._lock:
+                            self._count -= 1
+                        raise
+                    break
+
+                if self._is_healthy(session):
+                    break
+                print("♻️ Dropping unhealthy Chrome session.")
+                self._discard(session)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._borrowed[id(session.driver)] = session
+        return session.driver
+
+    def release(self, driver):
+        with self._lock:
+            session = self._borrowed.pop(id(driver), None)
+            surplus = self._count > self.size
+            closed_under_borrower = session is None and id(driver) in self._closed_borrowed
+            self._closed_borrowed.discard(id(driver))
+        if session is None:
+            # Already discarded by close(); only the slot is still out
+            if closed_under_borrower:
+                self._slots.release()
+            return
+
+        try:
+            if self._closed or surplus or self._needs_recycle(session):
+                self._discard(session)
+            else:
+                try:
+                    self._reset(session)
+                    self._idle.put(session)
+                except Exception:
+                    self._discard(session)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def borrow(self, timeout=DRIVER_BORROW_TIMEOUT):
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(session)
+
+        with self._lock:
+            borrowed = list(self._borrowed.values())
+            self._closed_borrowed.update(self._borrowed)
+            self._borrowed.clear()
+        for session in borrowed:
+            self._discard(session)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "live": self._count,
+                "idle": self._idle.qsize(),
+                "borrowed": len(self._borrowed),
+                "profile": self.profile.describe(),
+            }
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool(component=None):
+    """Pool for `component`'s browser profile; components with the same profile share one pool."""
+    profile = BrowserProfile.from_env(component)
+    with _pool_lock:
+        pool = _pools.get(profile.key())
+        if pool is None or pool._closed:
+            pool = _pools[profile.key()] = DriverPool(profile=profile, name=component or "default")
+        return pool
+
+
+def chrome_session_counts():
+    with _pool_lock:
+        pools = list(_pools.values())
+    counts = {}
+    for pool in pools:
+        stats = pool.stats()
+        for state in ("live", "idle", "borrowed"):
+            counts[(pool.name, state)] = stats[state]
+    return counts
+
+
+register_gauge("chrome_sessions", "Chrome sessions per driver pool and state.", ("pool", "state"), chrome_session_counts)
+
+
+def shutdown_driver_pool():
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,190 +1,777 @@
-import csv
+import threading
 import time
 import re
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
-from together import Together
+from selenium.common.exceptions import StaleElementReferenceException
+from backend.detail_fetcher import (
+    DETAIL_FETCH_MODE,
+    DETAIL_FETCH_TIMEOUT,
+    DETAIL_FETCH_WORKERS,
+    DESCRIPTION_XPATH,
+    SKILLS_XPATH,
+    WHO_CAN_APPLY_XPATH,
+    fetch_details,
+    first_text,
+    get_http_session,
+    parse_html,
+    response_encoding,
+)
+from backend.browser_profile import record_page_weight
+from backend.driver_pool import get_driver_pool
+from backend.metrics import record_llm_usage, stage_timer
+from backend.profiling import span
+from backend.cache import TTLCache
+from backend.listing_store import (
+    CARD_LISTED,
+    CARD_REJECTED,
+    CARD_UNCHECKED,
+    LISTING_FRESHNESS_TTL,
+    card_fingerprint,
+    get_listing_store,
+    normalize_link,
+)
+from backend.relevance import RELEVANCE_TITLE_GATE, RelevanceMatcher
+from backend.waits import any_of, network_idle, wait_for
 
-# === Helpers ===
-def get_element_text_safe(parent, xpath):
-    try:
-        return parent.find_element(By.XPATH, xpath).text.strip()
-    except NoSuchElementException:
-        return None
+# Override to point the scraper at a local copy of the site (saved fixtures, stand-in server).
+INTERNSHALA_BASE_URL = os.getenv("INTERNSHALA_BASE_URL", "https://internshala.com").rstrip("/")
+# How many listing types are crawled at the same time, each on its own Chrome session.
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "2"))
 
-def get_element_attr_safe(parent, xpath, attr):
-    try:
-        return parent.find_element(By.XPATH, xpath).get_attribute(attr)
-    except NoSuchElementException:
-        return None
+# Listing budget per type and result pages per crawl, unless the caller asks for more (up to the caps).
+SCRAPE_DEFAULT_LIMIT = int(os.getenv("SCRAPE_DEFAULT_LIMIT", "3"))
+SCRAPE_DEFAULT_PAGES = int(os.getenv("SCRAPE_DEFAULT_PAGES", "1"))
+SCRAPE_LIMIT_CAP = int(os.getenv("SCRAPE_LIMIT_CAP", "500"))
+SCRAPE_PAGES_CAP = int(os.getenv("SCRAPE_PAGES_CAP", "25"))
+# Crawls running at once in a batch (one per unique search and type), and keywords per batch.
+SCRAPE_BATCH_CONCURRENCY = int(os.getenv("SCRAPE_BATCH_CONCURRENCY", "4"))
+SCRAPE_BATCH_KEYWORDS_CAP = int(os.getenv("SCRAPE_BATCH_KEYWORDS_CAP", "10"))
+# Result pages fetched ahead of the one being processed (HTTP mode).
+SCRAPE_PAGE_CONCURRENCY = int(os.getenv("SCRAPE_PAGE_CONCURRENCY", "3"))
+# "http" reads result pages with the pooled client, "selenium" loads each one in Chrome.
+LISTING_FETCH_MODE = os.getenv("LISTING_FETCH_MODE", DETAIL_FETCH_MODE).lower()
 
-def expand_keywords_with_together(api_key: str, base_keyword: str):
-    import re
-    from together import Together
+# Expanded keyword sets, keyed on the cleaned keyword and kept across restarts.
+keyword_cache = TTLCache(
+    maxsize=int(os.getenv("KEYWORD_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("KEYWORD_CACHE_TTL", str(7 * 24 * 3600))),
+    path=os.getenv("KEYWORD_CACHE_PATH", os.path.join("cache", "keyword_expansions.sqlite")),
+    name="keyword_expansion",
+    disk_maxsize=int(os.getenv("KEYWORD_CACHE_DISK_SIZE", "10000")),
+)
 
-    # Clean the input keyword: remove special characters
-    cleaned_keyword = re.sub(r"[^a-zA-Z0-9 ]", "", base_keyword).strip()
-    print(f"🔍 Cleaned base keyword: {cleaned_keyword}")
+# === Locators ===
+CARD_CLASS = "individual_internship"
+CARD_TITLE_XPATHS = [".//h3/a", ".//div[contains(@class,'internship_title')]//a"]
+CARD_FIELD_XPATHS = {
+    "Company": ".//div[contains(@class,'company_name')]/div/p",
+    "Location": ".//div[@class='location_link']",
+    "Stipend": ".//span[@class='stipend']",
+    "Duration": ".//i[@class='ic-16-calendar']/following-sibling::span",
+}
+CARD_LINK_XPATH = ".//a"
+# Static-HTML equivalents of getElementsByClassName(CARD_CLASS) and the result list container
+CARD_NODES_XPATH = f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {CARD_CLASS} ')]"
+LISTING_CONTAINER_XPATH = "//*[@id='internship_list_container']"
+DETAIL_FIELD_XPATHS = {
+    "Description": DESCRIPTION_XPATH,
+    "Skills": SKILLS_XPATH,
+    "Who can apply": WHO_CAN_APPLY_XPATH,
+}
+
+# Reads every card on the listing page in a single WebDriver round trip.
+LISTING_CARDS_JS = """
+const [cardClass, titleXpaths, fieldXpaths, linkXpath] = arguments;
+const first = (ctx, xp) => document.evaluate(xp, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = (ctx, xp) => { const node = first(ctx, xp); return node ? node.innerText.trim() : null; };
+return Array.from(document.getElementsByClassName(cardClass)).map(card => {
+    let title = null;
+    for (const xp of titleXpaths) { title = text(card, xp); if (title) break; }
+    const row = {Title: title};
+    for (const [field, xp] of Object.entries(fieldXpaths)) row[field] = text(card, xp);
+    const anchor = first(card, linkXpath);
+    row.Link = anchor ? (anchor.href || anchor.getAttribute('href')) : null;
+    return row;
+});
+"""
+
+# Reads every detail section in a single WebDriver round trip.
+DETAIL_PAGE_JS = """
+const fieldXpaths = arguments[0];
+const result = {};
+for (const [field, xp] of Object.entries(fieldXpaths)) {
+    const node = document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    result[field] = node ? node.innerText.trim() : null;
+}
+return result;
+"""
 
+# === Helpers ===
+def request_keyword_expansion(api_key: str, cleaned_keyword: str):
+    """One Llama-3 call; raises on API errors so failures are never cached."""
     prompt = (
         f"Suggest 5 related job titles for internships or full-time roles similar to: '{cleaned_keyword}'. "
         f"Return a comma-separated list only. No explanations."
     )
 
-    try:
-        client = Together(api_key=api_key)
+    from together import Together
 
+    client = Together(api_key=api_key)
+
+    with stage_timer("llm_call"), span("together", "keyword_expansion"):
         response = client.chat.completions.create(
             model="meta-llama/Llama-3-70b-chat-hf",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=100,
             stop=["\n"]
         )
+    record_llm_usage("keyword_expansion", response)
+
+    raw_output = response.choices[0].message.content.strip()
+    raw_output = re.sub(r"(?i)^.*?:", "", raw_output)  # Remove “Here are…” if present
+    keywords = re.split(r",|\n|;", raw_output)
+    cleaned_keywords = [kw.strip().lower() for kw in keywords if kw.strip()]
+
+    if not cleaned_keywords:
+        print("⚠️ No expanded keywords returned by API. Falling back to cleaned base keyword.")
+        return [cleaned_keyword.lower()]
 
-        raw_output = response.choices[0].message.content.strip()
-        raw_output = re.sub(r"(?i)^.*?:", "", raw_output)  # Remove “Here are…” if present
-        keywords = re.split(r",|\n|;", raw_output)
-        cleaned_keywords = [kw.strip().lower() for kw in keywords if kw.strip()]
+    return list(set([cleaned_keyword.lower()] + cleaned_keywords))
 
-        if not cleaned_keywords:
-            print("⚠️ No expanded keywords returned by API. Falling back to cleaned base keyword.")
-            return [cleaned_keyword.lower()]
+def expand_keywords_with_together(api_key: str, base_keyword: str):
+    # Clean the input keyword: remove special characters
+    cleaned_keyword = re.sub(r"[^a-zA-Z0-9 ]", "", base_keyword).strip()
+    print(f"🔍 Cleaned base keyword: {cleaned_keyword}")
 
-        expanded = list(set([cleaned_keyword.lower()] + cleaned_keywords))
-        print(f"🔍 Expanded keywords: {expanded}")
+    cache_key = search_keyword(cleaned_keyword)
+    try:
+        with stage_timer("keyword_expansion"):
+            expanded, cached = keyword_cache.get_or_compute(
+                cache_key, lambda: request_keyword_expansion(api_key, cleaned_keyword)
+            )
+        print(f"🔍 Expanded keywords{' (cached)' if cached else ''}: {expanded}")
         return expanded
 
     except Exception as e:
         print(f"⚠️ Together API error: {e}")
         return [cleaned_keyword.lower()]
 
-# === Main Crawl Function ===
-def crawl_internshala_by_type(keyword: str, limit: int, type_: str):
-    print(f"\n🔎 Crawling '{type_}' for keyword: {keyword}")
+def search_keyword(keyword):
+    """Lowercased, whitespace-collapsed keyword; keywords that agree on it share their result pages."""
+    return " ".join((keyword or "").lower().split())
+
+def listing_page_url(type_, keyword, page=1):
     url_keyword = keyword.strip().replace(" ", "-")
-    url = f"https://internshala.com/{type_}s/keywords-{url_keyword}/"
+    url = f"{INTERNSHALA_BASE_URL}/{type_}s/keywords-{url_keyword}/"
+    return url if page == 1 else f"{url}page-{page}/"
 
-    # Selenium Setup
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-dev-shm-usage")
-    driver = webdriver.Chrome(options=options)
+def listing_cards(rows, start=0):
+    """Raw card rows as (index, card) pairs with absolute links; cards without a title are dropped."""
+    cards = []
+    for index, row in enumerate(rows, start):
+        if not row.get("Title"):
+            continue
+        link = row.get("Link")
+        if link and not link.startswith("http"):
+            link = f"{INTERNSHALA_BASE_URL}{link}"
+        card = {"Title": row["Title"]}
+        for field in CARD_FIELD_XPATHS:
+            card[field] = row.get(field) or "N/A"
+        card["Link"] = link
+        cards.append((index, card))
+    return cards
 
-    load_dotenv()
-    TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
-    expanded_keywords = expand_keywords_with_together(TOGETHER_API_KEY, keyword)
+def read_listing_rows(driver):
+    return driver.execute_script(LISTING_CARDS_JS, CARD_CLASS, CARD_TITLE_XPATHS, CARD_FIELD_XPATHS, CARD_LINK_XPATH) or []
 
-    jobs = []
+def read_listing_cards(driver):
+    """Every card on the current listing page as a dict; cards without a title are dropped."""
+    return listing_cards(read_listing_rows(driver))
+
+def parse_listing_page(page_html, encoding="utf-8"):
+    """Card rows from static HTML; [] past the last page, None when the list is rendered client-side."""
+    tree = parse_html(page_html, encoding)
+    rows = []
+    for node in tree.xpath(CARD_NODES_XPATH):
+        title = None
+        for xpath in CARD_TITLE_XPATHS:
+            title = first_text(node, xpath)
+            if title:
+                break
+        row = {"Title": title}
+        for field, xpath in CARD_FIELD_XPATHS.items():
+            row[field] = first_text(node, xpath)
+        anchors = node.xpath(CARD_LINK_XPATH)
+        row["Link"] = anchors[0].get("href") if anchors else None
+        rows.append(row)
+
+    if not rows and not tree.xpath(LISTING_CONTAINER_XPATH):
+        return None
+    return rows
+
+def fetch_listing_page(url):
+    """One result page over HTTP; None means it has to be loaded in Chrome."""
     try:
+        with stage_timer("listing_page_load"):
+            response = get_http_session().get(url, timeout=DETAIL_FETCH_TIMEOUT)
+            if response.status_code != 200:
+                print(f"⚠️ Listing page got HTTP {response.status_code} for {url}")
+                return None
+            return parse_listing_page(response.content, response_encoding(response))
+    except Exception as e:
+        print(f"⚠️ Listing page fetch failed for {url}: {e}")
+        return None
+
+def read_listing_page_with_driver(driver, url):
+    from selenium.webdriver.support import expected_conditions as EC
+
+    with stage_timer("listing_page_load"):
         driver.get(url)
-        time.sleep(3)
+        # Cards rendered, or the page went quiet without any (past the last result page)
+        wait_for(driver, "listing_page", any_of(
+            EC.presence_of_element_located((By.XPATH, CARD_NODES_XPATH)), network_idle()
+        ), kind="page_ready", fixed=3)
+    record_page_weight(driver, "scraper")
 
-        # Close popup
-        try:
-            close_btn = driver.find_element(By.ID, "close_popup")
-            driver.execute_script("arguments[0].click();", close_btn)
-        except:
-            pass
+    # Close popup
+    try:
+        close_btn = driver.find_element(By.ID, "close_popup")
+        driver.execute_script("arguments[0].click();", close_btn)
+    except:
+        pass
+
+    return read_listing_rows(driver)
+
+def iter_listing_pages(type_, keyword, max_pages, get_driver):
+    """Yields (page, cards) in page order until an empty page or `max_pages`.
+
+    In HTTP mode up to SCRAPE_PAGE_CONCURRENCY pages are fetched ahead; closing the
+    generator cancels the ones not started yet. `get_driver()` is only called for
+    pages that need Chrome.
+    """
+    executor = None
+    futures = {}
+    if LISTING_FETCH_MODE == "http":
+        executor = ThreadPoolExecutor(max_workers=max(1, SCRAPE_PAGE_CONCURRENCY), thread_name_prefix="listing-page")
+
+    next_page = 1
+    card_index = 0
+    try:
+        for page in range(1, max_pages + 1):
+            url = listing_page_url(type_, keyword, page)
+            rows = None
+            if executor is not None:
+                while next_page <= max_pages and next_page < page + SCRAPE_PAGE_CONCURRENCY:
+                    futures[next_page] = executor.submit(fetch_listing_page, listing_page_url(type_, keyword, next_page))
+                    next_page += 1
+                rows = futures.pop(page).result()
+            if rows is None:
+                rows = read_listing_page_with_driver(get_driver(), url)
+
+            if not rows:
+                print(f"📄 No more results after page {page - 1}.")
+                return
+            cards = listing_cards(rows, card_index)
+            card_index += len(rows)
+            print(f"📄 Page {page}: {len(cards)} cards")
+            yield page, cards
+    finally:
+        for future in futures.values():
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+def read_detail_page(driver):
+    fields = driver.execute_script(DETAIL_PAGE_JS, DETAIL_FIELD_XPATHS) or {}
+    return {
+        "Skills": fields.get("Skills") or "N/A",
+        "Who can apply": fields.get("Who can apply") or "N/A",
+        "Description": fields.get("Description") or "N/A",
+    }
+
+def fetch_detail_with_driver(driver, link):
+    """Selenium fallback for detail pages that only render with JavaScript."""
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver.execute_script("window.open('');")
+    driver.switch_to.window(driver.window_handles[1])
+    try:
+        with stage_timer("detail_fetch"):
+            driver.get(link)
+            wait_for(driver, "detail_page", any_of(
+                EC.presence_of_element_located((By.XPATH, DESCRIPTION_XPATH)), network_idle()
+            ), kind="page_ready", fixed=2)
+            record_page_weight(driver, "scraper")
+            return read_detail_page(driver)
+    finally:
+        driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+
+# === Main Crawl Function ===
+def crawl_internshala_by_type(keyword: str, limit: int, type_: str, cancel_event=None, on_listing=None, stats=None,
+                              max_pages: int = SCRAPE_DEFAULT_PAGES, expanded_keywords=None, claims=None):
+    """Crawl up to `max_pages` result pages of one listing type, stopping once `limit` listings are accepted.
+
+    Incremental: every card seen on a result page is remembered per keyword by a
+    fingerprint of its card fields. Cards that are unchanged since they were last
+    checked (within LISTING_FRESHNESS_TTL) are not fetched again: relevant ones are
+    served from the store, rejected ones are dropped. Paging stops at a page with
+    nothing new or changed.
+
+    `on_listing(row)` is called for each accepted row as soon as it is parsed. Relevance
+    counters (title matches, detail fetches made and skipped), the number of result
+    pages read and new/changed/stale/skipped card counts are written into `stats` if given.
+
+    Batch crawls pass the merged `expanded_keywords` of all their searches, and the
+    batch's `claims` (BatchClaims): a card is claimed once this crawl accepts it, cards
+    another crawl already accepted are skipped, and detail pages are shared between them.
+    """
+    print(f"\n🔎 Crawling '{type_}' for keyword: {keyword} (up to {limit} listings, {max_pages} page(s))")
+
+    if expanded_keywords is None:
+        load_dotenv()
+        TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
+        expanded_keywords = expand_keywords_with_together(TOGETHER_API_KEY, keyword)
 
-        cards = driver.find_elements(By.CLASS_NAME, "individual_internship")
+    # Borrow a warm Chrome session from the shared pool, only once a page actually needs one
+    pool = get_driver_pool("scraper")
+    driver = None
+
+    def get_driver():
+        nonlocal driver
+        if driver is None:
+            driver = pool.acquire()
+        return driver
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    # Score titles before spending a page load: title matches are relevant for sure
+    matcher = RelevanceMatcher(expanded_keywords)
+    batch_size = DETAIL_FETCH_WORKERS if DETAIL_FETCH_MODE == "http" else 1
+    jobs = []
+    duplicates = 0
+
+    def claimed_elsewhere(card):
+        nonlocal duplicates
+        if claims is None or not claims.taken(card["Link"]):
+            return False
+        duplicates += 1
+        return True
+
+    def accept(card_index, card, detail):
+        """Relevance check on the full listing; accepted rows are kept and streamed out."""
+        nonlocal duplicates
+        title = card["Title"]
+        description = detail["Description"]
+
+        with stage_timer("relevance_check"):
+            relevant = matcher.matches(title, description)
+        if not relevant:
+            print(f"❌ Skipped card {card_index+1}: Not relevant to '{keyword}' or similar terms")
+            outcomes[normalize_link(card["Link"])] = CARD_REJECTED
+            return None
+        # Another crawl of the batch may have accepted it since it was looked at
+        if claims is not None and not claims.claim(card["Link"]):
+            duplicates += 1
+            return None
+        if not matcher.matches_title(title):
+            matcher.stats["description_matches"] += 1
+
+        row = {
+            "Title": title,
+            "Company": card["Company"],
+            "Location": card["Location"],
+            "Stipend": card["Stipend"],
+            "Duration": card["Duration"],
+            "Link": card["Link"],
+            "Skills": detail["Skills"],
+            "Who can apply": detail["Who can apply"],
+            "Description": description
+        }
+        jobs.append(row)
+        outcomes[normalize_link(card["Link"])] = CARD_LISTED
+        print(f"{len(jobs)}. ✅ {title} at {card['Company']}")
+
+        if on_listing is not None:
+            on_listing(row)
+        return row
+
+    def fetch_candidates(candidates):
         i = 0
-        count = 0
+        while i < len(candidates) and len(jobs) < limit:
+            if cancelled():
+                return
 
-        while i < len(cards) and count < limit:
-            try:
-                cards = driver.find_elements(By.CLASS_NAME, "individual_internship")
-                card = cards[i]
+            # Fill the batch, but never fetch more sure matches than the limit still needs
+            batch = []
+            sure = 0
+            while i < len(candidates) and len(batch) < batch_size and sure < limit - len(jobs):
+                card_index, card = candidates[i]
+                i += 1
+                if claimed_elsewhere(card):
+                    continue
+                batch.append((card_index, card))
+                sure += matcher.matches_title(card["Title"])
+
+            if not batch:
+                continue
+
+            # Fetch detail pages for the whole batch at once; pages another crawl of the batch fetched are reused
+            links = [card["Link"] for _, card in batch]
+            if DETAIL_FETCH_MODE == "http" and claims is not None:
+                details, fetched = claims.fetch_details(links)
+            elif DETAIL_FETCH_MODE == "http":
+                details, fetched = fetch_details(links), len(links)
+            else:
+                details = [claims.detail(link) if claims is not None else None for link in links]
+                fetched = details.count(None)
+            matcher.stats["detail_fetches"] += fetched
 
-                title = get_element_text_safe(card, ".//h3/a") or get_element_text_safe(card, ".//div[contains(@class,'internship_title')]//a")
-                if not title:
-                    i += 1
+            for (card_index, card), detail in zip(batch, details):
+                if len(jobs) >= limit:
+                    break
+                try:
+                    if detail is None:
+                        detail = fetch_detail_with_driver(get_driver(), card["Link"])
+                        if claims is not None:
+                            claims.store_detail(card["Link"], detail)
+                    row = accept(card_index, card, detail)
+                    if row is not None:
+                        fetched_rows.append(row)
+                except StaleElementReferenceException:
+                    print(f"⚠️ Skipped card {card_index} due to stale reference.")
+                except Exception as e:
+                    print(f"⚠️ Error at card {card_index}: {e}")
+
+    def reuse_stored():
+        """Fill the budget from the listings stored for this keyword, for the pages not read.
+
+        Only listings seen within LISTING_FRESHNESS_TTL qualify, like known cards on the pages read.
+        """
+        stored = store.iter_listings(type_=type_, keyword=keyword, since=time.time() - LISTING_FRESHNESS_TTL)
+        try:
+            for index, listing in enumerate(stored):
+                if len(jobs) >= limit or cancelled():
+                    return
+                key = normalize_link(listing["Link"])
+                if not key or key in outcomes or claimed_elsewhere(listing):
+                    continue
+                freshness["from_store"] += 1
+                # Judged again: the keyword set may have changed since the listing was stored
+                if accept(index, listing, listing) is not None:
+                    reused_links.append(listing["Link"])
+        finally:
+            stored.close()
+
+    def reuse_known(candidates):
+        """Known, unchanged listings are taken from the store instead of their detail pages."""
+        for card_index, card in candidates:
+            if len(jobs) >= limit or cancelled():
+                return
+            if claimed_elsewhere(card):
+                continue
+            stored = known[normalize_link(card["Link"])][2]
+            freshness["from_store"] += 1
+            if accept(card_index, card, stored) is not None:
+                reused_links.append(card["Link"])
+
+    # Incremental crawl: cards seen before for this keyword are compared by fingerprint before any detail fetch
+    store = get_listing_store()
+    known = {}
+    outcomes = {}
+    observed = []
+    freshness = {"new": 0, "changed": 0, "stale": 0, "skipped": 0, "from_store": 0}
+    fetched_rows = []
+    reused_links = []
+
+    def card_state(card, seen):
+        entry = seen.get(normalize_link(card["Link"]))
+        if entry is None:
+            return "new"
+        fingerprint, checked_at, _ = entry
+        if fingerprint != card_fingerprint(card):
+            return "changed"
+        if time.time() - checked_at > LISTING_FRESHNESS_TTL:
+            return "stale"
+        return "skipped"
+
+    def has_fresh_details(card):
+        entry = known.get(normalize_link(card["Link"]))
+        if entry is None:
+            return False
+        fingerprint, detail_seen, _ = entry
+        return fingerprint == card_fingerprint(card) and bool(detail_seen) and time.time() - detail_seen <= LISTING_FRESHNESS_TTL
+
+    pages = iter_listing_pages(type_, keyword, max_pages, get_driver)
+    pages_read = 0
+    seen_links = set()
+    deferred = []
+    stopped_early = False
+    try:
+        for page, cards in pages:
+            pages_read = page
+            # Result pages shift while new listings are posted; skip cards already seen
+            fresh = []
+            for card_index, card in cards:
+                key = normalize_link(card["Link"])
+                if key and key in seen_links:
                     continue
+                seen_links.add(key)
+                fresh.append((card_index, card))
+
+            links = [card["Link"] for _, card in fresh]
+            seen = store.get_crawl_cards(keyword, links, terms=matcher.digest)
+            known.update(store.get_known_listings(links))
 
-                company = get_element_text_safe(card, ".//div[contains(@class,'company_name')]/div/p") or "N/A"
-                location = get_element_text_safe(card, ".//div[@class='location_link']") or "N/A"
-                stipend = get_element_text_safe(card, ".//span[@class='stipend']") or "N/A"
-                duration = get_element_text_safe(card, ".//i[@class='ic-16-calendar']/following-sibling::span") or "N/A"
-                link = get_element_attr_safe(card, ".//a", "href")
-                if link and not link.startswith("http"):
-                    link = f"https://internshala.com{link}"
-
-                # Open in new tab to extract more details
-                driver.execute_script("window.open('');")
-                driver.switch_to.window(driver.window_handles[1])
-                driver.get(link)
-                time.sleep(2)
-
-                description = get_element_text_safe(driver, "//div[@class='text-container']") or "N/A"
-                skills = get_element_text_safe(driver, "//div[contains(text(),'Skill(s) required')]/following-sibling::div") or "N/A"
-                who_can_apply = get_element_text_safe(driver, "//div[contains(text(),'Who can apply')]/following-sibling::div") or "N/A"
-
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
-
-                # Clean and check title + description
-               # Clean and check title + description
-               
-                def clean_text(text):
-                    return re.sub(r'[^a-zA-Z0-9 ]', ' ', text).lower().strip()
-                
-                def tokenize(text):
-                    return set(clean_text(text).split())
-                
-                def is_relevant_job(title, description, expanded_keywords):
-                    full_text_tokens = tokenize(f"{title or ''} {description or ''}")
-                
-                    for keyword in expanded_keywords:
-                        keyword_tokens = tokenize(keyword)
-                        if keyword_tokens & full_text_tokens:  # set intersection
-                            return True
-                    return False
-                
-                # Usage example inside loop
-                if not is_relevant_job(title, description, expanded_keywords):
-                    print(f"❌ Skipped card {i+1}: Not relevant to '{keyword}' or similar terms")
-                    i += 1
+            to_fetch, from_store = set(), []
+            page_changed = False
+            for card_index, card in fresh:
+                key = normalize_link(card["Link"])
+                state = card_state(card, seen)
+                freshness[state] += 1
+                observed.append((card["Link"], card_fingerprint(card), state, seen.get(key, (None, None, None))[2]))
+                if state != "skipped":
+                    page_changed = True
+                elif seen[key][2] == CARD_REJECTED:
                     continue
-                
-                
-
-                jobs.append({
-                    "Title": title,
-                    "Company": company,
-                    "Location": location,
-                    "Stipend": stipend,
-                    "Duration": duration,
-                    "Link": link,
-                    "Skills": skills,
-                    "Who can apply": who_can_apply,
-                    "Description": description
-                })
-                count += 1
-                print(f"{count}. ✅ {title} at {company}")
-            except StaleElementReferenceException:
-                print(f"⚠️ Skipped card {i} due to stale reference.")
-            except Exception as e:
-                print(f"⚠️ Error at card {i}: {e}")
-            i += 1
+                if has_fresh_details(card):
+                    from_store.append((card_index, card))
+                else:
+                    to_fetch.add(card_index)
+
+            with stage_timer("relevance_check"):
+                title_hits, title_misses = matcher.split(fresh)
+            fetch_candidates([card for card in title_hits if card[0] in to_fetch])
+            reuse_known(from_store)
+            # Cards without a title match wait until every page's title matches had their turn
+            if RELEVANCE_TITLE_GATE != "strict":
+                deferred.extend(card for card in title_misses if card[0] in to_fetch)
+            if len(jobs) >= limit or cancelled():
+                break
+            # Results are newest first: a page of listings we already know means the rest are known too
+            if fresh and not page_changed:
+                print(f"⏹️ Page {page} holds only known, unchanged listings; not paging further.")
+                stopped_early = True
+                break
+
+        # The pages not read are known too: their listings come from the store, not the site
+        if stopped_early and len(jobs) < limit and not cancelled():
+            reuse_stored()
+
+        if len(jobs) < limit and not cancelled():
+            fetch_candidates(deferred)
+        if cancelled():
+            print(f"🛑 Crawl for '{type_}' cancelled after {len(jobs)} listings.")
+
+        cards_seen = matcher.stats["cards"]
+        matcher.stats["detail_fetches_skipped"] = cards_seen - matcher.stats["detail_fetches"]
+        print(f"⏭️ Skipped {matcher.stats['detail_fetches_skipped']} of {cards_seen} detail fetches over {pages_read} page(s).")
+        print(f"🆕 {freshness['new']} new, {freshness['changed']} changed, {freshness['stale']} stale, "
+              f"{freshness['skipped']} unchanged; {freshness['from_store']} served from the store.")
+        if stats is not None:
+            stats.update(matcher.stats)
+            stats["pages"] = pages_read
+            stats["freshness"] = freshness
+            if claims is not None:
+                stats["duplicates"] = duplicates
     finally:
-        driver.quit()
+        pages.close()
+        if driver is not None:
+            pool.release(driver)
 
+    with stage_timer("store_write"):
+        if fetched_rows:
+            store.upsert_listings(type_, fetched_rows, keyword=keyword)
+        if reused_links:
+            store.touch_listings(reused_links)
+        # Unchanged cards keep their check time (so they go stale after the TTL) unless they were looked at again
+        store.record_crawl_cards(keyword, [
+            (link, fingerprint, outcomes.get(normalize_link(link), previous if state == "skipped" else CARD_UNCHECKED))
+            for link, fingerprint, state, previous in observed
+            if state != "skipped" or normalize_link(link) in outcomes
+        ], terms=matcher.digest)
     if jobs:
-        file_name = f"internshala_{type_}s.csv"
-        with open(file_name, "w", newline='', encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=jobs[0].keys())
-            writer.writeheader()
-            writer.writerows(jobs)
-        print(f"\n📦 Saved {len(jobs)} to {file_name}")
+        print(f"\n📦 Saved {len(fetched_rows)} {type_}s to the listing store, refreshed {len(reused_links)} known ones")
     else:
         print(f"\n❌ No {type_}s saved.")
 
+    return jobs
+
 # === Final Master Function ===
-def fetch_both_internships_and_jobs(keyword: str):
-    crawl_internshala_by_type(keyword=keyword, limit=3, type_="internship")
-    crawl_internshala_by_type(keyword=keyword, limit=3, type_="job")
+def fetch_both_internships_and_jobs(keyword: str, limit: int = SCRAPE_DEFAULT_LIMIT, types=("internship", "job"),
+                                    cancel_event=None, on_listing=None, max_pages: int = SCRAPE_DEFAULT_PAGES):
+    """Crawl every listing type concurrently; one type failing does not cancel the others.
+
+    `limit` is the listing budget and `max_pages` the result page budget, per type.
+    `on_listing(type_, row)` streams accepted rows out while the crawls are still running.
+
+    Returns per-type results: {"internship": {"count", "pages", "seconds", "error", "relevance", "freshness"}, "job": {...}}.
+    """
+    def timed_crawl(type_):
+        start = time.perf_counter()
+        stats = {}
+        try:
+            jobs = crawl_internshala_by_type(
+                keyword=keyword, limit=limit, type_=type_, cancel_event=cancel_event,
+                on_listing=(lambda row: on_listing(type_, row)) if on_listing is not None else None,
+                stats=stats, max_pages=max_pages,
+            )
+            error = None
+        except Exception as e:
+            print(f"❌ Crawl for '{type_}' failed: {e}")
+            jobs, error = [], str(e)
+        pages = stats.pop("pages", 0)
+        freshness = stats.pop("freshness", {})
+        return {
+            "count": len(jobs), "pages": pages, "seconds": round(time.perf_counter() - start, 2), "error": error,
+            "relevance": stats, "freshness": freshness,
+        }
+
+    workers = max(1, min(SCRAPE_CONCURRENCY, len(types)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as executor:
+        futures = {type_: executor.submit(timed_crawl, type_) for type_ in types}
+        return {type_: future.result() for type_, future in futures.items()}
+
+# === Batch Crawl ===
+class BatchClaims:
+    """Cards accepted by the crawls of one batch, and the detail pages any of them fetched."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accepted = set()
+        # link_key -> Future of its detail page, so crawls reaching a page at once fetch it once
+        self._details = {}
+
+    def taken(self, link):
+        with self._lock:
+            return normalize_link(link) in self._accepted
+
+    def claim(self, link):
+        """True for the first crawl to accept `link`; False once another crawl has."""
+        key = normalize_link(link)
+        with self._lock:
+            if key in self._accepted:
+                return False
+            self._accepted.add(key)
+            return True
+
+    def detail(self, link):
+        """The detail page another crawl already read, or None."""
+        with self._lock:
+            future = self._details.get(normalize_link(link))
+        return future.result() if future is not None and future.done() else None
+
+    def store_detail(self, link, detail):
+        future = Future()
+        future.set_result(detail)
+        with self._lock:
+            self._details[normalize_link(link)] = future
+
+    def fetch_details(self, links):
+        """fetch_details() for the pages no crawl of the batch has fetched yet; waits for those in flight.
+
+        Returns (details in the order of `links`, number of pages this call fetched).
+        """
+        owned, futures = [], []
+        with self._lock:
+            for link in links:
+                key = normalize_link(link)
+                future = self._details.get(key)
+                if future is None:
+                    future = self._details[key] = Future()
+                    owned.append((link, future))
+                futures.append(future)
+        if owned:
+            try:
+                details = fetch_details([link for link, _ in owned])
+            except BaseException as e:
+                for _, future in owned:
+                    future.set_exception(e)
+                raise
+            for (_, future), detail in zip(owned, details):
+                future.set_result(detail)
+        return [future.result() for future in futures], len(owned)
+
+
+def fetch_batch(keywords, limit: int = SCRAPE_DEFAULT_LIMIT, types=("internship", "job"), cancel_event=None,
+                on_listing=None, max_pages: int = SCRAPE_DEFAULT_PAGES):
+    """Crawl several keywords as one batch, so the cost follows the unique result pages.
+
+    Keywords that map to the same result-page URL are searched once. Every crawl
+    judges relevance against the merged expanded keywords of the whole batch. A card
+    belongs to the first crawl that accepts it; a detail page fetched by one crawl is
+    reused by the others, so a card one crawl passed over is still judged by the rest. Each
+    accepted row gets a "Keywords" list: the input keywords whose own expanded set
+    matches it. `limit` and `max_pages` are per search and type.
+
+    `on_listing(type_, row)` streams rows out as they are accepted. Returns
+    {"searches": {search: [keywords]}, "crawl": {search: {type_: stats}}, "listings": {type_: [row]}}.
+    """
+    searches = {}
+    for keyword in keywords:
+        search = search_keyword(keyword)
+        if search and keyword not in searches.setdefault(search, []):
+            searches[search].append(keyword)
+    if not searches:
+        return {"searches": {}, "crawl": {}, "listings": {type_: [] for type_ in types}}
+    print(f"\n🧺 Batch of {len(keywords)} keyword(s) -> {len(searches)} unique search(es): {list(searches)}")
+
+    load_dotenv()
+    TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
+    workers = max(1, min(SCRAPE_BATCH_CONCURRENCY, len(searches) * len(types)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="expand") as executor:
+        expansions = dict(zip(searches, executor.map(
+            lambda search: expand_keywords_with_together(TOGETHER_API_KEY, search), searches
+        )))
+    merged = sorted({term for expanded in expansions.values() for term in expanded})
+    matchers = {search: RelevanceMatcher(expanded) for search, expanded in expansions.items()}
+
+    lock = threading.Lock()
+    claims = BatchClaims()
+    listings = {type_: [] for type_ in types}
+
+    def accepted(type_, row):
+        matched = [
+            keyword
+            for search, matcher in matchers.items() if matcher.matches(row["Title"], row["Description"])
+            for keyword in searches[search]
+        ]
+        row = {**row, "Keywords": matched}
+        with lock:
+            listings[type_].append(row)
+        if on_listing is not None:
+            on_listing(type_, row)
+
+    def timed_crawl(search, type_):
+        start = time.perf_counter()
+        stats = {}
+        try:
+            jobs = crawl_internshala_by_type(
+                keyword=search, limit=limit, type_=type_, cancel_event=cancel_event,
+                on_listing=lambda row: accepted(type_, row), stats=stats, max_pages=max_pages,
+                expanded_keywords=merged, claims=claims,
+            )
+            error = None
+        except Exception as e:
+            print(f"❌ Crawl for '{type_}' / '{search}' failed: {e}")
+            jobs, error = [], str(e)
+        pages = stats.pop("pages", 0)
+        freshness = stats.pop("freshness", {})
+        duplicates = stats.pop("duplicates", 0)
+        return {
+            "count": len(jobs), "pages": pages, "duplicates": duplicates,
+            "seconds": round(time.perf_counter() - start, 2), "error": error,
+            "relevance": stats, "freshness": freshness,
+        }
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as executor:
+        futures = {
+            (search, type_): executor.submit(timed_crawl, search, type_) for search in searches for type_ in types
+        }
+        crawl = {search: {type_: futures[search, type_].result() for type_ in types} for search in searches}
+
+    return {"searches": searches, "crawl": crawl, "listings": listings}
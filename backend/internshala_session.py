@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from dotenv import load_dotenv
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from backend.detail_fetcher import USER_AGENT
+from backend.metrics import stage_timer
+
+# === Settings ===
+INTERNSHALA_BASE_URL = os.getenv("INTERNSHALA_BASE_URL", "https://internshala.com").rstrip("/")
+INTERNSHALA_SESSION_PATH = os.getenv("INTERNSHALA_SESSION_PATH", os.path.join("cache", "internshala_session.json"))
+INTERNSHALA_LOGIN_PATH = os.getenv("INTERNSHALA_LOGIN_PATH", "/login/student")
+# Redirects to the login page when the session cookies are no longer valid.
+INTERNSHALA_SESSION_CHECK_PATH = os.getenv("INTERNSHALA_SESSION_CHECK_PATH", "/student/dashboard")
+# A successful validity check is trusted for this many seconds.
+SESSION_CHECK_INTERVAL = float(os.getenv("SESSION_CHECK_INTERVAL", "300"))
+LOGIN_TIMEOUT = float(os.getenv("LOGIN_TIMEOUT", "15"))
+
+# (email, password, submit) ids: the login page first, then the modal shown on listing pages
+LOGIN_FORM_IDS = [
+    ("email", "password", "login_submit"),
+    ("modal_email", "modal_password", "modal_login_submit"),
+]
+
+
+class LoginError(Exception):
+    pass
+
+
+class InternshalaSession:
+    """Logs in to Internshala once and shares the session cookies with every driver.
+
+    Cookies are kept on disk (owner read/write only) so a restart does not log in
+    again. Validity is checked with a plain HTTP request, at most once per
+    SESSION_CHECK_INTERVAL, and the login only runs again once the check fails.
+    """
+
+    def __init__(self, email=None, password=None, path=INTERNSHALA_SESSION_PATH):
+        load_dotenv()
+        self.email = email or os.getenv("INTERNSHALA_EMAIL")
+        self.password = password or os.getenv("INTERNSHALA_PASSWORD")
+        self.path = path
+        self.cookies = []
+        self.saved_at = None
+        self.version = 0
+        self.checked_at = 0.0
+        self.stats = {"logins": 0, "checks": 0, "expired": 0, "cookie_loads": 0}
+        self._loaded_into = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    # === Cookie file ===
+    def _account(self):
+        # Stored next to the cookies so a different account in .env never reuses them
+        return hashlib.sha256((self.email or "").lower().encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable session file {self.path}: {e}")
+            return
+        if saved.get("account") != self._account():
+            return
+        self.cookies = saved.get("cookies", [])
+        self.saved_at = saved.get("saved_at")
+        self.version += 1
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        payload = {"account": self._account(), "saved_at": self.saved_at, "cookies": self.cookies}
+        # mkstemp creates the file 0600; the rename replaces the old file atomically
+        fd, temp_path = tempfile.mkstemp(prefix=".session-", suffix=".json", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def clear(self):
+        with self._lock:
+            self._invalidate()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _invalidate(self):
+        self.cookies = []
+        self.saved_at = None
+        self.checked_at = 0.0
+        self.version += 1
+
+    # === Validity ===
+    def _cookies_expired(self):
+        now = time.time()
+        return any(cookie.get("expiry") and cookie["expiry"] < now for cookie in self.cookies)
+
+    def _check_remote(self):
+        """One HTTP request with the saved cookies; a redirect to the login page means the session is gone."""
+        self.stats["checks"] += 1
+        jar = requests.cookies.RequestsCookieJar()
+        for cookie in self.cookies:
+            jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        try:
+            response = requests.get(
+                f"{INTERNSHALA_BASE_URL}{INTERNSHALA_SESSION_CHECK_PATH}",
+                cookies=jar, allow_redirects=False, timeout=10, headers={"User-Agent": USER_AGENT},
+            )
+        except Exception as e:
+            # Network trouble is not proof of expiry; let the apply flow find out
+            print(f"⚠️ Session check failed: {e}")
+            return True
+        location = response.headers.get("Location", "")
+        return response.status_code == 200 or (300 <= response.status_code < 400 and "login" not in location)
+
+    def is_valid(self):
+        if not self.cookies or self._cookies_expired():
+            return False
+        if time.time() - self.checked_at < SESSION_CHECK_INTERVAL:
+            return True
+        if self._check_remote():
+            self.checked_at = time.time()
+            return True
+        self.stats["expired"] += 1
+        print("🔑 Saved Internshala session has expired.")
+        return False
+
+    # === Drivers ===
+    def _apply_cookies(self, driver):
+        self.stats["cookie_loads"] += 1
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Chrome takes cookies for any domain over CDP, so no page load is needed first
+            for cookie in self.cookies:
+                params = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly") if key in cookie}
+                if cookie.get("expiry"):
+                    params["expires"] = cookie["expiry"]
+                if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                    params["sameSite"] = cookie["sameSite"]
+                driver.execute_cdp_cmd("Network.setCookie", params)
+            return
+
+        # Other drivers only accept cookies for the page they are on
+        driver.get(f"{INTERNSHALA_BASE_URL}/robots.txt")
+        for cookie in self.cookies:
+            driver.add_cookie({key: value for key, value in cookie.items() if key != "sameSite"})
+
+    def _login(self, driver):
+        with stage_timer("login"):
+            self._submit_login(driver)
+
+    def _submit_login(self, driver):
+        if not self.email or not self.password:
+            raise LoginError("INTERNSHALA_EMAIL and INTERNSHALA_PASSWORD must be set in .env")
+
+        driver.get(f"{INTERNSHALA_BASE_URL}{INTERNSHALA_LOGIN_PATH}")
+        for email_id, password_id, submit_id in LOGIN_FORM_IDS:
+            if driver.find_elements(By.ID, email_id):
+                break
+        else:
+            raise LoginError("Login form not found.")
+
+        driver.find_element(By.ID, email_id).send_keys(self.email)
+        driver.find_element(By.ID, password_id).send_keys(self.password)
+        driver.find_element(By.ID, submit_id).click()
+        print("🔐 Login submitted.")
+
+        # Logged in once the form is gone, instead of a fixed sleep
+        try:
+            WebDriverWait(driver, LOGIN_TIMEOUT).until(EC.invisibility_of_element_located((By.ID, submit_id)))
+        except Exception:
+            raise LoginError("Login was not accepted.")
+
+        self.cookies = driver.get_cookies()
+        self.saved_at = time.time()
+        self.checked_at = self.saved_at
+        self.version += 1
+        self.stats["logins"] += 1
+        self._loaded_into[driver.session_id] = self.version
+        self._save()
+        print("✅ Logged in to Internshala; session saved.")
+
+    def ensure(self, driver):
+        """Make `driver` logged in: reuse the saved cookies while they are valid, log in otherwise."""
+        with self._lock:
+            if not self.is_valid():
+                self._invalidate()
+                self._login(driver)
+                return driver
+            if self._loaded_into.get(driver.session_id) != self.version:
+                self._apply_cookies(driver)
+                self._loaded_into[driver.session_id] = self.version
+            return driver
+
+    def expire(self, driver):
+        """The site asked `driver` to log in again: drop the cookies and log in with it."""
+        with self._lock:
+            self.stats["expired"] += 1
+            self._invalidate()
+            self._login(driver)
+
+    def info(self):
+        return {
+            "logged_in": bool(self.cookies),
+            "saved_at": self.saved_at,
+            "checked_at": self.checked_at or None,
+            **self.stats,
+        }
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_internshala_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = InternshalaSession()
+        return _session
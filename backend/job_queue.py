@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# === Settings ===
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_DEPTH = int(os.getenv("JOB_QUEUE_DEPTH", "10"))
+JOB_HISTORY = int(os.getenv("JOB_HISTORY", "100"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "cancel_requested": self.cancel_event.is_set(),
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queued_seconds": round((self.started_at or end) - self.submitted_at, 3),
+            "run_seconds": round(end - self.started_at, 3) if self.started_at else None,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Runs long blocking work (scrapes, auto-apply) on a bounded worker pool.
+
+    Job functions are called as `fn(cancel_event=..., **params)` and should check
+    the event between units of work; queued jobs are cancelled outright.
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS, max_queued=JOB_QUEUE_DEPTH, history=JOB_HISTORY):
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, job, fn):
+        with self._lock:
+            if job.cancel_event.is_set():
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        try:
+            result = fn(cancel_event=job.cancel_event, **job.params)
+            status, error = (CANCELLED if job.cancel_event.is_set() else SUCCEEDED), None
+        except Exception as e:
+            result, status, error = None, FAILED, str(e)
+
+        with self._lock:
+            job.result = result
+            job.error = error
+            job.status = status
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def submit(self, kind, fn, **params):
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if queued >= self.max_queued:
+                raise QueueFullError(f"Job queue is full ({queued} waiting). Try again later.")
+
+            job = Job(kind, params)
+            self._jobs[job.id] = job
+            self._prune()
+
+        job.future = self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a queued job immediately; ask a running job to stop at its next checkpoint."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job.cancel_event.set()
+            if job.status == QUEUED and job.future is not None and job.future.cancel():
+                job.status = CANCELLED
+                job.finished_at = time.time()
+            return job
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"workers": self.max_workers, "max_queued": self.max_queued, "jobs": counts}
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if job.status not in FINISHED_STATES:
+                self.cancel(job.id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
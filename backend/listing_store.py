@@ -0,0 +1,356 @@
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+# === Settings ===
+LISTING_DB_PATH = os.getenv("LISTING_DB_PATH", "internshala_listings.sqlite")
+# Known listings whose card is unchanged get their detail page re-fetched after this many seconds (0: always).
+LISTING_FRESHNESS_TTL = float(os.getenv("LISTING_FRESHNESS_TTL", str(24 * 3600)))
+LEGACY_CSV_FILES = {
+    "internship": "internshala_internships.csv",
+    "job": "internshala_jobs.csv",
+}
+
+# CSV column name -> table column
+FIELD_COLUMNS = {
+    "Title": "title",
+    "Company": "company",
+    "Location": "location",
+    "Stipend": "stipend",
+    "Duration": "duration",
+    "Link": "link",
+    "Skills": "skills",
+    "Who can apply": "who_can_apply",
+    "Description": "description",
+}
+# Fields shown on the result-page card; a change in any of them means the listing changed.
+CARD_FIELDS = ("Title", "Company", "Location", "Stipend", "Duration")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    link_key TEXT NOT NULL,
+    type TEXT NOT NULL,
+    keyword TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    stipend TEXT,
+    duration TEXT,
+    link TEXT,
+    skills TEXT,
+    who_can_apply TEXT,
+    description TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    fingerprint TEXT,
+    detail_seen REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_listings_link_key ON listings (link_key);
+CREATE INDEX IF NOT EXISTS idx_listings_type_last_seen ON listings (type, last_seen DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+-- Every card seen on a result page per keyword, including ones that were not relevant
+CREATE TABLE IF NOT EXISTS crawl_cards (
+    keyword TEXT NOT NULL,
+    link_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    terms TEXT,
+    PRIMARY KEY (keyword, link_key)
+);
+"""
+
+# crawl_cards.status: stored as a listing, fetched but not relevant, or never fetched.
+# crawl_cards.terms identifies the keyword set a card was judged against.
+CARD_LISTED = "listed"
+CARD_REJECTED = "rejected"
+CARD_UNCHECKED = "unchecked"
+
+# Columns added after the first release; older databases get them on open.
+ADDED_COLUMNS = {"fingerprint": "TEXT", "detail_seen": "REAL"}
+ADDED_CRAWL_CARD_COLUMNS = {"terms": "TEXT"}
+
+
+def normalize_link(link):
+    """Dedupe key for a listing: lower-cased host, no query/fragment, no trailing slash."""
+    parts = urlsplit((link or "").strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+def card_fingerprint(row):
+    """Hash of the result-page card fields, comparable before the detail page is fetched."""
+    text = "\x1f".join(" ".join(str(row.get(field) or "").split()) for field in CARD_FIELDS)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ListingStore:
+    """Embedded SQLite store for scraped listings (WAL mode, one connection per thread)."""
+
+    def __init__(self, path=LISTING_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(listings)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE listings ADD COLUMN {column} {column_type}")
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(crawl_cards)")}
+            for column, column_type in ADDED_CRAWL_CARD_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE crawl_cards ADD COLUMN {column} {column_type}")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # === Writes ===
+    def upsert_listings(self, type_, rows, keyword=None, seen_at=None):
+        """Insert new listings and refresh known ones; `first_seen` is kept on conflict.
+
+        Rows are full listings (card and detail page), so they also reset the card
+        fingerprint and the detail freshness clock. `keyword` is stored normalized,
+        the same way crawl cards are keyed.
+        """
+        seen_at = seen_at or time.time()
+        keyword = self._crawl_keyword(keyword) or None
+        records = []
+        for row in rows:
+            link_key = normalize_link(row.get("Link"))
+            if not link_key:
+                continue
+            records.append(
+                [link_key, type_, keyword]
+                + [row.get(field) for field in FIELD_COLUMNS]
+                + [seen_at, seen_at, card_fingerprint(row), seen_at]
+            )
+        if not records:
+            return 0
+
+        columns = ", ".join(FIELD_COLUMNS.values())
+        placeholders = ", ".join("?" for _ in range(len(FIELD_COLUMNS) + 7))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in FIELD_COLUMNS.values())
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT INTO listings (link_key, type, keyword, {columns}, first_seen, last_seen, fingerprint, detail_seen) "
+                f"VALUES ({placeholders}) "
+                f"ON CONFLICT (link_key) DO UPDATE SET type = excluded.type, "
+                f"keyword = COALESCE(excluded.keyword, listings.keyword), {updates}, last_seen = excluded.last_seen, "
+                f"fingerprint = excluded.fingerprint, detail_seen = excluded.detail_seen",
+                records,
+            )
+        return len(records)
+
+    def touch_listings(self, links, seen_at=None):
+        """Mark known listings as seen again without touching their stored details."""
+        seen_at = seen_at or time.time()
+        keys = [key for key in (normalize_link(link) for link in links) if key]
+        with self._connection() as conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                conn.execute(f"UPDATE listings SET last_seen = ? WHERE link_key IN ({placeholders})", [seen_at] + chunk)
+        return len(keys)
+
+    # === Reads ===
+    SELECT_COLUMNS = ", ".join(list(FIELD_COLUMNS.values()) + ["type", "first_seen", "last_seen", "link_key"])
+    LISTING_KEYS = list(FIELD_COLUMNS) + ["Type", "First seen", "Last seen"]
+
+    def _select(self, where="", params=(), suffix="", conn=None):
+        """Yields listings as dicts keyed by the CSV field names, plus Type / First seen / Last seen."""
+        conn = conn or self._connection()
+        cursor = conn.execute(f"SELECT {self.SELECT_COLUMNS} FROM listings {where} {suffix}", params)
+        cursor.row_factory = None
+        keys = self.LISTING_KEYS
+        for row in cursor:
+            yield row[-1], dict(zip(keys, row))
+
+    def iter_listings(self, type_=None, keyword=None, limit=None, since=None):
+        """Listings newest first, filtered by type/keyword/last_seen, read lazily from the cursor.
+
+        The cursor gets its own connection, so the iterator can be shared between
+        threads as long as only one of them advances it at a time.
+        """
+        clauses, params = [], []
+        keyword = self._crawl_keyword(keyword)
+        if type_:
+            clauses.append("type = ?")
+            params.append(type_)
+        if keyword:
+            clauses.append("keyword = ?")
+            params.append(keyword)
+        if since:
+            clauses.append("last_seen >= ?")
+            params.append(since)
+
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        suffix = "ORDER BY last_seen DESC, id"
+        if limit:
+            suffix += " LIMIT ?"
+            params.append(limit)
+
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        try:
+            for _, listing in self._select(where, params, suffix, conn=conn):
+                yield listing
+        finally:
+            conn.close()
+
+    def get_listings(self, type_=None, keyword=None, limit=None, since=None):
+        return list(self.iter_listings(type_=type_, keyword=keyword, limit=limit, since=since))
+
+    def get_listings_by_links(self, links):
+        """Listings for the given links, in the order the links were given."""
+        keys = [normalize_link(link) for link in links]
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            found.update(self._select(f"WHERE link_key IN ({placeholders})", chunk))
+        return [found[key] for key in keys if key in found]
+
+    def get_known_listings(self, links):
+        """{link_key: (fingerprint, detail_seen, listing)} for the links already in the store."""
+        keys = [key for key in (normalize_link(link) for link in links) if key]
+        known = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor = self._connection().execute(
+                f"SELECT {self.SELECT_COLUMNS}, fingerprint, detail_seen FROM listings WHERE link_key IN ({placeholders})",
+                chunk,
+            )
+            cursor.row_factory = None
+            for row in cursor:
+                known[row[-3]] = (row[-2], row[-1], dict(zip(self.LISTING_KEYS, row)))
+        return known
+
+    # === Crawl cards (incremental crawling) ===
+    @staticmethod
+    def _crawl_keyword(keyword):
+        return " ".join((keyword or "").lower().split())
+
+    def get_crawl_cards(self, keyword, links, terms=None):
+        """{link_key: (fingerprint, checked_at, status)} for cards seen before under this keyword.
+
+        A card rejected under a different keyword set than `terms` comes back as unchecked,
+        so it is judged again.
+        """
+        keys = [key for key in (normalize_link(link) for link in links) if key]
+        crawl_keyword = self._crawl_keyword(keyword)
+        seen = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._connection().execute(
+                f"SELECT link_key, fingerprint, checked_at, status, terms FROM crawl_cards "
+                f"WHERE keyword = ? AND link_key IN ({placeholders})",
+                [crawl_keyword] + chunk,
+            )
+            for link_key, fingerprint, checked_at, status, card_terms in rows:
+                if status == CARD_REJECTED and terms is not None and card_terms != terms:
+                    status = CARD_UNCHECKED
+                seen[link_key] = (fingerprint, checked_at, status)
+        return seen
+
+    def record_crawl_cards(self, keyword, cards, checked_at=None, terms=None):
+        """Remember `(link, fingerprint, status)` triples seen on result pages for this keyword,
+        judged against the keyword set `terms`."""
+        checked_at = checked_at or time.time()
+        crawl_keyword = self._crawl_keyword(keyword)
+        records = [
+            (crawl_keyword, key, fingerprint, checked_at, status, terms)
+            for key, fingerprint, status in ((normalize_link(link), fingerprint, status) for link, fingerprint, status in cards)
+            if key
+        ]
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO crawl_cards (keyword, link_key, fingerprint, checked_at, status, terms) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+        return len(records)
+
+    def count(self, type_=None):
+        if type_:
+            return self._connection().execute("SELECT COUNT(*) FROM listings WHERE type = ?", (type_,)).fetchone()[0]
+        return self._connection().execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    # === CSV import / export ===
+    def import_csv(self, file_name, type_):
+        if not os.path.exists(file_name):
+            return 0
+        with open(file_name, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        seen_at = os.path.getmtime(file_name)
+        return self.upsert_listings(type_, rows, seen_at=seen_at)
+
+    def import_legacy_csvs(self, files=LEGACY_CSV_FILES):
+        """One-time import of the CSVs the scraper used to overwrite on every run."""
+        conn = self._connection()
+        if conn.execute("SELECT value FROM meta WHERE key = 'legacy_csv_imported'").fetchone():
+            return 0
+
+        imported = 0
+        for type_, file_name in files.items():
+            imported += self.import_csv(file_name, type_)
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_csv_imported', ?)", (str(time.time()),))
+        if imported:
+            print(f"📥 Imported {imported} listings from legacy CSV files.")
+        return imported
+
+    def export_csv(self, file_name, type_):
+        listings = self.get_listings(type_=type_)
+        with open(file_name, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(FIELD_COLUMNS), extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(listings)
+        return len(listings)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_listing_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ListingStore()
+            _store.import_legacy_csvs()
+        return _store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import or export the listing store as CSV.")
+    parser.add_argument("command", choices=["import", "export", "count"])
+    parser.add_argument("type", nargs="?", choices=["internship", "job"])
+    parser.add_argument("file", nargs="?")
+    args = parser.parse_args()
+
+    store = get_listing_store()
+    if args.command == "count":
+        print(store.count(args.type))
+    elif not args.type or not args.file:
+        parser.error("import/export need a listing type and a CSV file")
+    elif args.command == "import":
+        print(f"📥 Imported {store.import_csv(args.file, args.type)} {args.type}s from {args.file}")
+    else:
+        print(f"📦 Exported {store.export_csv(args.file, args.type)} {args.type}s to {args.file}")
@@ -1,13 +1,33 @@
-from fastapi import FastAPI, UploadFile, File, Request
-from backend.resume_parser import extract_jobs_from_resume
-from backend.internshala_scraper import fetch_both_internships_and_jobs 
-from backend.auto_apply_internshala import auto_apply
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from backend.resume_parser import extract_jobs_from_resume, get_llm_client
+from backend.internshala_scraper import (
+    SCRAPE_BATCH_KEYWORDS_CAP, SCRAPE_DEFAULT_LIMIT, SCRAPE_DEFAULT_PAGES, SCRAPE_LIMIT_CAP, SCRAPE_PAGES_CAP,
+    fetch_batch, fetch_both_internships_and_jobs, keyword_cache,
+)
+from backend.auto_apply_internshala import APPLY_WORKERS, APPLY_WORKERS_CAP, auto_apply
+from backend.driver_pool import get_driver_pool, shutdown_driver_pool
+from backend.cache import TTLCache
+from backend.listing_store import get_listing_store, normalize_link
+from backend.ranking import get_listing_ranker, iter_ranked_listings
+from backend.resume_extract import (
+    RESUME_MAX_BYTES, ResumeRejectedError, extract_resume_text, start_extract_pool, shutdown_extract_pool,
+)
+from backend.job_queue import JobQueue, QueueFullError, FAILED, FINISHED_STATES
+from backend.metrics import http_request_seconds, http_requests, register_gauge, registry
+from backend.profiling import profile_requested, profile_run, profiled
+from backend.prewarm import PREWARM_ON_STARTUP, Prewarm, import_modules
+from starlette.concurrency import run_in_threadpool
 
-import tempfile
+import asyncio
+import queue
+import threading
+import time
 import os
+import hashlib
 import json
 import logging
-import csv
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # === Setup logging ===
@@ -22,67 +42,243 @@ logging.basicConfig(
     level=logging.INFO
 )
 
+# === Resume analysis cache ===
+# In memory only: resumes are personal data and should not outlive the process.
+resume_cache = TTLCache(
+    maxsize=int(os.getenv("RESUME_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RESUME_CACHE_TTL", "3600")),
+    name="resume_analysis",
+)
+
+
+def resume_text_hash(text: str) -> str:
+    """Hash of the resume text with whitespace normalized, so layout-only changes still hit."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# === Background job queue for scrapes and auto-apply runs ===
+job_queue = JobQueue()
+
+
+# === Startup prewarm ===
+# Heavy imports happen on first use; these warm them, and the resources behind them, off the startup path
+prewarm = Prewarm()
+
+
+def warm_llm_client():
+    get_llm_client()
+
+
+def warm_driver_pool():
+    pool = get_driver_pool("scraper")
+    pool.start().join()
+    return pool.stats()["live"]
+
+
+def warm_resume_parsers():
+    return len({future.result() for future in start_extract_pool()})
+
+
+def warm_listing_index():
+    store = get_listing_store()  # opens the store and runs the one-time CSV import
+    ranker = get_listing_ranker()
+    ranker.sync(store)
+    return ranker.stats()["listings"]
+
+
 # === Initialize FastAPI ===
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PREWARM_ON_STARTUP:
+        prewarm.add("imports", import_modules)
+        prewarm.add("llm_client", warm_llm_client)
+        prewarm.add("driver_pool", warm_driver_pool)
+        prewarm.add("resume_parsers", warm_resume_parsers)
+        prewarm.add("listing_index", warm_listing_index)
+        prewarm.start()
+    yield
+    job_queue.shutdown()
+    shutdown_driver_pool()
+    shutdown_extract_pool()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+# === Metrics ===
+register_gauge("jobs", "Background jobs by status.", ("status",),
+               lambda: {(status,): count for status, count in job_queue.stats()["jobs"].items()})
+register_gauge("cache_entries", "Entries per in-memory cache.", ("cache",),
+               lambda: {(cache.name,): cache.stats()["size"] for cache in (keyword_cache, resume_cache)})
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route templates (/jobs/{job_id}) keep the label set small; unmatched paths share one label
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        http_requests.inc(method=request.method, path=path, status=status)
+        http_request_seconds.observe(time.perf_counter() - start, method=request.method, path=path)
+
+
+@app.get("/ready")
+async def ready():
+    """503 until the startup prewarm has finished; failed components are listed but do not block."""
+    status = prewarm.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 
 # === STEP 1: Extract Job Titles from Resume ===
 @app.post("/analyze-resume")
-async def analyze_resume(resume: UploadFile = File(...)):
+async def analyze_resume(request: Request, resume: UploadFile = File(...)):
+    # X-Profile: 1 (or PROFILE_REQUESTS / PROFILE_SLOW_SECONDS) writes a profile to logs/profiles
+    with profile_run("analyze-resume", force=profile_requested(request.headers)) as session:
+        result = await analyze_resume_upload(resume)
+    if session is not None and session.paths:
+        result["profile"] = session.paths
+    return result
+
+
+async def analyze_resume_upload(resume: UploadFile):
     try:
-        suffix = resume.filename.split(".")[-1].lower()
         logging.info(f"📤 Received file: {resume.filename}")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{suffix}") as temp_file:
-            content = await resume.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
-        # Extract resume text
-        if suffix == "pdf":
-            import pdfplumber
-            with pdfplumber.open(temp_file_path) as pdf:
-                text = "\n".join([page.extract_text() or "" for page in pdf.pages])
-        elif suffix == "docx":
-            import docx
-            doc = docx.Document(temp_file_path)
-            text = "\n".join([para.text for para in doc.paragraphs])
-        elif suffix == "txt":
-            with open(temp_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
-        else:
-            error_msg = "❌ Unsupported file type. Use .pdf, .docx, or .txt"
-            logging.error(error_msg)
-            return {"error": error_msg}
-
-        os.remove(temp_file_path)
+        # Read one byte past the limit so oversized uploads are rejected without buffering them whole
+        content = await resume.read(RESUME_MAX_BYTES + 1)
+
+        # Parsing runs on the extraction process pool and the LLM call blocks, so both stay off the event loop
+        return await run_in_threadpool(analyze_resume_content, content, resume.filename)
+
+    except Exception as e:
+        logging.exception("❌ Error in /analyze-resume")
+        return {"error": str(e)}
+
+
+class ResumeAnalysisError(Exception):
+    """A rejected upload or a resume without job titles; raised inside the cache so it is not stored."""
+
+
+def analyze_resume_content(content: bytes, filename: str, on_title=None):
+    """{"job_titles", "cached", "resume_id"} for an uploaded resume, or {"error"}; blocks.
+
+    `resume_id` identifies the resume to /auto-apply and /ranked-listings, which rank
+    stored listings against it.
+
+    `on_title(title, index)` is called for each title as soon as it is known: while the
+    LLM reply streams in, or all at once on a cache hit.
+    """
+    suffix = filename.split(".")[-1].lower()
+    analyzed = False
+
+    def extract_titles(cleaned_text):
+        nonlocal analyzed
+        print("📄 Resume preview (first 500 chars):")
+        print(cleaned_text[:500])
+
+        analyzed = True
+        job_titles = extract_jobs_from_resume(cleaned_text, on_title=on_title)
+        if not job_titles:
+            raise ResumeAnalysisError("❌ No job titles could be extracted from the resume.")
+        logging.info(f"🔍 Extracted job titles: {job_titles}")
+        # The cleaned text is kept for ranking listings against this resume (see resume_profile)
+        return {"job_titles": job_titles, "resume_text": cleaned_text, "resume_id": resume_text_hash(cleaned_text)}
+
+    def analyze_file():
+        try:
+            text = extract_resume_text(content, suffix)
+        except ResumeRejectedError as e:
+            raise ResumeAnalysisError(str(e))
 
         # Clean text
         lines = text.splitlines()
         filtered_lines = [line for line in lines if "reference" not in line.lower()]
         cleaned_text = "\n".join(filtered_lines)
 
-        print("📄 Resume preview (first 500 chars):")
-        print(cleaned_text[:500])
+        # Different file, same resume text (re-exported PDF, renamed file, ...)
+        text_key = f"text:{resume_text_hash(cleaned_text)}"
+        result, cached = resume_cache.get_or_compute(text_key, lambda: extract_titles(cleaned_text))
+        if cached:
+            logging.info(f"⚡ Cache hit for resume text of {filename}: {result['job_titles']}")
+        return result
 
-        job_titles = extract_jobs_from_resume(cleaned_text)
+    # Same upload again, or the same upload still being analyzed: one extraction and LLM call per key
+    file_key = f"file:{hashlib.sha256(content).hexdigest()}"
+    try:
+        result, cached = resume_cache.get_or_compute(file_key, analyze_file)
+    except ResumeAnalysisError as e:
+        logging.error(str(e))
+        return {"error": str(e)}
+    if cached:
+        logging.info(f"⚡ Cache hit for {filename}: {result['job_titles']}")
 
-        if not job_titles:
-            error_msg = "❌ No job titles could be extracted from the resume."
-            logging.error(error_msg)
-            return {"error": error_msg}
+    # Titles streamed from the LLM were reported already; cached ones are reported all at once
+    if not analyzed and on_title is not None:
+        for index, title in enumerate(result["job_titles"]):
+            on_title(title, index)
+    return {"job_titles": result["job_titles"], "cached": not analyzed, "resume_id": result["resume_id"]}
 
-        logging.info(f"🔍 Extracted job titles: {job_titles}")
-        return {"job_titles": job_titles}
 
-    except Exception as e:
-        logging.exception("❌ Error in /analyze-resume")
-        return {"error": str(e)}
+def resume_profile(resume_id):
+    """(resume text, job titles) of an analyzed resume for ranking, or None once it left the cache."""
+    result = resume_cache.get(f"text:{resume_id}") if resume_id else None
+    if result is None:
+        return None
+    return result["resume_text"], result["job_titles"]
 
 
 # === STEP 2: Scrape Internshala Jobs ===
-import csv
-import logging
+def crawl_budget(body: dict):
+    """Listing and page budget from a request body, defaulted and capped; raises ValueError on bad input."""
+    limit = int(body.get("limit") or SCRAPE_DEFAULT_LIMIT)
+    max_pages = int(body.get("max_pages") or SCRAPE_DEFAULT_PAGES)
+    if limit < 1 or max_pages < 1:
+        raise ValueError("limit and max_pages must be positive")
+    return min(limit, SCRAPE_LIMIT_CAP), min(max_pages, SCRAPE_PAGES_CAP)
+
+
+def run_scrape_job(keyword: str, limit: int = SCRAPE_DEFAULT_LIMIT, max_pages: int = SCRAPE_DEFAULT_PAGES, cancel_event=None):
+    internship_links = []
+
+    def on_listing(type_, listing):
+        if type_ == "internship":
+            internship_links.append(listing["Link"])
+
+    crawl_results = fetch_both_internships_and_jobs(  # ✅ Run scraper
+        keyword, limit=limit, max_pages=max_pages, cancel_event=cancel_event, on_listing=on_listing
+    )
+
+    expected_fields = [
+        "Title", "Company", "Location", "Stipend",
+        "Duration", "Link", "Skills", "Who can apply", "Description"
+    ]
+
+    try:
+        stored = get_listing_store().get_listings_by_links(internship_links)
+        internships = [{field: (row.get(field) or "").strip() for field in expected_fields} for row in stored]
+    except Exception as e:
+        logging.error(f"⚠️ Error reading listing store: {e}")
+        return {"error": "Failed to read stored internships.", "crawl": crawl_results}
+
+    if not internships:
+        logging.warning("⚠️ No internships found after scraping.")
+        return {"error": f"No internships found for keyword: {keyword}", "crawl": crawl_results}
+
+    logging.info(f"✅ Returning {len(internships)} internships.")
+    return {"internships": internships, "crawl": crawl_results}
+
 
 @app.post("/scrape-jobs")
 async def scrape_jobs(request: Request):
@@ -92,60 +288,484 @@ async def scrape_jobs(request: Request):
 
         if not keyword:
             return {"error": "Missing keyword"}
+        try:
+            limit, max_pages = crawl_budget(body)
+        except (TypeError, ValueError):
+            return {"error": "limit and max_pages must be positive integers"}
 
-        fetch_both_internships_and_jobs(keyword)  # ✅ Run scraper
+        job = job_queue.submit(
+            "scrape", profiled("scrape", run_scrape_job, force=profile_requested(request.headers)),
+            keyword=keyword, limit=limit, max_pages=max_pages,
+        )
+        logging.info(f"🧾 Queued scrape job {job.id} for '{keyword}' (limit {limit}, {max_pages} page(s))")
+        return {"job_id": job.id, "status": job.status, "limit": limit, "max_pages": max_pages}
 
-        # ✅ Let file system complete write
-        import asyncio
-        await asyncio.sleep(1)
+    except QueueFullError as e:
+        logging.warning(f"⚠️ {e}")
+        return {"error": str(e)}
+    except Exception as e:
+        logging.error(f"❌ Error: {e}")
+        return {"error": "Internal server error"}
 
-        internships = []
-        expected_fields = [
-            "Title", "Company", "Location", "Stipend",
-            "Duration", "Link", "Skills", "Who can apply", "Description"
+def run_batch_scrape_job(keywords: list, limit: int = SCRAPE_DEFAULT_LIMIT, max_pages: int = SCRAPE_DEFAULT_PAGES,
+                         cancel_event=None):
+    batch = fetch_batch(keywords, limit=limit, max_pages=max_pages, cancel_event=cancel_event)
+    summary = {"searches": batch["searches"], "crawl": batch["crawl"]}
+
+    expected_fields = [
+        "Title", "Company", "Location", "Stipend",
+        "Duration", "Link", "Skills", "Who can apply", "Description"
+    ]
+    matched = {normalize_link(row["Link"]): row["Keywords"] for row in batch["listings"].get("internship", [])}
+
+    try:
+        stored = get_listing_store().get_listings_by_links([row["Link"] for row in batch["listings"].get("internship", [])])
+        internships = [
+            {**{field: (row.get(field) or "").strip() for field in expected_fields},
+             "Keywords": matched.get(normalize_link(row.get("Link")), [])}
+            for row in stored
         ]
+    except Exception as e:
+        logging.error(f"⚠️ Error reading listing store: {e}")
+        return {"error": "Failed to read stored internships.", **summary}
+
+    if not internships:
+        logging.warning("⚠️ No internships found after batch scraping.")
+        return {"error": f"No internships found for keywords: {', '.join(keywords)}", **summary}
+
+    logging.info(f"✅ Returning {len(internships)} internships for {len(batch['searches'])} unique searches.")
+    return {"internships": internships, **summary}
+
+
+@app.post("/scrape-jobs/batch")
+async def scrape_jobs_batch(request: Request):
+    """Queues one crawl for many keywords, e.g. every title `/analyze-resume` returned."""
+    try:
+        body = await request.json()
+        keywords = body.get("keywords")
+        if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+            return {"error": "keywords must be a list of strings"}
+        keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
 
+        if not keywords:
+            return {"error": "Missing keywords"}
+        if len(keywords) > SCRAPE_BATCH_KEYWORDS_CAP:
+            return {"error": f"At most {SCRAPE_BATCH_KEYWORDS_CAP} keywords per batch"}
         try:
-            with open("internshala_internships.csv", newline='', encoding="utf-8") as file:
-                # ✅ DO NOT read() before DictReader — it empties the file pointer
-                reader = csv.DictReader(file)
-                for row in reader:
-                    internship_data = {field: row.get(field, "").strip() for field in expected_fields}
-                    internships.append(internship_data)
-        except Exception as e:
-            logging.error(f"⚠️ Error reading internships file: {e}")
-            return {"error": "Failed to read internships file."}
+            limit, max_pages = crawl_budget(body)
+        except (TypeError, ValueError):
+            return {"error": "limit and max_pages must be positive integers"}
+
+        job = job_queue.submit(
+            "scrape-batch", profiled("scrape-batch", run_batch_scrape_job, force=profile_requested(request.headers)),
+            keywords=keywords, limit=limit, max_pages=max_pages,
+        )
+        logging.info(f"🧾 Queued batch scrape job {job.id} for {keywords} (limit {limit}, {max_pages} page(s))")
+        return {"job_id": job.id, "status": job.status, "keywords": keywords, "limit": limit, "max_pages": max_pages}
+
+    except QueueFullError as e:
+        logging.warning(f"⚠️ {e}")
+        return {"error": str(e)}
+    except Exception as e:
+        logging.error(f"❌ Error: {e}")
+        return {"error": "Internal server error"}
+
+@app.post("/scrape-jobs/stream")
+async def scrape_jobs_stream(request: Request):
+    """NDJSON stream: a `queued` event, one `listing` event per accepted card, then a `summary`."""
+    try:
+        body = await request.json()
+        keyword = body.get("keyword", "").strip()
 
-        if not internships:
-            logging.warning("⚠️ No internships found after scraping.")
-            return {"error": f"No internships found for keyword: {keyword}"}
+        if not keyword:
+            return {"error": "Missing keyword"}
+        try:
+            limit, max_pages = crawl_budget(body)
+        except (TypeError, ValueError):
+            return {"error": "limit and max_pages must be positive integers"}
+
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        started = time.perf_counter()
+
+        def on_listing(type_, listing):
+            loop.call_soon_threadsafe(events.put_nowait, {"event": "listing", "type": type_, "listing": listing})
+
+        def run_stream_job(keyword: str, limit: int, max_pages: int, cancel_event=None):
+            crawl_results = fetch_both_internships_and_jobs(
+                keyword, limit=limit, max_pages=max_pages, cancel_event=cancel_event, on_listing=on_listing
+            )
+            loop.call_soon_threadsafe(events.put_nowait, {"event": "summary", "crawl": crawl_results})
+            return {"crawl": crawl_results}
 
-        logging.info(f"✅ Returning {len(internships)} internships.")
-        return {"internships": internships}
+        job = job_queue.submit(
+            "scrape-stream", profiled("scrape-stream", run_stream_job, force=profile_requested(request.headers)),
+            keyword=keyword, limit=limit, max_pages=max_pages,
+        )
+        logging.info(f"🧾 Queued streaming scrape job {job.id} for '{keyword}'")
 
+    except QueueFullError as e:
+        logging.warning(f"⚠️ {e}")
+        return {"error": str(e)}
     except Exception as e:
         logging.error(f"❌ Error: {e}")
         return {"error": "Internal server error"}
 
+    async def stream():
+        listings = 0
+        first_listing_seconds = None
+        yield json.dumps({"event": "queued", "job_id": job.id}) + "\n"
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=1)
+                except asyncio.TimeoutError:
+                    # Job ended without a summary (cancelled while queued, or crashed)
+                    if job.status in FINISHED_STATES and events.empty():
+                        event = {"event": "summary", "crawl": None, "status": job.status, "error": job.error}
+                    else:
+                        continue
+
+                if event["event"] == "listing":
+                    listings += 1
+                    if first_listing_seconds is None:
+                        first_listing_seconds = round(time.perf_counter() - started, 2)
+                elif event["event"] == "summary":
+                    event.update({
+                        "listings": listings,
+                        "first_listing_seconds": first_listing_seconds,
+                        "total_seconds": round(time.perf_counter() - started, 2),
+                    })
+
+                yield json.dumps(event) + "\n"
+                if event["event"] == "summary":
+                    break
+        finally:
+            # Client went away before the crawl finished
+            if job.status not in FINISHED_STATES:
+                job_queue.cancel(job.id)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 # === STEP 3: Auto-apply ===
-# === STEP 3: Auto-apply ===
+def run_auto_apply_job(workers=APPLY_WORKERS, max_jobs=1, resume_text="", titles=(), cancel_event=None):
+    logging.info(f"🤖 Starting auto-apply with {workers} worker(s)...")
+    # returns a dict with status, message, applied and throughput stats
+    result = auto_apply(
+        max_jobs=max_jobs, cancel_event=cancel_event, workers=workers, resume_text=resume_text, titles=titles
+    )
+
+    if result.get("status") == "success" and result.get("applied"):
+        logging.info(f"✅ Auto-apply completed. {result['message']}")
+        return result  # Return full result with applied details
+
+    logging.warning("⚠️ Auto-apply did not apply to any internships.")
+    return {
+        "status": "fail",
+        "message": result.get("message") or "No applications were submitted. Please try again.",
+        "applied": [],
+        "stats": result.get("stats"),
+    }
+
+
+def apply_settings(body):
+    """(workers, max_jobs) from the request body, defaulted and capped; ValueError when invalid."""
+    workers = int(body.get("workers") or APPLY_WORKERS)
+    max_jobs = int(body.get("max_jobs") or 1)
+    if workers < 1 or max_jobs < 1:
+        raise ValueError("workers and max_jobs must be positive integers.")
+    return min(workers, APPLY_WORKERS_CAP), max_jobs
+
+
 @app.post("/auto-apply")
-async def trigger_auto_apply():
+async def trigger_auto_apply(request: Request):
     try:
-        logging.info("🤖 Starting auto-apply...")
-        result = auto_apply()  # returns a dict with status, message, applied
-
-        if result.get("status") == "success" and result.get("applied"):
-            logging.info(f"✅ Auto-apply completed. {result['message']}")
-            return result  # Return full result with applied details
-        else:
-            logging.warning("⚠️ Auto-apply did not apply to any internships.")
-            return {
-                "status": "fail",
-                "message": "No applications were submitted. Please try again.",
-                "applied": []
-            }
+        # The body is optional: {"workers": 3, "max_jobs": 10, "resume_id": "..."}
+        body = await request.json() if await request.body() else {}
+        try:
+            workers, max_jobs = apply_settings(body)
+        except (TypeError, ValueError) as e:
+            return {"error": str(e), "status": "fail", "applied": []}
+
+        # Best matches for this resume first; newest listings first without one
+        resume_id = body.get("resume_id")
+        profile = resume_profile(resume_id) if resume_id else ("", [])
+        if profile is None:
+            return {"error": "Unknown or expired resume_id; analyze the resume again.", "status": "fail", "applied": []}
+
+        job = job_queue.submit(
+            "auto-apply", profiled("auto-apply", run_auto_apply_job, force=profile_requested(request.headers)),
+            workers=workers, max_jobs=max_jobs, resume_text=profile[0], titles=profile[1],
+        )
+        logging.info(f"🧾 Queued auto-apply job {job.id} ({workers} worker(s), up to {max_jobs} application(s))")
+        return {"job_id": job.id, "status": job.status, "workers": workers, "max_jobs": max_jobs}
 
+    except QueueFullError as e:
+        logging.warning(f"⚠️ {e}")
+        return {"error": str(e), "status": "fail", "applied": []}
     except Exception as e:
         logging.exception("❌ Error in /auto-apply")
         return {"error": str(e), "status": "fail", "applied": []}
+
+
+# === STEP 1-3 in one call: server-side pipeline ===
+def run_pipeline(content, filename, emit, limit=SCRAPE_DEFAULT_LIMIT, max_pages=SCRAPE_DEFAULT_PAGES,
+                 workers=APPLY_WORKERS, max_jobs=1, cancel_event=None):
+    """Analyze -> scrape -> apply, each stage starting on the previous stage's first output.
+
+    The crawl for the top title starts as soon as the LLM has streamed that title, and
+    applying starts with the first internship the crawl accepts (then continues with the
+    best-ranked stored listings once the crawl is done). `emit(event)` gets the progress
+    events; the summary with per-stage timings is returned.
+    """
+    cancel_event = cancel_event or threading.Event()
+    started = time.perf_counter()
+    stages = {}
+    stage_lock = threading.Lock()
+    listings = queue.Queue()
+    crawl, applied, threads = {}, {}, []
+    counts = {"internship": 0, "job": 0}
+    analysis = {}
+    analyzed = threading.Event()
+
+    def stage(name, status, **info):
+        at = round(time.perf_counter() - started, 3)
+        with stage_lock:
+            entry = stages.setdefault(name, {})
+            entry[f"{status}_at"] = at
+            if status == "finished":
+                entry["seconds"] = round(at - entry["started_at"], 3)
+        emit({"event": "stage", "stage": name, "status": status, "at": at, **info})
+
+    def on_listing(type_, listing):
+        with stage_lock:
+            counts[type_] = counts.get(type_, 0) + 1
+        emit({"event": "listing", "type": type_, "listing": listing})
+        if type_ == "internship":
+            listings.put(listing)
+
+    def scrape(keyword):
+        stage("scrape", "started", keyword=keyword)
+        try:
+            crawl["result"] = fetch_both_internships_and_jobs(
+                keyword, limit=limit, max_pages=max_pages, cancel_event=cancel_event, on_listing=on_listing
+            )
+        except Exception as e:
+            logging.exception("❌ Pipeline crawl failed")
+            crawl["error"] = str(e)
+        finally:
+            listings.put(None)
+            stage("scrape", "finished", listings=dict(counts))
+
+    def streamed_listings():
+        """Internships as the crawl accepts them, then the best-ranked stored ones."""
+        while not cancel_event.is_set():
+            try:
+                listing = listings.get(timeout=1)
+            except queue.Empty:
+                continue
+            if listing is None:
+                break
+            if "first_listing_at" not in stages["apply"]:
+                stage("apply", "first_listing")
+            yield listing
+        # Ranked against this resume, so a crawl that finished first waits for the analysis
+        analyzed.wait()
+        resume_text, titles = resume_profile(analysis.get("resume_id")) or ("", analysis.get("job_titles") or [])
+        yield from iter_ranked_listings(type_="internship", resume_text=resume_text, titles=titles)
+
+    def apply():
+        stage("apply", "started")
+        try:
+            applied["result"] = auto_apply(
+                max_jobs=max_jobs, cancel_event=cancel_event, workers=workers, listings=streamed_listings()
+            )
+        except Exception as e:
+            logging.exception("❌ Pipeline auto-apply failed")
+            applied["result"] = {"status": "fail", "message": str(e), "applied": []}
+        finally:
+            stage("apply", "finished")
+
+    def on_title(title, index):
+        emit({"event": "title", "index": index, "title": title})
+        if index == 0:
+            # Chrome sessions and the login warm up while the first result pages load
+            for target, name, args in ((scrape, "pipeline-scrape", (title,)), (apply, "pipeline-apply", ())):
+                thread = threading.Thread(target=target, args=args, name=name)
+                thread.start()
+                threads.append(thread)
+
+    stage("analyze", "started")
+    try:
+        analysis.update(analyze_resume_content(content, filename, on_title=on_title))
+    finally:
+        analyzed.set()
+    stage("analyze", "finished", job_titles=analysis.get("job_titles"), cached=analysis.get("cached"))
+    if "error" in analysis and not threads:
+        return {"error": analysis["error"], "stages": stages}
+
+    for thread in threads:
+        thread.join()
+
+    total = round(time.perf_counter() - started, 3)
+    result = applied.get("result") or {}
+    logging.info(f"✅ Pipeline finished in {total}s: {counts['internship']} internship(s), "
+                 f"{len(result.get('applied', []))} application(s)")
+    return {
+        "job_titles": analysis.get("job_titles", []),
+        "cached": analysis.get("cached"),
+        "keyword": (analysis.get("job_titles") or [None])[0],
+        "listings": counts,
+        "crawl": crawl.get("result"),
+        "crawl_error": crawl.get("error"),
+        "apply": result,
+        "stages": stages,
+        "total_seconds": total,
+        # What the three calls one after another would have cost
+        "sequential_seconds": round(sum(entry.get("seconds", 0) for entry in stages.values()), 3),
+    }
+
+
+@app.post("/pipeline")
+async def pipeline(
+    request: Request,
+    resume: UploadFile = File(...),
+    limit: str = Form(""),
+    max_pages: str = Form(""),
+    workers: str = Form(""),
+    max_jobs: str = Form(""),
+):
+    """NDJSON stream: `queued`, `stage` started/finished events, `title` and `listing` events, then a `summary`."""
+    try:
+        try:
+            limit_, max_pages_ = crawl_budget({"limit": limit, "max_pages": max_pages})
+            workers_, max_jobs_ = apply_settings({"workers": workers, "max_jobs": max_jobs})
+        except (TypeError, ValueError):
+            return {"error": "limit, max_pages, workers and max_jobs must be positive integers"}
+
+        content = await resume.read(RESUME_MAX_BYTES + 1)
+        filename = resume.filename
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def emit(event):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        def run_pipeline_job(filename: str, limit: int, max_pages: int, workers: int, max_jobs: int, cancel_event=None):
+            # The upload stays in this closure so job params remain small and JSON-friendly
+            summary = run_pipeline(content, filename, emit, limit=limit, max_pages=max_pages,
+                                   workers=workers, max_jobs=max_jobs, cancel_event=cancel_event)
+            emit({"event": "summary", **summary})
+            return summary
+
+        job = job_queue.submit(
+            "pipeline", profiled("pipeline", run_pipeline_job, force=profile_requested(request.headers)),
+            filename=filename, limit=limit_, max_pages=max_pages_, workers=workers_, max_jobs=max_jobs_,
+        )
+        logging.info(f"🧾 Queued pipeline job {job.id} for {filename}")
+
+    except QueueFullError as e:
+        logging.warning(f"⚠️ {e}")
+        return {"error": str(e)}
+    except Exception as e:
+        logging.exception("❌ Error in /pipeline")
+        return {"error": str(e)}
+
+    async def stream():
+        yield json.dumps({"event": "queued", "job_id": job.id}) + "\n"
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=1)
+                except asyncio.TimeoutError:
+                    # Job ended without a summary (cancelled while queued, or crashed)
+                    if job.status in FINISHED_STATES and events.empty():
+                        event = {"event": "summary", "status": job.status, "error": job.error}
+                    else:
+                        continue
+
+                yield json.dumps(event) + "\n"
+                if event["event"] == "summary":
+                    break
+        finally:
+            # Client went away before the pipeline finished
+            if job.status not in FINISHED_STATES:
+                job_queue.cancel(job.id)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+# === Background jobs ===
+@app.get("/jobs")
+async def list_jobs():
+    return job_queue.stats()
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        return {"error": f"Unknown job: {job_id}"}
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        return {"error": f"Unknown job: {job_id}"}
+    if job.status == FAILED:
+        return {"error": job.error, "status": job.status}
+    if job.status not in FINISHED_STATES:
+        return {"error": f"Job is {job.status}.", "status": job.status}
+    if job.result is None:
+        return {"error": "Job was cancelled before it produced a result.", "status": job.status}
+    return job.result
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return {"error": f"Unknown job: {job_id}"}
+    return job.to_dict()
+
+
+# === Ranked listings ===
+@app.get("/ranked-listings")
+async def ranked_listings(type: str = "internship", limit: int = 20, q: str = "", resume_id: str = ""):
+    """Stored listings ranked (BM25) against the resume `/analyze-resume` returned `resume_id` for,
+    or against `q` if given."""
+    try:
+        profile = (q, []) if q else resume_profile(resume_id)
+        if profile is None:
+            return {"error": "Pass the resume_id from /analyze-resume or a query with ?q=..."}
+        resume_text, titles = profile
+
+        def rank():
+            ranker = get_listing_ranker()
+            ranker.sync()
+            start = time.perf_counter()
+            ranked = ranker.rank(resume_text, titles, type_=type, limit=limit)
+            rank_ms = round((time.perf_counter() - start) * 1000, 2)
+
+            scores = dict(ranked)
+            listings = get_listing_store().get_listings_by_links([key for key, _ in ranked])
+            for listing in listings:
+                listing["Score"] = round(scores[normalize_link(listing["Link"])], 4)
+            return {"listings": listings, "rank_ms": rank_ms, "index": ranker.stats()}
+
+        return await run_in_threadpool(rank)
+
+    except Exception as e:
+        logging.exception("❌ Error in /ranked-listings")
+        return {"error": str(e)}
+
+
+# === Cache statistics ===
+@app.get("/cache/stats")
+async def cache_stats():
+    return {
+        "keyword_expansion": keyword_cache.stats(),
+        "resume_analysis": resume_cache.stats(),
+    }
@@ -0,0 +1,190 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.profiling import span
+
+# Seconds; covers a cached lookup up to a multi-minute crawl
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def header(self):
+        return [f"# HELP {self.name}_total {self.help_text}", f"# TYPE {self.name}_total {self.kind}"]
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}_total{format_labels(self.labelnames, key)} {format_value(value)}" for key, value in items
+        ]
+
+
+class Gauge(Metric):
+    """Read when scraped: `collect()` returns {label values tuple: value}."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), collect=None):
+        super().__init__(name, help_text, labelnames)
+        self.collect = collect
+
+    def render(self):
+        try:
+            values = self.collect() if self.collect else {}
+        except Exception:
+            values = {}
+        return self.header() + [
+            f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}" for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            entry["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, {**entry, "counts": list(entry["counts"])}) for key, entry in self._values.items())
+        lines = self.header()
+        for key, entry in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), entry["counts"]):
+                cumulative += count
+                labels = format_labels(self.labelnames, key, [("le", format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, key)} {format_value(entry['sum'])}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, key)} {entry['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# === HTTP ===
+http_requests = registry.register(Counter(
+    "http_requests", "HTTP requests by route and status.", ("method", "path", "status")))
+http_request_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "path")))
+
+# === Pipeline stages ===
+stage_seconds = registry.register(Histogram(
+    "pipeline_stage_duration_seconds", "Time spent per pipeline stage.", ("stage",)))
+stage_errors = registry.register(Counter(
+    "pipeline_stage_errors", "Pipeline stages that raised.", ("stage",)))
+
+# === LLM ===
+llm_requests = registry.register(Counter(
+    "llm_requests", "Chat completion requests by purpose.", ("purpose",)))
+llm_tokens = registry.register(Counter(
+    "llm_tokens", "LLM tokens by purpose and kind (prompt or completion).", ("purpose", "kind")))
+
+# === Auto-apply ===
+applications = registry.register(Counter(
+    "applications", "Auto-apply outcomes (applied, already_applied, failed).", ("outcome",)))
+
+# === Chrome ===
+chrome_sessions_started = registry.register(Counter(
+    "chrome_sessions_started", "Chrome sessions launched by the driver pools."))
+chrome_sessions_closed = registry.register(Counter(
+    "chrome_sessions_closed", "Chrome sessions quit by the driver pools."))
+
+
+@contextmanager
+def stage_timer(stage):
+    """Times a pipeline stage into pipeline_stage_duration_seconds; exceptions are counted and re-raised."""
+    start = time.perf_counter()
+    try:
+        with span("stage", stage):
+            yield
+    except Exception:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, stage=stage)
+
+
+def record_llm_usage(purpose, response):
+    """Token counts from a chat completion's `usage`, when the API returned one."""
+    llm_requests.inc(purpose=purpose)
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            llm_tokens.inc(tokens, purpose=purpose, kind=kind)
+
+
+def register_gauge(name, help_text, labelnames, collect):
+    return registry.register(Gauge(name, help_text, labelnames, collect))
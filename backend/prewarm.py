@@ -0,0 +1,87 @@
+import importlib
+import os
+import threading
+import time
+
+# === Settings ===
+PREWARM_ON_STARTUP = os.getenv("PREWARM_ON_STARTUP", "1").strip().lower() in ("1", "true", "yes", "on")
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+# Imported lazily by the code paths that need them; loaded here ahead of the first request
+HEAVY_MODULES = (
+    "together",
+    "selenium.webdriver.chrome.webdriver",
+    "selenium.webdriver.support.expected_conditions",
+    "selenium.webdriver.support.ui",
+    "requests",
+    "lxml.html",
+    "numpy",
+    "scipy.sparse",
+)
+
+
+def import_modules(names=HEAVY_MODULES):
+    for name in names:
+        importlib.import_module(name)
+    return len(names)
+
+
+class Prewarm:
+    """Warms expensive resources on background threads so startup does not wait for them.
+
+    Each task runs once on its own thread; `status()` backs the /ready endpoint. A
+    failed task is reported but does not block readiness, since every resource is
+    still created on first use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._threads = []
+
+    def add(self, name, fn):
+        with self._lock:
+            self._tasks[name] = {"fn": fn, "status": PENDING, "seconds": None, "detail": None, "error": None}
+
+    def _run(self, name, fn):
+        with self._lock:
+            self._tasks[name]["status"] = WARMING
+        start = time.perf_counter()
+        try:
+            detail, status, error = fn(), READY, None
+        except Exception as e:
+            detail, status, error = None, FAILED, str(e)
+            print(f"⚠️ Prewarm of {name} failed: {e}")
+        with self._lock:
+            self._tasks[name].update({
+                "status": status, "seconds": round(time.perf_counter() - start, 3), "detail": detail, "error": error,
+            })
+
+    def start(self):
+        with self._lock:
+            tasks = [(name, task["fn"]) for name, task in self._tasks.items() if task["status"] == PENDING]
+        for name, fn in tasks:
+            thread = threading.Thread(target=self._run, args=(name, fn), name=f"prewarm-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in list(self._threads):
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return self.status()["ready"]
+
+    def status(self):
+        with self._lock:
+            components = {
+                name: {key: value for key, value in task.items() if key != "fn"} for name, task in self._tasks.items()
+            }
+        return {
+            "ready": all(task["status"] in (READY, FAILED) for task in components.values()),
+            "components": components,
+        }
@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# === Settings ===
+# Profile every pipeline run (1), or only those that send the X-Profile header (0)
+PROFILE_REQUESTS = os.getenv("PROFILE_REQUESTS", "0").strip().lower() in ("1", "true", "yes", "on")
+# When > 0, every pipeline run is sampled and kept if it took at least this long
+PROFILE_SLOW_SECONDS = float(os.getenv("PROFILE_SLOW_SECONDS", "0"))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.01"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("logs", "profiles"))
+PROFILE_HEADER = "X-Profile"
+
+# Stacks without a frame from this tree are idle pool threads or the idle event loop
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_active = []
+_active_lock = threading.Lock()
+
+
+def profile_requested(headers):
+    return str(headers.get(PROFILE_HEADER, "")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_project_file(filename):
+    return filename.startswith(PROJECT_ROOT) and "site-packages" not in filename
+
+
+class ProfileSession:
+    """Samples every thread's stack while a pipeline run is in flight and collects its spans.
+
+    Sampling is process-wide: jobs running at the same time show up as their own
+    threads in the output rather than being mixed into one stack.
+    """
+
+    def __init__(self, name, interval=PROFILE_SAMPLE_INTERVAL):
+        self.name = name
+        self.id = uuid.uuid4().hex[:8]
+        self.interval = interval
+        self.started_at = None
+        self.seconds = 0.0
+        self.paths = None
+
+        self._lock = threading.Lock()
+        self._frames = {}  # (function, file, line) -> index
+        self._samples = {}  # thread name -> [(stack of frame indexes, weight)]
+        self._spans = []  # [thread, kind, name, start, end]
+        self._stop = threading.Event()
+        self._thread = None
+
+    # === Sampling ===
+    def _frame_index(self, code):
+        key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+        index = self._frames.get(key)
+        if index is None:
+            index = self._frames[key] = len(self._frames)
+        return index
+
+    def _sample(self, weight):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if not any(is_project_file(code.co_filename) for code in codes):
+                continue
+            stack = tuple(self._frame_index(code) for code in reversed(codes))
+            self._samples.setdefault(names.get(ident, str(ident)), []).append((stack, weight))
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            with self._lock:
+                self._sample(now - last)
+            last = now
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        with _active_lock:
+            _active.append(self)
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        with _active_lock:
+            _active.remove(self)
+        self.seconds = time.perf_counter() - self.started_at
+        end = self.seconds
+        with self._lock:
+            for span in self._spans:
+                if span[4] is None:  # still open when the run ended
+                    span[4] = end
+
+    # === Spans ===
+    def open_span(self, kind, name):
+        span = [threading.current_thread().name, kind, name, time.perf_counter() - self.started_at, None]
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    def close_span(self, span):
+        end = time.perf_counter() - self.started_at
+        with self._lock:
+            if span[4] is None:
+                span[4] = end
+
+    def span_summary(self):
+        totals = {}
+        for _, kind, name, start, end in self._spans:
+            entry = totals.setdefault((kind, name), {"kind": kind, "name": name, "count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += end - start
+            entry["max_seconds"] = max(entry["max_seconds"], end - start)
+        spans = sorted(totals.values(), key=lambda entry: entry["seconds"], reverse=True)
+        for entry in spans:
+            entry["avg_seconds"] = round(entry["seconds"] / entry["count"], 4)
+            entry["seconds"] = round(entry["seconds"], 3)
+            entry["max_seconds"] = round(entry["max_seconds"], 3)
+        return spans
+
+    def hot_functions(self, limit=25):
+        """Self and total sampled seconds per function, across all threads."""
+        frames = list(self._frames)
+        own, total = {}, {}
+        for samples in self._samples.values():
+            for stack, weight in samples:
+                own[stack[-1]] = own.get(stack[-1], 0.0) + weight
+                for index in set(stack):
+                    total[index] = total.get(index, 0.0) + weight
+        hottest = sorted(total, key=lambda index: (own.get(index, 0.0), total[index]), reverse=True)[:limit]
+        return [
+            {
+                "function": frames[index][0],
+                "file": os.path.relpath(frames[index][1], PROJECT_ROOT) if is_project_file(frames[index][1]) else frames[index][1],
+                "line": frames[index][2],
+                "self_seconds": round(own.get(index, 0.0), 3),
+                "total_seconds": round(total[index], 3),
+            }
+            for index in hottest
+        ]
+
+    # === Output ===
+    def speedscope(self):
+        """speedscope.app file: one sampled profile per thread, plus one span timeline per thread."""
+        frames = [{"name": name, "file": file, "line": line} for name, file, line in self._frames]
+        profiles = []
+        for thread, samples in sorted(self._samples.items()):
+            profiles.append({
+                "type": "sampled",
+                "name": f"{thread} (samples)",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weight for _, weight in samples), 6),
+                "samples": [list(stack) for stack, _ in samples],
+                "weights": [round(weight, 6) for _, weight in samples],
+            })
+
+        # Spans become evented profiles; spans nest per thread, so a stack walk orders the events
+        span_frames = {}
+        by_thread = {}
+        for thread, kind, name, start, end in self._spans:
+            by_thread.setdefault(thread, []).append((start, -end, f"{kind}: {name}"))
+        for thread, spans in sorted(by_thread.items()):
+            events, stack = [], []
+            for start, negative_end, label in sorted(spans):
+                end = -negative_end
+                while stack and stack[-1][0] <= start:
+                    closed_end, closed_frame = stack.pop()
+                    events.append({"type": "C", "frame": closed_frame, "at": round(closed_end, 6)})
+                if stack:
+                    end = min(end, stack[-1][0])
+                frame = span_frames.get(label)
+                if frame is None:
+                    frame = span_frames[label] = len(frames)
+                    frames.append({"name": label})
+                events.append({"type": "O", "frame": frame, "at": round(start, 6)})
+                stack.append((end, frame))
+            while stack:
+                closed_end, closed_frame = stack.pop()
+                events.append({"type": "C", "frame": closed_frame, "at": round(closed_end, 6)})
+            profiles.append({
+                "type": "evented",
+                "name": f"{thread} (spans)",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(max(self.seconds, events[-1]["at"]), 6),
+                "events": events,
+            })
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.name} ({self.seconds:.1f}s)",
+            "exporter": "internshala-auto-apply profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "id": self.id,
+            "seconds": round(self.seconds, 3),
+            "sample_interval": self.interval,
+            "samples": {thread: len(samples) for thread, samples in self._samples.items()},
+            "spans": self.span_summary(),
+            "hot_functions": self.hot_functions(),
+        }
+
+    def write(self, directory=PROFILE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(directory, f"{stamp}-{re.sub(r'[^A-Za-z0-9_-]+', '-', self.name)}-{self.id}")
+        with self._lock:
+            profile, summary = self.speedscope(), self.summary()
+        with open(f"{base}.speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        with open(f"{base}.spans.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        self.paths = {"speedscope": f"{base}.speedscope.json", "summary": f"{base}.spans.json"}
+        return self.paths
+
+
+@contextmanager
+def span(kind, name):
+    """Times a unit of work (a WebDriver command, an LLM call, ...) in every active profile."""
+    if not _active:
+        yield
+        return
+    with _active_lock:
+        sessions = list(_active)
+    opened = [(session, session.open_span(kind, name)) for session in sessions]
+    try:
+        yield
+    finally:
+        for session, entry in opened:
+            session.close_span(entry)
+
+
+@contextmanager
+def profile_run(name, force=False):
+    """Profiles the block when forced, when PROFILE_REQUESTS is on, or when it may turn out slow.
+
+    Yields the session (None when profiling is off). Files are written to PROFILE_DIR
+    when profiling was asked for or the run took at least PROFILE_SLOW_SECONDS.
+    """
+    if not (force or PROFILE_REQUESTS or PROFILE_SLOW_SECONDS > 0):
+        yield None
+        return
+
+    session = ProfileSession(name).start()
+    try:
+        yield session
+    finally:
+        session.stop()
+        slow = PROFILE_SLOW_SECONDS > 0 and session.seconds >= PROFILE_SLOW_SECONDS
+        if force or PROFILE_REQUESTS or slow:
+            try:
+                paths = session.write()
+                reason = "slow run" if slow and not (force or PROFILE_REQUESTS) else "requested"
+                logging.info(f"🔥 Profiled {name} ({session.seconds:.1f}s, {reason}): {paths['speedscope']}")
+            except OSError as e:
+                logging.error(f"⚠️ Could not write profile for {name}: {e}")
+
+
+def profiled(name, fn, force=False):
+    """Job function wrapper for the job queue; adds the profile's file paths to a dict result."""
+    def run(cancel_event=None, **params):
+        with profile_run(name, force=force) as session:
+            result = fn(cancel_event=cancel_event, **params)
+        if session is not None and session.paths and isinstance(result, dict):
+            result["profile"] = session.paths
+        return result
+
+    return run
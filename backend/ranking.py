@@ -0,0 +1,262 @@
+import math
+import os
+import threading
+import time
+from collections import Counter
+
+from backend.listing_store import get_listing_store, normalize_link
+from backend.relevance import clean_text
+
+# NumPy and SciPy are imported where the matrix is built or scored, so importing this module stays cheap.
+
+# === Settings ===
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+# Extracted job titles count this many times more than a word from the resume body.
+RANKING_TITLE_WEIGHT = float(os.getenv("RANKING_TITLE_WEIGHT", "3"))
+# Replaced rows are masked out; the matrix is rebuilt without them once they make up this share of it.
+RANKING_MAX_DEAD_SHARE = float(os.getenv("RANKING_MAX_DEAD_SHARE", "0.2"))
+# Seconds each sync re-reads before the previous one, for rows that committed late.
+RANKING_SYNC_OVERLAP = float(os.getenv("RANKING_SYNC_OVERLAP", "5"))
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+you your we our us i me my they their them he she his her who can should would all any also not
+""".split())
+
+# Title and skills are repeated so they weigh more than the same word in the description.
+FIELD_WEIGHTS = {"Title": 3, "Skills": 2, "Description": 1, "Who can apply": 1}
+
+
+def terms(text):
+    return [token for token in clean_text(text or "").split() if len(token) > 1 and token not in STOPWORDS]
+
+
+def listing_terms(listing):
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in terms(listing.get(field)):
+            counts[term] += weight
+    return counts
+
+
+class ListingRanker:
+    """BM25 ranking of stored listings against a resume, scored as one sparse matrix-vector product.
+
+    Term counts are computed once per listing as it arrives and appended to a CSR
+    matrix; the BM25 weights are recomputed lazily (O(nnz) in NumPy) after new
+    listings land. A listing whose terms are unchanged is not added again. An
+    updated listing replaces its old row, which is masked out until the dead rows
+    pass RANKING_MAX_DEAD_SHARE and the matrix is rebuilt without them.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        import numpy as np
+        from scipy import sparse
+
+        self.k1 = k1
+        self.b = b
+        self.vocabulary = {}
+        self.links = []
+        self.types = []
+        self.row_of = {}
+        self._digests = {}
+
+        self._counts = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._pending = []
+        self._weights = None
+        self._type_masks = {}
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    # === Indexing ===
+    def add_listings(self, listings):
+        with self._lock:
+            for listing in listings:
+                key = normalize_link(listing.get("Link"))
+                if not key:
+                    continue
+                counts = listing_terms(listing)
+                # Re-synced or only re-seen listings keep their row
+                digest = hash(frozenset(counts.items()))
+                if self._digests.get(key) == digest:
+                    continue
+                self._digests[key] = digest
+                columns, values = [], []
+                for term, count in counts.items():
+                    column = self.vocabulary.setdefault(term, len(self.vocabulary))
+                    columns.append(column)
+                    values.append(count)
+                self._pending.append((key, listing.get("Type"), columns, values))
+            self._weights = None
+
+    def _flush_pending(self):
+        import numpy as np
+        from scipy import sparse
+
+        if not self._pending:
+            return
+        n_terms = len(self.vocabulary)
+        indptr, indices, data = [0], [], []
+        dead_rows = []
+        start = self._counts.shape[0]
+        for offset, (key, type_, columns, values) in enumerate(self._pending):
+            if key in self.row_of:
+                dead_rows.append(self.row_of[key])
+            self.row_of[key] = start + offset
+            self.links.append(key)
+            self.types.append(type_)
+            indices.extend(columns)
+            data.extend(values)
+            indptr.append(len(indices))
+
+        new_rows = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(self._pending), n_terms),
+        )
+        counts = self._counts
+        counts.resize((counts.shape[0], n_terms))
+        self._counts = sparse.vstack([counts, new_rows], format="csr")
+
+        alive = np.ones(self._counts.shape[0], dtype=bool)
+        alive[: self._alive.shape[0]] = self._alive
+        alive[dead_rows] = False
+        self._alive = alive
+        self._pending = []
+        self._type_masks = {}
+        if alive.size and (alive.size - alive.sum()) / alive.size > RANKING_MAX_DEAD_SHARE:
+            self._drop_dead_rows()
+
+    def _drop_dead_rows(self):
+        """Rebuild the matrix with live rows only. Caller holds the lock."""
+        import numpy as np
+
+        live = np.flatnonzero(self._alive)
+        self._counts = self._counts[live]
+        self.links = [self.links[row] for row in live]
+        self.types = [self.types[row] for row in live]
+        self.row_of = {key: row for row, key in enumerate(self.links)}
+        self._alive = np.ones(live.size, dtype=bool)
+
+    def _bm25_weights(self):
+        """Per-(listing, term) BM25 weights; rebuilt only after the index changed."""
+        import numpy as np
+        from scipy import sparse
+
+        if self._weights is not None:
+            return self._weights
+        self._flush_pending()
+
+        counts = self._counts
+        alive = self._alive
+        n_docs = int(alive.sum())
+        rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+        avg_length = float(doc_lengths[alive].mean()) if n_docs else 1.0
+
+        # Document frequency over live rows only
+        doc_freq = np.bincount(counts.indices, weights=alive[rows], minlength=counts.shape[1])
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        tf = counts.data
+        norm = np.float32(self.k1) * (np.float32(1 - self.b) + np.float32(self.b / max(avg_length, 1e-9)) * doc_lengths[rows])
+        data = idf[counts.indices] * tf * np.float32(self.k1 + 1) / (tf + norm)
+
+        self._weights = sparse.csr_matrix((data.astype(np.float32), counts.indices, counts.indptr), shape=counts.shape)
+        return self._weights
+
+    def sync(self, store=None):
+        """Pull listings added or refreshed in the store since the last sync."""
+        store = store or get_listing_store()
+        with self._lock:
+            # Overlap a little: a row stamped just before the last sync may have committed after it.
+            # Rows read twice are skipped in add_listings.
+            since = self._synced_at - RANKING_SYNC_OVERLAP if self._synced_at else 0
+            self._synced_at = time.time()
+        listings = store.get_listings(since=since) if since else store.get_listings()
+        if listings:
+            self.add_listings(listings)
+        return len(listings)
+
+    # === Scoring ===
+    def query_vector(self, resume_text="", titles=()):
+        import numpy as np
+
+        counts = Counter(terms(resume_text))
+        for title in titles:
+            for term in terms(title):
+                counts[term] += RANKING_TITLE_WEIGHT
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = 1 + math.log(count)
+        return vector
+
+    def rank(self, resume_text="", titles=(), type_=None, limit=None):
+        """[(normalized link, score), ...] best first; listings with no overlap are left out."""
+        import numpy as np
+
+        with self._lock:
+            weights = self._bm25_weights()
+            if weights.shape[0] == 0:
+                return []
+            scores = weights @ self.query_vector(resume_text, titles)
+
+            mask = self._alive
+            if type_:
+                if type_ not in self._type_masks:
+                    self._type_masks[type_] = np.array([t == type_ for t in self.types], dtype=bool)
+                mask = mask & self._type_masks[type_]
+            scores = np.where(mask & (scores > 0), scores, -np.inf)
+
+            candidates = np.flatnonzero(np.isfinite(scores))
+            if limit and limit < candidates.size:
+                top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+                candidates = candidates[top]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.links[row], float(scores[row])) for row in order]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "listings": int(self._alive.sum()) + len(self._pending),
+                "rows": int(self._counts.shape[0]) + len(self._pending),
+                "terms": len(self.vocabulary),
+                "synced_at": self._synced_at,
+            }
+
+
+_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_listing_ranker():
+    global _ranker
+    with _ranker_lock:
+        if _ranker is None:
+            _ranker = ListingRanker()
+        return _ranker
+
+
+def iter_ranked_listings(type_="internship", resume_text="", titles=(), chunk_size=100):
+    """Stored listings best match for the given resume first, fetched from the store in chunks.
+
+    Falls back to newest first without a resume text or titles.
+    """
+    store = get_listing_store()
+
+    if not resume_text and not titles:
+        yield from store.iter_listings(type_=type_)
+        return
+
+    ranker = get_listing_ranker()
+    ranker.sync(store)
+    ranked = ranker.rank(resume_text, titles, type_=type_)
+    for start in range(0, len(ranked), chunk_size):
+        chunk = ranked[start:start + chunk_size]
+        scores = dict(chunk)
+        for listing in store.get_listings_by_links([key for key, _ in chunk]):
+            listing["Score"] = round(scores[normalize_link(listing["Link"])], 4)
+            yield listing
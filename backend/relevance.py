@@ -0,0 +1,53 @@
+import hashlib
+import os
+import re
+
+# "deferred": title matches are fetched first, other cards only while the limit is unfilled.
+# "strict": cards whose title does not match are never fetched.
+RELEVANCE_TITLE_GATE = os.getenv("RELEVANCE_TITLE_GATE", "deferred").lower()
+
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9 ]")
+
+
+def clean_text(text):
+    return _NON_ALNUM.sub(" ", text).lower().strip()
+
+
+def tokenize(text):
+    return set(clean_text(text).split())
+
+
+class RelevanceMatcher:
+    """Keyword relevance compiled once per crawl.
+
+    A listing is relevant when any token of any expanded keyword appears in its
+    title or description, so the keywords collapse into one token set up front.
+    """
+
+    def __init__(self, expanded_keywords):
+        self.keyword_tokens = frozenset(token for keyword in expanded_keywords for token in tokenize(keyword))
+        # Identifies the keyword set, so verdicts reached under another one are not reused
+        self.digest = hashlib.sha1(" ".join(sorted(self.keyword_tokens)).encode("utf-8")).hexdigest()
+        self.stats = {
+            "cards": 0,
+            "title_matches": 0,
+            "description_matches": 0,
+            "detail_fetches": 0,
+            "detail_fetches_skipped": 0,
+        }
+
+    def matches_title(self, title):
+        return not self.keyword_tokens.isdisjoint(tokenize(title or ""))
+
+    def matches(self, title, description):
+        return not self.keyword_tokens.isdisjoint(tokenize(f"{title or ''} {description or ''}"))
+
+    def split(self, cards):
+        """(title matches, the rest) for a list of (index, card) pairs; counts them in the stats."""
+        title_hits, title_misses = [], []
+        for card in cards:
+            (title_hits if self.matches_title(card[1]["Title"]) else title_misses).append(card)
+
+        self.stats["cards"] += len(cards)
+        self.stats["title_matches"] += len(title_hits)
+        return title_hits, title_misses
@@ -0,0 +1,137 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.metrics import stage_timer
+
+# === Settings ===
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+# The LLM sees the first 3000 characters; extra headroom covers lines the cleaner drops.
+RESUME_TEXT_LIMIT = int(os.getenv("RESUME_TEXT_LIMIT", "6000"))
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "2"))
+RESUME_PAGES_PER_TASK = int(os.getenv("RESUME_PAGES_PER_TASK", "3"))
+
+SUPPORTED_SUFFIXES = ("pdf", "docx", "txt")
+
+
+class ResumeRejectedError(ValueError):
+    pass
+
+
+# === Worker functions (run in the process pool) ===
+def _warm_up():
+    import pdfplumber  # noqa: F401
+    import docx  # noqa: F401
+    return os.getpid()
+
+
+def _pdf_page_count(content):
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return len(pdf.pages)
+
+
+def _pdf_page_range(content, start, stop, text_limit):
+    """Text of pages [start, stop), stopping once `text_limit` characters are collected."""
+    import pdfplumber
+    texts, collected = [], 0
+    with pdfplumber.open(io.BytesIO(content), pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            texts.append(text)
+            collected += len(text)
+            if collected >= text_limit:
+                break
+    return texts
+
+
+def _docx_text(content, text_limit):
+    import docx
+    lines, collected = [], 0
+    for para in docx.Document(io.BytesIO(content)).paragraphs:
+        lines.append(para.text)
+        collected += len(para.text) + 1
+        if collected >= text_limit:
+            break
+    return "\n".join(lines)
+
+
+# === Pool ===
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extract_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs server and Chrome threads is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, RESUME_EXTRACT_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def start_extract_pool():
+    """Spawn the workers and import the parsers ahead of the first upload."""
+    pool = get_extract_pool()
+    return [pool.submit(_warm_up) for _ in range(max(1, RESUME_EXTRACT_WORKERS))]
+
+
+def shutdown_extract_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# === Extraction ===
+def check_resume_upload(content, suffix):
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise ResumeRejectedError("❌ Unsupported file type. Use .pdf, .docx, or .txt")
+    if len(content) > RESUME_MAX_BYTES:
+        raise ResumeRejectedError(f"❌ Resume is larger than {RESUME_MAX_BYTES // 1024} KB.")
+    if not content:
+        raise ResumeRejectedError("❌ The uploaded resume is empty.")
+
+
+def extract_pdf_text(content, text_limit=RESUME_TEXT_LIMIT, max_pages=RESUME_MAX_PAGES):
+    """Parse page ranges in parallel, one window of ranges at a time, until enough text is collected."""
+    pool = get_extract_pool()
+    page_count = pool.submit(_pdf_page_count, content).result()
+    if page_count > max_pages:
+        raise ResumeRejectedError(f"❌ Resume has {page_count} pages; the limit is {max_pages}.")
+
+    ranges = [(start, min(start + RESUME_PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, RESUME_PAGES_PER_TASK)]
+    window = max(1, RESUME_EXTRACT_WORKERS)
+
+    texts, collected = [], 0
+    for offset in range(0, len(ranges), window):
+        futures = [pool.submit(_pdf_page_range, content, start, stop, text_limit - collected)
+                   for start, stop in ranges[offset:offset + window]]
+        for future in futures:
+            for text in future.result():
+                if collected >= text_limit:
+                    break
+                texts.append(text)
+                collected += len(text)
+        if collected >= text_limit:
+            break
+    return "\n".join(texts)
+
+
+def extract_resume_text(content: bytes, suffix: str) -> str:
+    """Resume text straight from the uploaded bytes; blocks, so call it off the event loop."""
+    check_resume_upload(content, suffix)
+    with stage_timer("text_extraction"):
+        if suffix == "pdf":
+            return extract_pdf_text(content)
+        if suffix == "docx":
+            return get_extract_pool().submit(_docx_text, content, RESUME_TEXT_LIMIT).result()
+        return content.decode("utf-8", errors="ignore")[:RESUME_TEXT_LIMIT]
@@ -1,13 +1,69 @@
 from dotenv import load_dotenv
 import os
 import re
-from together import Together
+import threading
+
+from backend.metrics import record_llm_usage, stage_timer
+from backend.profiling import span
 
 # Load API key from .env file
 load_dotenv()
-client = Together(api_key=os.environ.get("TOGETHER_API_KEY"))
 
-def extract_jobs_from_resume(resume_text: str):
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Together client, created on first use; the SDK is slow to import."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from together import Together
+            _client = Together(api_key=os.environ.get("TOGETHER_API_KEY"))
+        return _client
+
+
+NOT_JOB_TITLES = ["certified", "university", "degree", "award", "reference", "available", "winner", "hackathon", "prize"]
+
+
+def parse_title(line):
+    """Job title from a numbered line of the reply, or None for other lines and filtered entries."""
+    line = line.strip()
+    if not re.match(r"^\d+\.\s+", line):
+        return None
+    job_title = re.sub(r"^\d+\.\s*", "", line).strip()
+    if any(bad in job_title.lower() for bad in NOT_JOB_TITLES):
+        return None
+    return job_title
+
+
+def stream_reply(messages, on_title, **params):
+    """Streams the completion and calls `on_title(title, index)` as each numbered line arrives."""
+    output_text, pending, found, last_chunk = "", "", 0, None
+    stream = get_llm_client().chat.completions.create(messages=messages, stream=True, **params)
+    for chunk in stream:
+        last_chunk = chunk
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        output_text += delta
+        pending += delta
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            title = parse_title(line)
+            if title and found < 5:
+                on_title(title, found)
+                found += 1
+    title = parse_title(pending)
+    if title and found < 5:
+        on_title(title, found)
+    # The usage block arrives with the final chunk
+    return output_text, last_chunk
+
+
+def extract_jobs_from_resume(resume_text: str, on_title=None):
+    """Up to 5 job titles for the resume; with `on_title`, the reply is streamed and each title
+    is reported as soon as its line is complete (see `stream_reply`)."""
     try:
         messages = [
             {
@@ -27,31 +83,21 @@ def extract_jobs_from_resume(resume_text: str):
             }
         ]
 
-        response = client.chat.completions.create(
-            model="deepseek-ai/DeepSeek-V3",
-            messages=messages,
-            max_tokens=200,
-            temperature=0.2,
-            top_p=0.9,
-            top_k=40,
-        )
-
-        # ✅ Correct access pattern for `together` SDK
-        output_text = response.choices[0].message.content.strip()
+        params = {"model": "deepseek-ai/DeepSeek-V3", "max_tokens": 200, "temperature": 0.2, "top_p": 0.9, "top_k": 40}
+        with stage_timer("llm_call"), span("together", "resume_analysis"):
+            if on_title is None:
+                response = get_llm_client().chat.completions.create(messages=messages, **params)
+                # ✅ Correct access pattern for `together` SDK
+                output_text = response.choices[0].message.content
+            else:
+                output_text, response = stream_reply(messages, on_title, **params)
+        record_llm_usage("resume_analysis", response)
+
+        output_text = output_text.strip()
         print("🔁 DeepSeek-V3 Response:\n", output_text)
 
-        # Extract lines starting with numbered bullets
-        job_lines = [line.strip() for line in output_text.split("\n") if re.match(r"^\d+\.\s+", line)]
-
-        # Filter and clean titles
-        cleaned_titles = []
-        for line in job_lines:
-            job_title = re.sub(r"^\d+\.\s*", "", line).strip()
-            if any(bad in job_title.lower() for bad in [
-                "certified", "university", "degree", "award", "reference", "available", "winner", "hackathon", "prize"
-            ]):
-                continue
-            cleaned_titles.append(job_title)
+        # Numbered lines only, without degrees, awards and the like
+        cleaned_titles = [title for title in map(parse_title, output_text.split("\n")) if title]
 
         if not cleaned_titles:
             raise ValueError("❌ No valid job titles extracted.")
@@ -0,0 +1,90 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+        self.acquired = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, cancel_event=None, timeout=None):
+        """Take one token, waiting for it if needed. False if cancelled or timed out first."""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.acquired += 1
+                    self.waited_seconds += time.monotonic() - start
+                    return True
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                return False
+            # Sleep in short steps so a cancel request is noticed quickly
+            if cancel_event is not None:
+                if cancel_event.wait(min(wait, 0.5)):
+                    return False
+            else:
+                time.sleep(min(wait, 0.5))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "acquired": self.acquired,
+                "waited_seconds": round(self.waited_seconds, 2),
+            }
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; a success resets the count. Stays open once tripped."""
+
+    def __init__(self, threshold, name="breaker"):
+        self.threshold = threshold
+        self.name = name
+        self.consecutive = 0
+        self.failures = 0
+        self.successes = 0
+        self.open = False
+        self._lock = threading.Lock()
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.consecutive = 0
+
+    def record_failure(self):
+        """Count a failure; returns True when this failure opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive += 1
+            if not self.open and self.threshold and self.consecutive >= self.threshold:
+                self.open = True
+                return True
+            return False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "open": self.open,
+                "consecutive_failures": self.consecutive,
+                "failures": self.failures,
+                "successes": self.successes,
+                "threshold": self.threshold,
+            }
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from backend.profiling import span
+
+# === Settings ===
+# "condition" waits for the page state each step needs; "fixed" sleeps the old fixed
+# durations first, for sites where a condition turns out to be unreliable.
+WAIT_MODE = os.getenv("WAIT_MODE", "condition").lower()
+WAIT_POLL_INTERVAL = float(os.getenv("WAIT_POLL_INTERVAL", "0.1"))
+# Quiet period with no new network requests before the page counts as idle.
+NETWORK_IDLE_QUIET = float(os.getenv("NETWORK_IDLE_QUIET", "0.5"))
+
+# Timeout per kind of wait, in seconds
+WAIT_TIMEOUTS = {
+    "page_ready": float(os.getenv("WAIT_PAGE_READY_TIMEOUT", "10")),
+    "element": float(os.getenv("WAIT_ELEMENT_TIMEOUT", "5")),
+    "modal": float(os.getenv("WAIT_MODAL_TIMEOUT", "2")),
+    "navigation": float(os.getenv("WAIT_NAVIGATION_TIMEOUT", "10")),
+}
+
+RESOURCE_COUNT_JS = "return window.performance ? performance.getEntriesByType('resource').length : 0;"
+IN_VIEWPORT_JS = """
+const rect = arguments[0].getBoundingClientRect();
+return rect.top >= 0 && rect.bottom <= (window.innerHeight || document.documentElement.clientHeight);
+"""
+
+
+# === Conditions ===
+def page_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def url_contains_any(*fragments):
+    return lambda driver: any(fragment in driver.current_url for fragment in fragments)
+
+
+def page_source_contains(*snippets):
+    """Any of `snippets` (lowercase) in the page source."""
+    def condition(driver):
+        source = driver.page_source.lower()
+        return any(snippet in source for snippet in snippets)
+    return condition
+
+
+def in_viewport(element):
+    """`element` scrolled fully into the visible part of the window."""
+    def condition(driver):
+        return driver.execute_script(IN_VIEWPORT_JS, element)
+    return condition
+
+
+class network_idle:
+    """Document loaded and no new resource requests for `quiet` seconds."""
+
+    def __init__(self, quiet=NETWORK_IDLE_QUIET):
+        self.quiet = quiet
+        self.count = None
+        self.since = None
+
+    def __call__(self, driver):
+        if not page_ready(driver):
+            return False
+        count = driver.execute_script(RESOURCE_COUNT_JS)
+        now = time.monotonic()
+        if count != self.count:
+            self.count, self.since = count, now
+            return False
+        return now - self.since >= self.quiet
+
+
+def any_of(*conditions):
+    """First truthy result of `conditions`, e.g. a success URL or a success message."""
+    def condition(driver):
+        for check in conditions:
+            try:
+                result = check(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+            if result:
+                return result
+        return False
+    return condition
+
+
+# === Recording ===
+class WaitStats:
+    """Thread-safe record of how long each named wait actually took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = {}
+
+    def record(self, name, seconds, met):
+        with self._lock:
+            entry = self._waits.setdefault(name, {"count": 0, "timeouts": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            if not met:
+                entry["timeouts"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {
+                    **entry,
+                    "seconds": round(entry["seconds"], 3),
+                    "max_seconds": round(entry["max_seconds"], 3),
+                    "avg_seconds": round(entry["seconds"] / entry["count"], 3),
+                }
+                for name, entry in self._waits.items()
+            }
+
+    def total_seconds(self):
+        with self._lock:
+            return sum(entry["seconds"] for entry in self._waits.values())
+
+    def reset(self):
+        with self._lock:
+            self._waits.clear()
+
+
+wait_stats = WaitStats()
+
+
+def wait_for(driver, name, condition, kind="element", timeout=None, fixed=0.0):
+    """Poll `condition` until it holds; returns its value, or None after the timeout.
+
+    `name` labels the wait in `wait_stats`, `kind` picks the timeout from WAIT_TIMEOUTS,
+    and `fixed` is the sleep this wait replaced (slept first in WAIT_MODE=fixed).
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = WAIT_TIMEOUTS[kind] if timeout is None else timeout
+    start = time.perf_counter()
+    with span("wait", name):
+        if WAIT_MODE == "fixed" and fixed:
+            time.sleep(fixed)
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            result = None
+    wait_stats.record(name, time.perf_counter() - start, result is not None)
+    return result
+
+
+def wait_for_page(driver, name="page_ready", fixed=0.0):
+    return wait_for(driver, name, page_ready, kind="page_ready", fixed=fixed)
+
+
+def wait_for_element(driver, locator, name=None, clickable=False, fixed=0.0, timeout=None):
+    from selenium.webdriver.support import expected_conditions as EC
+
+    condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+    return wait_for(driver, name or f"element:{locator[1]}", condition, fixed=fixed, timeout=timeout)
+
+
+def wait_for_dismissed(driver, locator, name="modal_dismissed", fixed=0.0):
+    from selenium.webdriver.support import expected_conditions as EC
+
+    return wait_for(driver, name, EC.invisibility_of_element_located(locator), kind="modal", fixed=fixed)
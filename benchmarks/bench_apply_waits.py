@@ -0,0 +1,77 @@
+"""Wall-clock time per application with fixed sleeps vs condition-based waits.
+
+Runs the real auto-apply flow in headless Chrome against the stand-in site,
+whose apply button only renders after `--render-delay` seconds. The same number
+of listings is applied to with WAIT_MODE=fixed (the old sleeps) and with
+WAIT_MODE=condition, and the time spent in each named wait is printed. Needs
+Chrome; the stand-in and the ledger live in a temporary directory.
+
+    python -m benchmarks.bench_apply_waits --listings 5 --render-delay 0.3
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.standin import StandinSite, listing_card
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=5, help="applications per mode")
+    parser.add_argument("--render-delay", type=float, default=0.3, help="seconds before the apply button renders")
+    parser.add_argument("--submit-delay", type=float, default=0.2, help="seconds the stand-in takes to accept an application")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            StandinSite(render_delay=args.render_delay, submit_delay=args.submit_delay) as site:
+        os.environ.update({
+            "INTERNSHALA_BASE_URL": site.base_url,
+            "INTERNSHALA_EMAIL": "bench@example.com",
+            "INTERNSHALA_PASSWORD": "bench",
+            "INTERNSHALA_SESSION_PATH": os.path.join(tmp, "session.json"),
+            "TOGETHER_API_KEY": "fake-key",
+            "LISTING_DB_PATH": os.path.join(tmp, "listings.sqlite"),
+            "APPLICATION_LEDGER_PATH": os.path.join(tmp, "applications.jsonl"),
+            "DRIVER_POOL_SIZE": "1",
+        })
+        from backend import auto_apply_internshala as applier
+        from backend import waits
+        from backend.driver_pool import shutdown_driver_pool
+        from backend.listing_store import get_listing_store
+
+        # Only the waits are measured, not the rate limit
+        applier.APPLY_RATE_PER_MINUTE = 60_000
+        applier.APPLY_BURST = args.listings
+
+        # One batch of listings per mode; the ledger skips the batch applied to before
+        rows = []
+        for index in range(2 * args.listings):
+            card = listing_card("internship", index)
+            rows.append({
+                "Title": card["title"], "Company": card["company"], "Location": card["location"],
+                "Stipend": card["stipend"], "Duration": card["duration"], "Link": f"{site.base_url}{card['href']}",
+            })
+        get_listing_store().upsert_listings("internship", rows, keyword="bench")
+
+        results = {}
+        try:
+            for mode in ("fixed", "condition"):
+                waits.WAIT_MODE = mode
+                waits.wait_stats.reset()
+                result = applier.auto_apply(max_jobs=args.listings, workers=1)
+                stats = result["stats"]
+                assert stats["applied"] == args.listings, (mode, result["message"], stats)
+                results[mode] = stats["seconds"] / stats["applied"]
+                print(f"{mode:>9}: {stats['applied']} applications in {stats['seconds']:.2f}s, "
+                      f"{results[mode]:.2f}s per listing")
+                print(json.dumps(waits.wait_stats.snapshot(), indent=2))
+        finally:
+            shutdown_driver_pool()
+
+        print(f"per listing: fixed sleeps {results['fixed']:.2f}s, condition waits {results['condition']:.2f}s "
+              f"({results['fixed'] / results['condition']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Batch scrape against the stand-in site: one crawl for many keywords vs one crawl per keyword.
+
+The stand-in serves the same cards for every search, so every keyword finds the
+same listings, much like overlapping job titles do on Internshala. The batch
+must read each unique search URL once and fetch each detail page once, however
+many keywords map to them. Two searches that overlap on cards only the second
+one accepts must each keep their own listings. Runs over HTTP only, no Chrome needed.
+
+    python -m benchmarks.bench_batch_scrape --pages 3 --cards 40 --latency 0.2
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fake_together import RESUME_REPLY, FakeTogether
+from benchmarks.standin import ROLES, StandinSite
+
+# The titles resume analysis returns, plus a spelling that maps to the same search URL
+KEYWORDS = [line.split(". ", 1)[1] for line in RESUME_REPLY.splitlines()] + ["python  developer"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=3, help="result pages on the stand-in")
+    parser.add_argument("--cards", type=int, default=40, help="cards per result page")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per result page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, FakeTogether(latency=0) as fake, \
+            StandinSite(cards_per_page=args.cards, pages=args.pages, page_latency=args.latency) as site:
+        os.environ.update({
+            "INTERNSHALA_BASE_URL": site.base_url,
+            "TOGETHER_BASE_URL": fake.base_url,
+            "TOGETHER_API_KEY": "fake-key",
+            "LISTING_DB_PATH": os.path.join(tmp, "listings.sqlite"),
+            "DETAIL_FETCH_MODE": "http",
+        })
+        from backend.cache import TTLCache
+        from backend import internshala_scraper as scraper
+
+        scraper.keyword_cache = TTLCache(name="keyword_expansion")
+        # Both runs start cold: known listings are not served from the store
+        scraper.LISTING_FRESHNESS_TTL = 0
+        limit = args.cards * args.pages
+
+        def measure(fn):
+            served = site.server.listing_pages_served
+            start = time.perf_counter()
+            result = fn()
+            return result, site.server.listing_pages_served - served, time.perf_counter() - start
+
+        # 1. One crawl per keyword, one after another, like calling /scrape-jobs for each title
+        def per_keyword():
+            return [
+                scraper.fetch_both_internships_and_jobs(keyword, limit=limit, types=("internship",), max_pages=args.pages)
+                for keyword in KEYWORDS
+            ]
+
+        serial, serial_pages, serial_seconds = measure(per_keyword)
+        serial_fetches = sum(crawl["internship"]["relevance"]["detail_fetches"] for crawl in serial)
+        serial_listings = sum(crawl["internship"]["count"] for crawl in serial)
+
+        # 2. The same keywords as one batch
+        batch, batch_pages, batch_seconds = measure(
+            lambda: scraper.fetch_batch(KEYWORDS, limit=limit, types=("internship",), max_pages=args.pages)
+        )
+        crawls = [crawl["internship"] for crawl in batch["crawl"].values()]
+        batch_fetches = sum(crawl["relevance"]["detail_fetches"] for crawl in crawls)
+        listings = batch["listings"]["internship"]
+        links = [listing["Link"] for listing in listings]
+
+        unique_searches = len(batch["searches"])
+        assert unique_searches == len(KEYWORDS) - 1, batch["searches"]
+        assert batch_pages == unique_searches * args.pages, (batch_pages, unique_searches)
+        assert len(links) == len(set(links)), "duplicate listings across keywords"
+        assert batch_fetches <= limit, (batch_fetches, limit)
+        assert all(listing["Keywords"] for listing in listings)
+        matched = {keyword: sum(keyword in listing["Keywords"] for listing in listings) for keyword in KEYWORDS}
+
+        print(f"{len(KEYWORDS)} keywords, {unique_searches} unique searches, {args.pages} page(s) of {args.cards} cards")
+        print(f"per keyword: {serial_pages:3d} result pages, {serial_fetches:4d} detail fetches, "
+              f"{serial_listings:4d} listings, {serial_seconds:.2f}s")
+        print(f"batch:       {batch_pages:3d} result pages, {batch_fetches:4d} detail fetches, "
+              f"{len(listings):4d} listings, {batch_seconds:.2f}s ({serial_seconds / batch_seconds:.1f}x)")
+        for keyword, count in matched.items():
+            print(f"  {count:4d} listings matched '{keyword}'")
+
+        # 3. Overlapping searches in one batch: the first fetches every card and rejects the marketing ones,
+        #    the second accepts them from the detail pages the first already read
+        claims = scraper.BatchClaims()
+        first_stats, second_stats = {}, {}
+        first = scraper.crawl_internshala_by_type("python developer", limit, "internship", stats=first_stats,
+                                                  max_pages=args.pages, expanded_keywords=["python developer"],
+                                                  claims=claims)
+        second = scraper.crawl_internshala_by_type("digital marketing", limit, "internship", stats=second_stats,
+                                                   max_pages=args.pages, expanded_keywords=["digital marketing"],
+                                                   claims=claims)
+        marketing = sum(ROLES[index % len(ROLES)] == "Digital Marketing" for index in range(limit))
+        assert first_stats["detail_fetches"] == limit, first_stats
+        assert len(second) == marketing and second_stats["detail_fetches"] == 0, (len(second), second_stats)
+        print(f"overlapping searches: {len(first)} + {len(second)} listings, "
+              f"second search made {second_stats['detail_fetches']} detail fetches")
+        print("✅ Batch crawl read each search once and each listing once.")
+
+
+if __name__ == "__main__":
+    main()
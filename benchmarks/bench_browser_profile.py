@@ -0,0 +1,79 @@
+"""Requests, bytes and browser CPU per page: full Chrome vs the lightweight profile.
+
+Loads the same stand-in detail pages (images, web font, stylesheet, analytics
+script) with a regular browser profile and with the profile from the BROWSER_*
+settings. Bytes and requests are counted by the stand-in server, so blocked
+requests really are missing; CPU is Chrome's own TaskDuration. Needs Chrome.
+
+    python -m benchmarks.bench_browser_profile --pages 10
+"""
+import argparse
+import time
+
+from backend.browser_profile import BrowserProfile, page_weight
+from backend.driver_pool import DriverPool
+from backend.waits import network_idle, wait_for
+from benchmarks.standin import StandinSite, listing_card
+
+
+def task_seconds(driver):
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    return next((metric["value"] for metric in metrics if metric["name"] == "TaskDuration"), 0.0)
+
+
+def measure(site, profile, links):
+    pool = DriverPool(size=1, profile=profile)
+    try:
+        with pool.borrow() as driver:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver.get(f"{site.base_url}/robots.txt")  # not counted: the first navigation starts the renderer
+            served = (site.server.requests_served, site.server.bytes_served)
+            task_start = task_seconds(driver)
+            start = time.perf_counter()
+            reported = 0
+            for link in links:
+                driver.get(link)
+                wait_for(driver, "bench_page", network_idle(quiet=0.3), kind="page_ready")
+                reported += page_weight(driver)["bytes"]
+            seconds = time.perf_counter() - start
+            task = task_seconds(driver) - task_start
+    finally:
+        pool.close()
+
+    pages = len(links)
+    return {
+        "requests": (site.server.requests_served - served[0]) / pages,
+        "kb": (site.server.bytes_served - served[1]) / pages / 1024,
+        "reported_kb": reported / pages / 1024,
+        "cpu_ms": task / pages * 1000,
+        "seconds": seconds / pages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10, help="detail pages per profile")
+    args = parser.parse_args()
+
+    links = []
+    with StandinSite(render_delay=0, popup=False) as site:
+        for index in range(args.pages):
+            links.append(f"{site.base_url}{listing_card('internship', index)['href']}")
+
+        results = {}
+        for name, profile in (("full", BrowserProfile.full()), ("light", BrowserProfile.from_env())):
+            results[name] = measure(site, profile, links)
+            result = results[name]
+            print(f"{name:>5}: {result['requests']:.1f} requests, {result['kb']:.0f} KB served "
+                  f"({result['reported_kb']:.0f} KB seen by the page), {result['cpu_ms']:.0f} ms CPU, "
+                  f"{result['seconds']:.2f}s per page")
+
+    full, light = results["full"], results["light"]
+    assert light["requests"] < full["requests"], results
+    print(f"saved per page: {full['requests'] - light['requests']:.1f} requests, "
+          f"{full['kb'] - light['kb']:.0f} KB ({1 - light['kb'] / full['kb']:.0%}), "
+          f"{full['cpu_ms'] - light['cpu_ms']:.0f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
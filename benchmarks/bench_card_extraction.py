@@ -0,0 +1,105 @@
+"""Per-card cost of reading a listing page: one WebDriver call per field vs one execute_script.
+
+Needs Chrome and chromedriver. Usage:
+
+    python -m benchmarks.bench_card_extraction --cards 120 --repeat 3
+"""
+import argparse
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from backend.driver_pool import DriverPool
+from backend.internshala_scraper import CARD_CLASS, read_listing_cards
+from benchmarks.standin import StandinSite
+
+
+def get_element_text_safe(parent, xpath):
+    try:
+        return parent.find_element(By.XPATH, xpath).text.strip()
+    except NoSuchElementException:
+        return None
+
+
+def get_element_attr_safe(parent, xpath, attr):
+    try:
+        return parent.find_element(By.XPATH, xpath).get_attribute(attr)
+    except NoSuchElementException:
+        return None
+
+
+def legacy_read_cards(driver):
+    """The original card loop: re-query the card list and make ~6 calls per card."""
+    rows = []
+    cards = driver.find_elements(By.CLASS_NAME, CARD_CLASS)
+    for i in range(len(cards)):
+        card = driver.find_elements(By.CLASS_NAME, CARD_CLASS)[i]
+        title = get_element_text_safe(card, ".//h3/a") or get_element_text_safe(card, ".//div[contains(@class,'internship_title')]//a")
+        if not title:
+            continue
+        rows.append({
+            "Title": title,
+            "Company": get_element_text_safe(card, ".//div[contains(@class,'company_name')]/div/p") or "N/A",
+            "Location": get_element_text_safe(card, ".//div[@class='location_link']") or "N/A",
+            "Stipend": get_element_text_safe(card, ".//span[@class='stipend']") or "N/A",
+            "Duration": get_element_text_safe(card, ".//i[@class='ic-16-calendar']/following-sibling::span") or "N/A",
+            "Link": get_element_attr_safe(card, ".//a", "href"),
+        })
+    return rows
+
+
+def count_commands(driver):
+    """Wrap driver.execute so every WebDriver round trip is counted."""
+    counter = {"commands": 0}
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        counter["commands"] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counted
+    return counter
+
+
+def measure(driver, counter, reader, cards, repeat):
+    best = None
+    commands = 0
+    for _ in range(repeat):
+        counter["commands"] = 0
+        start = time.perf_counter()
+        rows = reader(driver)
+        elapsed = time.perf_counter() - start
+        assert len(rows) == cards, f"expected {cards} cards, read {len(rows)}"
+        commands = counter["commands"]
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "total_ms": round(best * 1000, 2),
+        "ms_per_card": round(best * 1000 / cards, 3),
+        "commands_per_card": round(commands / cards, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pool = DriverPool(size=1)
+    with StandinSite(cards_per_page=args.cards) as site, pool.borrow() as driver:
+        driver.get(f"{site.base_url}/internships/keywords-python/")
+        counter = count_commands(driver)
+
+        before = measure(driver, counter, legacy_read_cards, args.cards, args.repeat)
+        after = measure(driver, counter, lambda d: [card for _, card in read_listing_cards(d)], args.cards, args.repeat)
+    pool.close()
+
+    print(f"📊 {args.cards} cards, best of {args.repeat}")
+    print(f"  before (per-field calls): {before}")
+    print(f"  after  (one execute_script): {after}")
+    print(f"  speed-up: {before['total_ms'] / max(after['total_ms'], 0.001):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Backend import time: fails if importing backend.main gets slower or loads heavy dependencies again.
+
+Each run imports the backend in a fresh interpreter, the way a uvicorn reload or a
+new worker does. The cost is measured on top of importing FastAPI itself, so the
+budget holds across machines. The slowest imports come from `python -X importtime`.
+
+    python -m benchmarks.bench_import_time --runs 5 --max-overhead 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from backend.prewarm import HEAVY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def run_import(module, cwd, importtime=False):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + [
+        "-c", IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES),
+    ]
+    return subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True, check=True)
+
+
+def slowest_packages(stderr, top=10):
+    """(ms, package) for the slowest third-party and stdlib packages in `-X importtime` output."""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        if not cumulative.strip().isdigit() or package == "backend":
+            continue
+        # A package's own top-level entry includes everything it imports
+        packages[package] = max(packages.get(package, 0), int(cumulative) / 1000)
+    return sorted(((ms, package) for package, ms in packages.items()), reverse=True)[:top]
+
+
+def median_seconds(module, cwd, runs):
+    results = [json.loads(run_import(module, cwd).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+    return statistics.median(result["seconds"] for result in results), results[-1]["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--max-overhead", type=float, default=float(os.getenv("IMPORT_MAX_OVERHEAD", "0.25")),
+                        help="seconds backend.main may add on top of importing fastapi")
+    args = parser.parse_args()
+
+    # backend.main creates logs/ in the working directory
+    with tempfile.TemporaryDirectory() as cwd:
+        fastapi_seconds, _ = median_seconds("fastapi", cwd, args.runs)
+        backend_seconds, loaded = median_seconds("backend.main", cwd, args.runs)
+        slowest = slowest_packages(run_import("backend.main", cwd, importtime=True).stderr)
+
+    overhead = backend_seconds - fastapi_seconds
+    print(f"fastapi:      {fastapi_seconds * 1000:.0f} ms")
+    print(f"backend.main: {backend_seconds * 1000:.0f} ms ({overhead * 1000:+.0f} ms on top of fastapi, "
+          f"budget {args.max_overhead * 1000:.0f} ms)")
+    print("slowest packages:")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failures = []
+    if loaded:
+        failures.append(f"heavy modules imported at startup: {', '.join(loaded)}")
+    if overhead > args.max_overhead:
+        failures.append(f"backend.main adds {overhead:.3f}s, over the {args.max_overhead:.3f}s budget")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Import time within budget.")
+
+
+if __name__ == "__main__":
+    main()
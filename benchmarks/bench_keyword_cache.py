@@ -0,0 +1,56 @@
+"""Keyword expansion against the fake Together endpoint: cold, concurrent, warm and after restart.
+
+    python -m benchmarks.bench_keyword_cache --latency 0.5 --concurrency 10
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_together import FakeTogether
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    with FakeTogether(latency=args.latency) as fake, tempfile.TemporaryDirectory() as tmp:
+        os.environ["TOGETHER_BASE_URL"] = fake.base_url
+        from backend.cache import TTLCache
+        from backend import internshala_scraper as scraper
+
+        cache_path = os.path.join(tmp, "keywords.sqlite")
+        scraper.keyword_cache = TTLCache(path=cache_path, name="keyword_expansion")
+
+        def expand():
+            return scraper.expand_keywords_with_together("fake-key", "Python Developer!")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda _: expand(), range(args.concurrency)))
+        concurrent_s = time.perf_counter() - start
+        assert all(result == results[0] for result in results)
+        calls_after_concurrent = fake.calls
+
+        start = time.perf_counter()
+        expand()
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        # A fresh cache on the same file stands in for a process restart
+        scraper.keyword_cache = TTLCache(path=cache_path, name="keyword_expansion")
+        start = time.perf_counter()
+        expand()
+        restart_ms = (time.perf_counter() - start) * 1000
+
+        print(f"📊 {args.concurrency} concurrent cold calls: {concurrent_s:.2f}s, remote calls: {calls_after_concurrent}")
+        print(f"  warm (memory) lookup: {warm_ms:.2f} ms")
+        print(f"  after restart (disk) lookup: {restart_ms:.2f} ms")
+        print(f"  total remote calls: {fake.calls}")
+        print(f"  stats: {scraper.keyword_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
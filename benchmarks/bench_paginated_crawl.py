@@ -0,0 +1,118 @@
+"""Paginated crawl against the multi-page stand-in site.
+
+Checks that the listing budget stops the crawl early, that the crawl ends at
+the last result page, and times page fetching with and without concurrency.
+Then re-crawls incrementally: unchanged listings come from the store, only
+edited ones are fetched again, and a new keyword set re-checks rejected cards. Runs over HTTP only, no Chrome needed.
+
+    python -m benchmarks.bench_paginated_crawl --pages 8 --cards 40 --latency 0.3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fake_together import FakeTogether
+from benchmarks.standin import ROLES, StandinSite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=8, help="result pages on the stand-in")
+    parser.add_argument("--cards", type=int, default=40, help="cards per result page")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per result page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, FakeTogether(latency=0) as fake, \
+            StandinSite(cards_per_page=args.cards, pages=args.pages, page_latency=args.latency) as site:
+        os.environ.update({
+            "INTERNSHALA_BASE_URL": site.base_url,
+            "TOGETHER_BASE_URL": fake.base_url,
+            "TOGETHER_API_KEY": "fake-key",
+            "LISTING_DB_PATH": os.path.join(tmp, "listings.sqlite"),
+            "DETAIL_FETCH_MODE": "http",
+        })
+        from backend.cache import TTLCache
+        from backend import internshala_scraper as scraper
+        from backend.listing_store import get_listing_store
+
+        scraper.keyword_cache = TTLCache(name="keyword_expansion")
+        # Pagination checks below want every detail page fetched, known or not
+        freshness_ttl = scraper.LISTING_FRESHNESS_TTL
+        scraper.LISTING_FRESHNESS_TTL = 0
+
+        def crawl(limit, max_pages, concurrency):
+            scraper.SCRAPE_PAGE_CONCURRENCY = concurrency
+            served = site.server.listing_pages_served
+            start = time.perf_counter()
+            stats = {}
+            jobs = scraper.crawl_internshala_by_type("python developer", limit, "internship", stats=stats, max_pages=max_pages)
+            seconds = time.perf_counter() - start
+            return jobs, stats, site.server.listing_pages_served - served, seconds
+
+        # 4 of every 10 stand-in titles match the expanded keywords
+        per_page_hits = args.cards * 4 // 10
+
+        # 1. Budget reached on page 2: the crawl stops without reading the remaining pages
+        limit = per_page_hits + 2
+        jobs, stats, served, seconds = crawl(limit, args.pages, concurrency=1)
+        assert len(jobs) == limit, (len(jobs), limit)
+        assert stats["pages"] == 2 and served == 2, (stats["pages"], served)
+        assert len({job["Link"] for job in jobs}) == limit
+        print(f"budget {limit:4d}: {len(jobs)} listings from {stats['pages']} page(s), "
+              f"{stats['detail_fetches']} detail fetches, {seconds:.2f}s")
+
+        # 2. Budget larger than the site: the crawl ends on the first empty page
+        limit = args.cards * (args.pages + 2)
+        jobs, stats, served, seconds = crawl(limit, args.pages + 5, concurrency=1)
+        assert len(jobs) == per_page_hits * args.pages, len(jobs)
+        assert stats["pages"] == args.pages, stats["pages"]
+        print(f"budget {limit:4d}: {len(jobs)} listings from {stats['pages']} page(s) (site has {args.pages}), {seconds:.2f}s")
+
+        # 3. Page concurrency: same crawl, result pages fetched one at a time vs ahead
+        limit = per_page_hits * args.pages
+        _, _, _, sequential = crawl(limit, args.pages, concurrency=1)
+        jobs, stats, _, concurrent = crawl(limit, args.pages, concurrency=4)
+        assert len(jobs) == limit and stats["pages"] == args.pages
+        print(f"{args.pages} pages at {args.latency:.2f}s each: sequential {sequential:.2f}s, "
+              f"4 ahead {concurrent:.2f}s ({sequential / concurrent:.1f}x)")
+
+        # 4. Incremental re-crawl: nothing changed, so page 1 is all known and paging stops there.
+        #    The rest of the budget is filled from the listings already stored for the keyword,
+        #    so no detail page is fetched; the title misses stay unchecked until they are needed.
+        #    Listings taken from the store count as seen again.
+        scraper.LISTING_FRESHNESS_TTL = freshness_ttl
+        for _ in range(2):
+            started = time.time()
+            jobs, stats, served, seconds = crawl(limit, args.pages, concurrency=1)
+            freshness = stats["freshness"]
+            assert stats["pages"] == 1 and stats["detail_fetches"] == 0, stats
+            assert freshness["skipped"] == args.cards and len(jobs) == limit, (freshness, len(jobs))
+            stored = get_listing_store().get_listings_by_links([job["Link"] for job in jobs])
+            assert all(listing["Last seen"] >= started for listing in stored), "stored listings not refreshed"
+            print(f"re-crawl, unchanged: {len(jobs)} listings from the store, {stats['pages']} page(s), "
+                  f"{stats['detail_fetches']} detail fetches, {seconds:.2f}s ({freshness})")
+
+        # 5. Every fifth card edited: every page has changes, only those detail pages are fetched
+        site.server.revision += 1
+        jobs, stats, served, seconds = crawl(limit, args.pages, concurrency=1)
+        freshness = stats["freshness"]
+        assert freshness["changed"] == args.cards // 5 * args.pages, freshness
+        assert stats["detail_fetches"] <= freshness["changed"] and len(jobs) == limit, (stats, len(jobs))
+        print(f"re-crawl, edited: {len(jobs)} listings, {stats['detail_fetches']} detail fetches "
+              f"for {freshness['changed']} changed cards, {seconds:.2f}s ({freshness})")
+
+        # 6. A different keyword set: cards rejected under the old set are checked again
+        marketing = sum(1 for index in range(args.cards) if ROLES[index % len(ROLES)] == "Digital Marketing")
+        expanded = scraper.expand_keywords_with_together("fake-key", "python developer") + ["digital marketing"]
+        stats = {}
+        jobs = scraper.crawl_internshala_by_type("python developer", per_page_hits + marketing, "internship",
+                                                 stats=stats, max_pages=1, expanded_keywords=expanded)
+        found = sum(1 for job in jobs if job["Title"] == "Digital Marketing")
+        assert stats["detail_fetches"] == marketing and found == marketing, (stats, found)
+        print(f"re-crawl, new keyword set: {found} previously rejected cards accepted, "
+              f"{stats['detail_fetches']} detail fetches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""BM25 ranking of a synthetic listing corpus: rank latency and incremental sync cost.
+
+Builds `--listings` stored listings (50k by default) from a Zipf-like vocabulary,
+ranks them against a resume, then updates some of them in the store and times the
+sync that picks the updates up: reading and tokenizing the updated rows, then
+the first ranking, which re-weights the matrix (and rebuilds it once enough rows
+are dead). Fails if a warm ranking takes more than `--max-rank-ms`, a sync of
+`--updates` listings plus ranking more than `--max-sync-ms`, or the ranking that
+rebuilds the matrix more than `--max-rebuild-ms`.
+
+    python -m benchmarks.bench_ranking --listings 50000 --updates 1000 --rebuild-updates 20000
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROLES = ["Python Developer", "Data Science", "Frontend Developer", "Backend Developer", "Digital Marketing",
+         "Content Writing", "Graphic Design", "Machine Learning", "Business Development", "Android Development"]
+VOCABULARY = [f"term{index}" for index in range(8000)]
+# Zipf-like: a few words are everywhere, most are rare
+CUMULATIVE = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+
+def make_listing(rng, index, revision=0):
+    words = rng.choices(VOCABULARY, cum_weights=CUMULATIVE, k=80)
+    return {
+        "Title": ROLES[index % len(ROLES)],
+        "Company": f"Company {index % 500}",
+        "Location": "Remote",
+        "Stipend": f"{10000 + revision} /month",
+        "Duration": "3 Months",
+        "Link": f"https://internshala.com/internship/detail/listing-{index}",
+        "Skills": " ".join(rng.choices(VOCABULARY[:300], k=5)),
+        "Who can apply": "Students available for a full time internship",
+        "Description": " ".join(words),
+    }
+
+
+def timed_ms(fn, runs=1):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=50_000, help="stored listings")
+    parser.add_argument("--updates", type=int, default=1000, help="listings updated before the incremental sync")
+    parser.add_argument("--rebuild-updates", type=int, default=20_000,
+                        help="listings updated before the sync that rebuilds the matrix")
+    parser.add_argument("--runs", type=int, default=20, help="rankings timed per measurement")
+    parser.add_argument("--max-rank-ms", type=float, default=100)
+    parser.add_argument("--max-sync-ms", type=float, default=500)
+    parser.add_argument("--max-rebuild-ms", type=float, default=1000)
+    args = parser.parse_args()
+
+    from backend.listing_store import ListingStore
+    from backend.ranking import ListingRanker
+
+    rng = random.Random(0)
+    resume = " ".join(rng.choices(VOCABULARY, cum_weights=CUMULATIVE, k=400))
+    titles = ["Python Developer", "Backend Developer"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ListingStore(path=os.path.join(tmp, "listings.sqlite"))
+        # Stored an hour ago, so the sync overlap does not read them again
+        store.upsert_listings("internship", [make_listing(rng, index) for index in range(args.listings)],
+                              keyword="bench", seen_at=time.time() - 3600)
+
+        ranker = ListingRanker()
+        cold_ms, _ = timed_ms(lambda: (ranker.sync(store), ranker.rank(resume, titles, type_="internship", limit=20)))
+        top_ms, top = timed_ms(lambda: ranker.rank(resume, titles, type_="internship", limit=20), args.runs)
+        full_ms, ranked = timed_ms(lambda: ranker.rank(resume, titles, type_="internship"), args.runs)
+
+        def update(count, revision):
+            rows = [make_listing(rng, index, revision) for index in rng.sample(range(args.listings), count)]
+            store.upsert_listings("internship", rows, keyword="bench")
+
+        def sync_then_rank():
+            read_ms, _ = timed_ms(lambda: ranker.sync(store))
+            reindex_ms, _ = timed_ms(lambda: ranker.rank(resume, titles, type_="internship", limit=20))
+            return read_ms, reindex_ms, ranker.stats()
+
+        update(args.updates, revision=1)
+        sync_read_ms, sync_rank_ms, after_sync = sync_then_rank()
+        sync_ms = sync_read_ms + sync_rank_ms
+
+        update(args.rebuild_updates, revision=2)
+        rebuild_read_ms, rebuild_ms, after_rebuild = sync_then_rank()
+
+    print(f"{args.listings} listings, {after_rebuild['terms']} terms")
+    print(f"  first sync and ranking:       {cold_ms:8.1f} ms")
+    print(f"  top 20:                       {top_ms:8.1f} ms ({len(top)} listings)")
+    print(f"  full ranking:                 {full_ms:8.1f} ms ({len(ranked)} listings)")
+    for updates, read_ms, rank_ms, stats in ((args.updates, sync_read_ms, sync_rank_ms, after_sync),
+                                             (args.rebuild_updates, rebuild_read_ms, rebuild_ms, after_rebuild)):
+        print(f"  {updates:6d} updates: sync {read_ms:8.1f} ms, then top 20 {rank_ms:6.1f} ms ({stats['rows']} rows)")
+
+    failures = []
+    if max(top_ms, full_ms) > args.max_rank_ms:
+        failures.append(f"ranking took {max(top_ms, full_ms):.1f} ms, over {args.max_rank_ms} ms")
+    if sync_ms > args.max_sync_ms:
+        failures.append(f"incremental sync took {sync_ms:.1f} ms, over {args.max_sync_ms} ms")
+    if rebuild_ms > args.max_rebuild_ms:
+        failures.append(f"ranking after the rebuild took {rebuild_ms:.1f} ms, over {args.max_rebuild_ms} ms")
+    if after_sync["rows"] != args.listings + args.updates:
+        failures.append(f"{after_sync['rows']} rows after the incremental sync, expected {args.listings + args.updates}")
+    if after_rebuild["rows"] > args.listings * 1.5:
+        failures.append(f"{after_rebuild['rows']} rows after {args.rebuild_updates} updates: dead rows were not dropped")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Ranking and incremental sync within budget.")
+
+
+if __name__ == "__main__":
+    main()
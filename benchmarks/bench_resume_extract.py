@@ -0,0 +1,89 @@
+"""Resume extraction: the old temp-file, page-by-page read versus the process-pool extractor.
+
+    python -m benchmarks.bench_resume_extract --pages 12 --lines 45 --runs 5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def make_pdf(pages, lines_per_page, label=""):
+    """A plain text PDF, enough for pdfplumber; no PDF library needed. `label` makes the text unique."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    suffix = f" {label}" if label else ""
+    for page in range(pages):
+        rows = [f"Page {page + 1} line {line}: Python developer, Django REST APIs, SQL and data pipelines.{suffix}"
+                for line in range(lines_per_page)]
+        stream = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({row}) Tj T*" for row in rows) + " ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream.encode()))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode()
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def legacy_read(content):
+    """What /analyze-resume used to do: temp file, then every page in turn."""
+    import pdfplumber
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        temp_file.write(content)
+        path = temp_file.name
+    try:
+        with pdfplumber.open(path) as pdf:
+            return "\n".join([page.extract_text() or "" for page in pdf.pages])
+    finally:
+        os.remove(path)
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        text = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--lines", type=int, default=45)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from backend import resume_extract
+
+    content = make_pdf(args.pages, args.lines)
+    for future in resume_extract.start_extract_pool():
+        future.result()
+
+    legacy_ms, legacy_text = timed(lambda: legacy_read(content), args.runs)
+    early_ms, early_text = timed(lambda: resume_extract.extract_resume_text(content, "pdf"), args.runs)
+    full_ms, full_text = timed(
+        lambda: resume_extract.extract_pdf_text(content, text_limit=float("inf"), max_pages=args.pages), args.runs
+    )
+    assert full_text == legacy_text, "page-parallel extraction must match the sequential text"
+
+    print(f"PDF: {args.pages} pages, {len(content) / 1024:.0f} KB, {len(legacy_text)} chars")
+    print(f"legacy temp file, sequential : {legacy_ms:8.1f} ms  ({len(legacy_text)} chars)")
+    print(f"pool, all pages in parallel  : {full_ms:8.1f} ms  ({len(full_text)} chars)")
+    print(f"pool, stop at text limit     : {early_ms:8.1f} ms  ({len(early_text)} chars)")
+    resume_extract.shutdown_extract_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Check that the failure that opens the global breaker stops every apply worker.
+
+Runs the real auto-apply worker loop with stand-in Chrome sessions whose page
+loads fail in a scripted order: sessions 1 and 2 fail twice each, then session 1
+fails a third time. That fifth failure in a row opens the global breaker and
+session 1's own breaker at once. The other workers must finish the application
+they already started and claim nothing more. No Chrome or network needed.
+
+    python -m benchmarks.check_apply_breakers
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Sessions whose page loads fail, in order; the last one opens both breakers
+FAILURE_ORDER = [1, 1, 2, 2, 1]
+WORKERS = 3
+
+
+class ScriptedFailures:
+    """Lets page loads fail one at a time in FAILURE_ORDER; loads after the script fail a moment later."""
+
+    def __init__(self, order, settle=0.3):
+        self.order = list(order)
+        self.settle = settle
+        self.condition = threading.Condition()
+
+    def fail(self, session_id):
+        with self.condition:
+            while self.order and self.order[0] != session_id:
+                self.condition.wait()
+            scripted = bool(self.order)
+            if scripted:
+                self.order.pop(0)
+                self.condition.notify_all()
+        if not scripted:
+            # Leaves the scripted failure time to stop the run before this one counts
+            time.sleep(self.settle)
+        raise RuntimeError(f"stand-in page load failed on session {session_id}")
+
+
+class FakeDriver:
+    def __init__(self, session_id, failures):
+        self.session_id = session_id
+        self.failures = failures
+
+    def get(self, url):
+        self.failures.fail(self.session_id)
+
+
+class FakePool:
+    size = WORKERS
+
+    class profile:
+        @staticmethod
+        def describe():
+            return {}
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self):
+        with self.lock:
+            self.created += 1
+            return FakeDriver(self.created, self.failures)
+
+    def release(self, driver):
+        pass
+
+
+class FakeSession:
+    def ensure(self, driver):
+        pass
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({
+            "APPLICATION_LEDGER_PATH": os.path.join(tmp, "applications.jsonl"),
+            "LISTING_DB_PATH": os.path.join(tmp, "listings.sqlite"),
+        })
+        from backend import auto_apply_internshala as applier
+        from backend import driver_pool, internshala_session
+
+        applier.MAX_FAILURES = 3
+        applier.GLOBAL_MAX_FAILURES = 5
+        applier.APPLY_RATE_PER_MINUTE = 60_000
+        applier.APPLY_BURST = 100
+
+        pool = FakePool(ScriptedFailures(FAILURE_ORDER))
+        driver_pool.get_driver_pool = lambda component=None: pool
+        internshala_session.get_internshala_session = lambda: FakeSession()
+
+        listings = [
+            {"Title": f"Listing {index}", "Company": "Acme Labs", "Link": f"https://example.com/internship/{index}"}
+            for index in range(30)
+        ]
+        # The applier reports every failure with a traceback; keep the check's output short
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            result = applier.auto_apply(max_jobs=len(listings), workers=WORKERS, listings=listings)
+
+    stats = result["stats"]
+    # The scripted failures, plus the one application each other worker had already started
+    expected = len(FAILURE_ORDER) + WORKERS - 1
+    print(f"global breaker open: {stats['global_breaker']['open']}, failed applications: {stats['failed']} "
+          f"(expected {expected})")
+    for worker in stats["per_worker"]:
+        print(f"  worker {worker['worker']}: {worker['failed']} failed, breaker open: {worker['breaker']['open']}")
+    if not stats["global_breaker"]["open"] or stats["failed"] != expected:
+        print("❌ Workers kept applying after the global breaker opened.")
+        sys.exit(1)
+    print("✅ The failure that opened the global breaker stopped every worker.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Check that callers waiting on a shared computation get its value when storing it fails.
+
+The first caller of `TTLCache.get_or_compute` computes the value while a second
+caller waits for it. Storing the value then fails: once with SQLite reporting
+"database is locked", once with a value JSON cannot serialize. Both callers must
+still get the value, and the cache must keep serving it from memory.
+
+    python -m benchmarks.check_cache_inflight
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from backend.cache import TTLCache
+
+
+class Unserializable:
+    pass
+
+
+def locked_disk(key, value, expires_at):
+    raise sqlite3.OperationalError("database is locked")
+
+
+def check(label, value, disk_set=None):
+    """Runs one owner and one waiter; returns a failure message or None."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTLCache(path=os.path.join(tmp, "cache.sqlite"), name=label)
+        if disk_set is not None:
+            cache._disk_set = disk_set
+
+        def compute():
+            # Hold the computation until the second caller waits on it
+            deadline = time.time() + 5
+            while not cache.stats()["shared_inflight"] and time.time() < deadline:
+                time.sleep(0.01)
+            return value
+
+        results = {}
+
+        def call(name):
+            try:
+                results[name] = cache.get_or_compute("key", compute)
+            except Exception as e:
+                results[name] = e
+
+        owner = threading.Thread(target=call, args=("owner",), daemon=True)
+        owner.start()
+        while "key" not in cache._inflight:
+            time.sleep(0.001)
+        waiter = threading.Thread(target=call, args=("waiter",), daemon=True)
+        waiter.start()
+        owner.join(timeout=5)
+        waiter.join(timeout=5)
+
+        if owner.is_alive() or waiter.is_alive():
+            return f"{label}: a caller is still blocked after the store failed"
+        if results != {"owner": (value, False), "waiter": (value, True)}:
+            return f"{label}: unexpected results {results}"
+        if cache.get("key") is not value:
+            return f"{label}: value not kept in memory"
+        return None
+
+
+def main():
+    failures = [
+        failure for failure in (
+            check("database_locked", "value", disk_set=locked_disk),
+            check("unserializable", Unserializable()),
+        ) if failure
+    ]
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Waiting callers got the computed value although storing it failed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Check the lxml text extraction against saved Internshala pages.
+
+benchmarks/fixtures/ holds a saved result page and detail page, trimmed to a
+few cards, with the field values Selenium's `.text` reads from them. The check
+parses both pages the way the HTTP path does and compares every field: the
+pages cover source whitespace and line breaks, nested inline tags, `<br>`,
+lists, non-breaking spaces, scripts and nodes hidden with `display: none`.
+
+With --selenium the saved values are read again from the pages in Chrome, to
+confirm (or update) what the browser returns.
+
+    python -m benchmarks.check_saved_html
+    python -m benchmarks.check_saved_html --selenium
+"""
+import argparse
+import json
+import os
+import sys
+
+from backend.detail_fetcher import parse_detail_page
+from backend.internshala_scraper import (
+    CARD_CLASS,
+    CARD_FIELD_XPATHS,
+    CARD_LINK_XPATH,
+    CARD_TITLE_XPATHS,
+    DETAIL_FIELD_XPATHS,
+    parse_listing_page,
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LISTING_PAGE = os.path.join(FIXTURES, "internshala_listing.html")
+DETAIL_PAGE = os.path.join(FIXTURES, "internshala_detail.html")
+EXPECTED = os.path.join(FIXTURES, "internshala_expected.json")
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def lxml_fields():
+    listing = parse_listing_page(read_bytes(LISTING_PAGE))
+    detail = parse_detail_page(read_bytes(DETAIL_PAGE))
+    return {"listing": listing, "detail": detail}
+
+
+def selenium_fields():
+    """The same fields read with WebElement.text from the pages loaded in Chrome."""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
+    from backend.driver_pool import DriverPool
+
+    def text(parent, xpath):
+        try:
+            return parent.find_element(By.XPATH, xpath).text.strip()
+        except NoSuchElementException:
+            return None
+
+    pool = DriverPool(size=1)
+    try:
+        with pool.borrow() as driver:
+            driver.get(f"file://{LISTING_PAGE}")
+            listing = []
+            for card in driver.find_elements(By.CLASS_NAME, CARD_CLASS):
+                row = {"Title": next(filter(None, (text(card, xpath) for xpath in CARD_TITLE_XPATHS)), None)}
+                for field, xpath in CARD_FIELD_XPATHS.items():
+                    row[field] = text(card, xpath)
+                # The raw attribute, as the HTTP path reads it, not the resolved file:// URL
+                row["Link"] = card.find_element(By.XPATH, CARD_LINK_XPATH).get_dom_attribute("href")
+                listing.append(row)
+
+            driver.get(f"file://{DETAIL_PAGE}")
+            detail = {field: text(driver, xpath) for field, xpath in DETAIL_FIELD_XPATHS.items()}
+    finally:
+        pool.close()
+    return {"listing": listing, "detail": detail}
+
+
+def compare(name, actual, expected):
+    """Mismatch messages for every field of `actual` that differs from `expected`."""
+    failures = []
+    if len(actual["listing"]) != len(expected["listing"]):
+        return [f"{name}: {len(actual['listing'])} cards, expected {len(expected['listing'])}"]
+    for index, (row, want) in enumerate(zip(actual["listing"], expected["listing"])):
+        for field, value in want.items():
+            if row.get(field) != value:
+                failures.append(f"{name} card {index + 1} {field}: {row.get(field)!r} != {value!r}")
+    for field, value in expected["detail"].items():
+        got = (actual["detail"] or {}).get(field)
+        if got != value:
+            failures.append(f"{name} detail {field}: {got!r} != {value!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--selenium", action="store_true", help="also read the saved pages in Chrome")
+    args = parser.parse_args()
+
+    with open(EXPECTED, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    sources = {"lxml": lxml_fields}
+    if args.selenium:
+        sources["selenium"] = selenium_fields
+    failures = []
+    for name, read in sources.items():
+        found = compare(name, read(), expected)
+        fields = len(expected["listing"]) * len(expected["listing"][0]) + len(expected["detail"])
+        print(f"{'✅' if not found else '❌'} {name}: {fields - len(found)}/{fields} fields match the saved values")
+        failures.extend(found)
+
+    for failure in failures:
+        print(f"  {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Text extraction matches the saved browser text.")
+
+
+if __name__ == "__main__":
+    main()
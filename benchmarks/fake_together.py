@@ -0,0 +1,150 @@
+"""Fake Together chat-completions endpoint with configurable latency.
+
+Point the backend at it with TOGETHER_BASE_URL=<base_url>/v1. Replies are
+shaped after the two prompts the backend sends: keyword expansion gets a
+comma-separated list, resume analysis gets a numbered list of titles.
+Streaming requests (`"stream": true`) get one server-sent event per line of the
+reply, with the latency spread across the lines.
+
+    python -m benchmarks.fake_together --port 8801 --latency 0.8
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+KEYWORD_REPLY = "python developer, backend developer, software engineer, data analyst, django developer"
+RESUME_REPLY = "1. Python Developer\n2. Data Scientist\n3. Machine Learning Engineer\n4. Backend Developer\n5. Data Analyst"
+
+
+def reply_for(messages):
+    prompt = " ".join(str(message.get("content", "")) for message in messages)
+    if "comma-separated" in prompt:
+        return KEYWORD_REPLY
+    return RESUME_REPLY
+
+
+class FakeTogetherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self.send_json({"error": {"message": "not found"}}, status=404)
+
+        with self.server.lock:
+            self.server.calls += 1
+
+        content = reply_for(body.get("messages", []))
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        completion_tokens = len(content.split())
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if body.get("stream"):
+            return self.send_stream(body, content, usage)
+
+        time.sleep(self.server.latency)
+        self.send_json({
+            "id": f"fake-{self.server.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def send_stream(self, body, content, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        lines = content.splitlines(keepends=True)
+        for index, line in enumerate(lines):
+            time.sleep(self.server.latency / len(lines))
+            last = index == len(lines) - 1
+            chunk = {
+                "id": f"fake-{self.server.calls}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "delta": {"content": line}, "finish_reason": "stop" if last else None}],
+            }
+            if last:
+                chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeTogether:
+    """Runs the fake endpoint in a background thread and counts completion calls."""
+
+    def __init__(self, port=0, latency=0.5):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), FakeTogetherHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.calls = 0
+        self.server.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def calls(self):
+        return self.server.calls
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-together", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake Together chat-completions API.")
+    parser.add_argument("--port", type=int, default=8801)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per completion")
+    args = parser.parse_args()
+
+    fake = FakeTogether(port=args.port, latency=args.latency)
+    print(f"🤖 Fake Together API on {fake.base_url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
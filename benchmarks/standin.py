@@ -0,0 +1,333 @@
+"""Local stand-in for the Internshala pages the scraper reads.
+
+Listing and detail pages use the same markup the locators in
+`backend/internshala_scraper.py` and `backend/detail_fetcher.py` expect.
+Result pages follow Internshala's `/page-N/` scheme; pages past `pages` render an
+empty result list. `/login/student` logs in (any credentials) with a session
+cookie that `/student/dashboard` checks. Detail pages carry the apply flow: the
+apply button (or the login prompt) is rendered by script after `render_delay`,
+and a submitted application lands on `/student/matching-preferences` after
+`submit_delay`. With `assets` on, detail pages also pull in images, a web
+font, a stylesheet and an analytics script, like the real pages do; the server
+counts the requests and bytes it serves. Run it directly to browse the pages:
+
+    python -m benchmarks.standin --port 8800 --cards 40 --pages 5
+"""
+import argparse
+import html
+import re
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROLES = [
+    "Python Developer", "Data Science", "Frontend Developer", "Machine Learning",
+    "Digital Marketing", "Content Writing", "Backend Developer", "Graphic Design",
+    "Business Development", "Android App Development",
+]
+COMPANIES = ["Acme Labs", "Brightpath", "Cloudnest", "Datawise", "Evolve Tech", "Finlytics"]
+CITIES = ["Bangalore", "Delhi", "Mumbai", "Work from home", "Pune", "Hyderabad"]
+SKILLS = ["Python", "Django", "React", "SQL", "Machine Learning", "Figma", "SEO"]
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def listing_card(type_, index, revision=0):
+    """Card `index`; every fifth card gets a new stipend in each site revision."""
+    role = ROLES[index % len(ROLES)]
+    company = COMPANIES[index % len(COMPANIES)]
+    slug = f"{slugify(role)}-{type_}-at-{slugify(company)}{1000 + index}"
+    raise_ = 1000 * revision if index % 5 == 0 else 0
+    return {
+        "title": role,
+        "company": company,
+        "location": CITIES[index % len(CITIES)],
+        "stipend": f"₹ {10000 + 500 * (index % 20) + raise_:,} /month",
+        "duration": f"{1 + index % 6} Months",
+        "href": f"/{type_}/detail/{slug}",
+    }
+
+
+def render_listing_page(type_, keyword, count, start=0, revision=0):
+    cards = []
+    for index in range(start, start + count):
+        card = {key: html.escape(value) for key, value in listing_card(type_, index, revision).items()}
+        cards.append(f"""
+<div class="container-fluid individual_internship" internshipid="{index}">
+  <div class="internship_meta">
+    <h3 class="job-internship-name"><a class="job-title-href" href="{card['href']}">{card['title']}</a></h3>
+    <div class="company_name"><div><p class="company-name">{card['company']}</p></div></div>
+  </div>
+  <div class="detail-row-1">
+    <div class="location_link"><a href="#">{card['location']}</a></div>
+    <div class="row-1-item"><i class="ic-16-calendar"></i><span>{card['duration']}</span></div>
+    <div class="row-1-item"><i class="ic-16-money"></i><span class="stipend">{card['stipend']}</span></div>
+  </div>
+</div>""")
+    return f"""<!DOCTYPE html>
+<html><head><title>{html.escape(keyword)} {type_}s</title></head>
+<body>
+<div id="internship_list_container">{''.join(cards)}
+</div>
+</body></html>"""
+
+
+APPLY_FORM = """
+<div id="application_form" style="display:none">
+  <label><input type="radio" id="radio1" name="availability" value="yes"/> Yes, I am available</label>
+  <textarea id="confirm_availability_textarea"></textarea>
+  <div class="additional_question"><label><input type="radio" name="relocate" value="yes"/> Yes</label></div>
+  <div class="additional_question"><textarea name="portfolio"></textarea></div>
+  <form method="post" action="/application/submit/{slug}"><button type="submit" id="submit">Submit application</button></form>
+</div>
+<script>
+setTimeout(function () {{
+  document.getElementById("apply_area").innerHTML = {apply_html};
+  var button = document.getElementById("top_easy_apply_button");
+  if (button) button.onclick = function () {{ document.getElementById("application_form").style.display = "block"; }};
+}}, {render_ms});
+</script>"""
+
+POPUP = """
+<div id="popup_modal" style="position:fixed;top:0;left:0;right:0;bottom:0;background:#fff">
+  <button id="close_popup" onclick="document.getElementById('popup_modal').style.display='none'">×</button>
+</div>"""
+
+
+def render_apply_section(slug, logged_in, applied, render_delay=0.0, popup=False):
+    if applied:
+        apply_html = '<button class="apply_now_btn disabled">Already applied</button>'
+    elif logged_in:
+        apply_html = '<button id="top_easy_apply_button" class="apply_now_btn">Apply now</button>'
+    else:
+        apply_html = '<div id="login-link-container"><span>Login to apply</span></div>'
+    form = APPLY_FORM.format(slug=html.escape(slug), apply_html=repr(apply_html), render_ms=int(render_delay * 1000))
+    return f'<div id="apply_area"></div>{form}{POPUP if popup else ""}'
+
+
+# name -> (content type, size in bytes)
+ASSETS = {
+    "logo.png": ("image/png", 24_000),
+    "banner.jpg": ("image/jpeg", 90_000),
+    "photo-1.webp": ("image/webp", 40_000),
+    "photo-2.webp": ("image/webp", 40_000),
+    "icons.svg": ("image/svg+xml", 12_000),
+    "inter.woff2": ("font/woff2", 70_000),
+    "site.css": ("text/css", 16_000),
+}
+# Served from /gtag/js, which the browser profile blocks as third-party analytics
+TRACKER_SIZE = 80_000
+
+
+def render_assets():
+    images = "".join(f'<img src="/assets/{name}" alt=""/>' for name, (type_, _) in ASSETS.items() if type_.startswith("image/"))
+    return f"""
+<link rel="stylesheet" href="/assets/site.css"/>
+<div class="gallery">{images}</div>
+<script async src="/gtag/js?id=G-STANDIN"></script>"""
+
+
+def asset_body(name):
+    """(content type, payload) of an asset; the stylesheet pulls in the web font."""
+    content_type, size = ASSETS[name]
+    if name == "site.css":
+        rule = "@font-face { font-family: Inter; src: url(/assets/inter.woff2) format('woff2'); } body { font-family: Inter; }\n"
+        return content_type, (rule + "/*" + "x" * (size - len(rule) - 4) + "*/").encode()
+    return content_type, bytes(size)
+
+
+def render_detail_page(type_, slug, apply_section=""):
+    role = slug.split(f"-{type_}-at-")[0].replace("-", " ").title()
+    skills = "\n".join(f'<span class="round_tabs">{skill}</span>' for skill in SKILLS[: 3 + len(slug) % 4])
+    return f"""<!DOCTYPE html>
+<html><head><title>{html.escape(role)}</title><script>window.analytics = [];</script></head>
+<body>
+<div class="detail_view">
+  <div class="section_heading heading_5_5">About the {type_}</div>
+  <div class="text-container">
+    Selected candidate's day-to-day responsibilities include:<br/>
+    <ol><li>Work on {html.escape(role)} tasks with the core team</li><li>Document and test your work</li></ol>
+  </div>
+  <div class="section_heading heading_5_5 skills_heading">Skill(s) required</div>
+  <div class="round_tabs_container">{skills}</div>
+  <div class="section_heading heading_5_5 who_can_apply">Who can apply</div>
+  <div class="text-container who_can_apply"><p>Only those candidates can apply who:</p><p>1. are available for the {type_}</p></div>
+</div>
+{apply_section}
+</body></html>"""
+
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Login</title></head>
+<body>
+<form method="post" action="/login/student">
+  <input type="email" id="email" name="email"/>
+  <input type="password" id="password" name="password"/>
+  <button type="submit" id="login_submit">Login</button>
+</form>
+</body></html>"""
+
+SESSION_COOKIE = "PHPSESSID"
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_html(self, body, status=200):
+        self.send_bytes(body.encode("utf-8"), "text/html; charset=utf-8", status)
+
+    def send_bytes(self, payload, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        with self.server.counter_lock:
+            self.server.requests_served += 1
+            self.server.bytes_served += len(payload)
+
+    def redirect(self, location, cookie=None):
+        self.send_response(302)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def logged_in(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value in self.server.sessions
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        path = self.path.split("?")[0].rstrip("/")
+        if path == "/login/student":
+            token = secrets.token_hex(16)
+            self.server.sessions.add(token)
+            self.server.logins += 1
+            return self.redirect("/student/dashboard", cookie=f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")
+        if path.startswith("/application/submit/") and self.logged_in():
+            time.sleep(self.server.submit_delay)
+            self.server.applications.append(path.rsplit("/", 1)[1])
+            return self.redirect("/student/matching-preferences")
+        self.send_html("<html><body>Not found</body></html>", status=404)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+
+        if path.rstrip("/") == "/login/student":
+            return self.send_html(LOGIN_PAGE)
+        if path.rstrip("/") == "/student/dashboard":
+            if not self.logged_in():
+                return self.redirect("/login/student")
+            return self.send_html("<html><body><h1>Dashboard</h1></body></html>")
+        if path.rstrip("/") == "/student/matching-preferences":
+            return self.send_html("<html><body><h1>Application submitted</h1></body></html>")
+
+        match = re.match(r"^/(internship|job)s/keywords-([^/]+)/(?:page-(\d+)/?)?$", path)
+        if match:
+            type_, keyword, page = match.groups()
+            page = int(page or 1)
+            self.server.listing_pages_served += 1
+            time.sleep(self.server.page_latency)
+            per_page = self.server.cards_per_page
+            count = per_page if page <= self.server.pages else 0
+            return self.send_html(render_listing_page(
+                type_, keyword, count, start=(page - 1) * per_page, revision=self.server.revision
+            ))
+
+        name = path[len("/assets/"):]
+        if path.startswith("/assets/") and name in ASSETS:
+            content_type, body = asset_body(name)
+            return self.send_bytes(body, content_type)
+        if path == "/gtag/js":
+            return self.send_bytes(b"window.dataLayer = [];" + b" " * TRACKER_SIZE, "application/javascript")
+
+        match = re.match(r"^/(internship|job)/detail/([^/]+)/?$", path)
+        if match:
+            type_, slug = match.groups()
+            apply_section = render_apply_section(
+                slug, self.logged_in(), slug in self.server.applications,
+                render_delay=self.server.render_delay, popup=self.server.popup,
+            )
+            if self.server.assets:
+                apply_section += render_assets()
+            return self.send_html(render_detail_page(type_, slug, apply_section))
+
+        self.send_html("<html><body>Not found</body></html>", status=404)
+
+
+class StandinSite:
+    """Serves the stand-in pages from a background thread on 127.0.0.1."""
+
+    def __init__(self, port=0, cards_per_page=40, pages=1, page_latency=0.0, render_delay=0.3, submit_delay=0.2,
+                 popup=True, assets=True):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+        self.server.daemon_threads = True
+        self.server.cards_per_page = cards_per_page
+        self.server.pages = pages
+        # Seconds each listing page takes, to make page concurrency visible
+        self.server.page_latency = page_latency
+        self.server.listing_pages_served = 0
+        # Bump to make some listings change between crawls
+        self.server.revision = 0
+        self.server.sessions = set()
+        self.server.logins = 0
+        # Apply flow: script delay before the apply button shows, server time to accept an application
+        self.server.render_delay = render_delay
+        self.server.submit_delay = submit_delay
+        self.server.popup = popup
+        self.server.applications = []
+        self.server.assets = assets
+        # Everything served, to compare what different browser profiles download
+        self.server.counter_lock = threading.Lock()
+        self.server.requests_served = 0
+        self.server.bytes_served = 0
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def expire_sessions(self):
+        """Log every client out, as if the site's sessions timed out."""
+        self.server.sessions.clear()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="standin-site", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the local Internshala stand-in.")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--cards", type=int, default=40, help="cards per listing page")
+    parser.add_argument("--pages", type=int, default=1, help="result pages per keyword")
+    args = parser.parse_args()
+
+    site = StandinSite(port=args.port, cards_per_page=args.cards, pages=args.pages)
+    print(f"🌐 Stand-in site on {site.base_url}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.stop()
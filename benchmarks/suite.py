@@ -0,0 +1,339 @@
+"""Offline end-to-end benchmarks for /analyze-resume, /scrape-jobs, /auto-apply and /pipeline.
+
+Starts the FastAPI app with uvicorn in this process, pointed at the local
+Internshala stand-in (listing, detail, login and apply pages) and the fake
+Together API, then drives it over HTTP like the frontend does. Each scenario
+reports p50/p95 latency and throughput; results are written as JSON to
+benchmarks/results/ so two runs can be compared. Everything the backend writes
+(listing store, ledger, session, logs) goes to a temporary directory.
+/auto-apply needs Chrome; without it that scenario is recorded as an error
+(the pipeline scenario still times the analysis and the crawl).
+
+    python -m benchmarks.suite --runs 10 --llm-latency 0.5
+    python -m benchmarks.suite --scenarios analyze-resume scrape-jobs
+    python -m benchmarks.suite --compare benchmarks/results/suite-20240101-120000.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from benchmarks.bench_resume_extract import make_pdf
+from benchmarks.fake_together import FakeTogether
+from benchmarks.standin import StandinSite
+
+SCENARIOS = ("analyze-resume", "scrape-jobs", "auto-apply", "pipeline")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+JOB_POLL_INTERVAL = 0.05
+READY_TIMEOUT = 120
+
+
+# === Statistics ===
+def percentile(samples, p):
+    """Nearest-rank percentile; fine for the handful of runs a scenario makes."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples, wall_seconds, errors, **extra):
+    summary = {"runs": len(samples), "errors": errors, "wall_seconds": round(wall_seconds, 3)}
+    if samples:
+        summary.update({
+            "p50_ms": round(percentile(samples, 50) * 1000, 1),
+            "p95_ms": round(percentile(samples, 95) * 1000, 1),
+            "mean_ms": round(statistics.mean(samples) * 1000, 1),
+            "max_ms": round(max(samples) * 1000, 1),
+            "requests_per_second": round(len(samples) / wall_seconds, 3) if wall_seconds else None,
+        })
+    summary.update(extra)
+    return summary
+
+
+def run_concurrently(fn, runs, concurrency):
+    """Calls fn(i) for every run; returns (latencies of successful runs, results, errors, wall seconds)."""
+    def timed(index):
+        start = time.perf_counter()
+        try:
+            result = fn(index)
+        except Exception as e:
+            return None, {"error": str(e)}
+        return time.perf_counter() - start, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        outcomes = list(executor.map(timed, range(runs)))
+    wall = time.perf_counter() - start
+
+    samples, results, errors = [], [], []
+    for seconds, result in outcomes:
+        if seconds is None or (isinstance(result, dict) and result.get("error")):
+            errors.append(result.get("error") if isinstance(result, dict) else str(result))
+        else:
+            samples.append(seconds)
+            results.append(result)
+    return samples, results, errors, wall
+
+
+# === App under test ===
+class Backend:
+    """The FastAPI app served by uvicorn from a background thread."""
+
+    def __init__(self):
+        import uvicorn
+        from backend.main import app
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, name="backend", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Backend failed to start.")
+            time.sleep(0.05)
+        # Time steady-state requests, not the startup prewarm
+        deadline = time.monotonic() + READY_TIMEOUT
+        while requests.get(f"{self.base_url}/ready", timeout=30).status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.2)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+    def run_job(self, path, body):
+        """POST a background job and wait for its result, as the frontend does."""
+        response = requests.post(f"{self.base_url}{path}", json=body, timeout=30).json()
+        if "job_id" not in response:
+            return response
+        job_id = response["job_id"]
+        while True:
+            status = requests.get(f"{self.base_url}/jobs/{job_id}", timeout=30).json()
+            if status.get("error") or status.get("status") in ("succeeded", "failed", "cancelled"):
+                break
+            time.sleep(JOB_POLL_INTERVAL)
+        return requests.get(f"{self.base_url}/jobs/{job_id}/result", timeout=30).json()
+
+
+# === Scenarios ===
+def bench_analyze_resume(backend, args):
+    """Distinct resumes, so every request parses the PDF and calls the (fake) LLM."""
+    run_id = int(time.time())
+    resumes = [make_pdf(args.resume_pages, 40, label=f"run {run_id} resume {i}") for i in range(args.runs)]
+
+    def upload(index):
+        files = {"resume": (f"resume-{index}.pdf", resumes[index], "application/pdf")}
+        return requests.post(f"{backend.base_url}/analyze-resume", files=files, timeout=120).json()
+
+    samples, results, errors, wall = run_concurrently(upload, args.runs, args.concurrency)
+    cached = sum(1 for result in results if result.get("cached"))
+    return summarize(samples, wall, errors, cached=cached, pages_per_resume=args.resume_pages)
+
+
+def bench_scrape_jobs(backend, args):
+    """One crawl per keyword; distinct keywords, so each run crawls the result pages cold."""
+    def scrape(index):
+        body = {"keyword": f"python developer {index}", "limit": args.scrape_limit, "max_pages": args.scrape_pages}
+        return backend.run_job("/scrape-jobs", body)
+
+    samples, results, errors, wall = run_concurrently(scrape, args.runs, args.concurrency)
+    listings = sum(len(result.get("internships", [])) for result in results)
+    return summarize(
+        samples, wall, errors,
+        listings=listings,
+        listings_per_second=round(listings / wall, 2) if wall else None,
+    )
+
+
+def bench_auto_apply(backend, args):
+    """Applies to listings the scrape scenario stored (scraped here first if it did not run)."""
+    if not requests.get(f"{backend.base_url}/ranked-listings", params={"limit": 1, "q": "python developer"}, timeout=30).json().get("listings"):
+        backend.run_job("/scrape-jobs", {"keyword": "python developer", "limit": args.scrape_limit,
+                                         "max_pages": args.scrape_pages})
+
+    def apply(_):
+        result = backend.run_job("/auto-apply", {"workers": args.apply_workers, "max_jobs": args.apply_jobs})
+        if result.get("status") != "success" or not result.get("applied"):
+            # A worker that could not start Chrome says why in its stats
+            worker_errors = [worker["error"] for worker in (result.get("stats") or {}).get("per_worker") or []
+                             if worker and worker.get("error")]
+            return {"error": (worker_errors or [result.get("error") or result.get("message") or "auto-apply failed"])[0]}
+        return result
+
+    # Runs share one ledger and one browser pool, so they go one after another
+    samples, results, errors, wall = run_concurrently(apply, args.apply_runs, 1)
+    applied = sum(len(result.get("applied", [])) for result in results)
+    seconds_per_application = [
+        result["stats"]["seconds_per_application"] for result in results
+        if result.get("stats", {}).get("seconds_per_application")
+    ]
+    return summarize(
+        samples, wall, errors,
+        applied=applied,
+        applications_per_minute=round(applied / wall * 60, 2) if wall else None,
+        p50_seconds_per_application=percentile(seconds_per_application, 50) if seconds_per_application else None,
+        workers=args.apply_workers,
+    )
+
+
+def bench_pipeline(backend, args):
+    """/pipeline with a distinct resume per run; compares its wall time with the sum of its stages."""
+    run_id = int(time.time())
+    resumes = [make_pdf(args.resume_pages, 40, label=f"run {run_id} pipeline {i}") for i in range(args.apply_runs)]
+
+    def pipeline(index):
+        files = {"resume": (f"resume-{index}.pdf", resumes[index], "application/pdf")}
+        data = {"limit": args.scrape_limit, "max_pages": args.scrape_pages, "workers": args.apply_workers,
+                "max_jobs": args.apply_jobs}
+        with requests.post(f"{backend.base_url}/pipeline", files=files, data=data, stream=True, timeout=600) as response:
+            for line in response.iter_lines():
+                event = json.loads(line)
+                if event.get("event") == "summary" or "error" in event:
+                    return event
+        return {"error": "pipeline stream ended without a summary"}
+
+    # Runs share one ledger and one browser pool, so they go one after another
+    samples, results, errors, wall = run_concurrently(pipeline, args.apply_runs, 1)
+    total = [result["total_seconds"] for result in results]
+    sequential = [result["sequential_seconds"] for result in results]
+    return summarize(
+        samples, wall, errors,
+        p50_total_seconds=percentile(total, 50) if total else None,
+        p50_sequential_seconds=percentile(sequential, 50) if sequential else None,
+        applied=sum(len(result["apply"].get("applied", [])) for result in results),
+        # A worker that could not start Chrome says why in its stats
+        apply_errors=[worker["error"] for result in results
+                      for worker in (result["apply"].get("stats") or {}).get("per_worker") or []
+                      if worker and worker.get("error")],
+    )
+
+
+SCENARIO_RUNNERS = {
+    "analyze-resume": bench_analyze_resume,
+    "scrape-jobs": bench_scrape_jobs,
+    "auto-apply": bench_auto_apply,
+    "pipeline": bench_pipeline,
+}
+
+
+# === Results ===
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR), timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(previous, current):
+    print(f"\n📊 Compared with {previous['meta'].get('timestamp')} ({previous['meta'].get('commit')})")
+    for name, now in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before or "p50_ms" not in before or "p50_ms" not in now:
+            print(f"  {name}: no comparable result")
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms"):
+            delta = (now[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            changes.append(f"{key[:3]} {before[key]:.0f} → {now[key]:.0f} ms ({delta:+.0f}%)")
+        print(f"  {name}: " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--runs", type=int, default=10, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight at once")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake completion")
+    parser.add_argument("--page-latency", type=float, default=0.1, help="seconds per stand-in result page")
+    parser.add_argument("--cards", type=int, default=40, help="cards per stand-in result page")
+    parser.add_argument("--pages", type=int, default=3, help="result pages on the stand-in")
+    parser.add_argument("--resume-pages", type=int, default=2)
+    parser.add_argument("--scrape-limit", type=int, default=20)
+    parser.add_argument("--scrape-pages", type=int, default=3)
+    parser.add_argument("--apply-runs", type=int, default=2)
+    parser.add_argument("--apply-jobs", type=int, default=3, help="applications per auto-apply run")
+    parser.add_argument("--apply-workers", type=int, default=1)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/suite-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"suite-{timestamp}.json"))
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeTogether(latency=args.llm_latency) as fake, \
+            StandinSite(cards_per_page=args.cards, pages=args.pages, page_latency=args.page_latency) as site:
+        os.environ.update({
+            "INTERNSHALA_BASE_URL": site.base_url,
+            "INTERNSHALA_EMAIL": "bench@example.com",
+            "INTERNSHALA_PASSWORD": "bench",
+            "TOGETHER_BASE_URL": fake.base_url,
+            "TOGETHER_API_KEY": "fake-key",
+            "DETAIL_FETCH_MODE": "http",
+            "APPLY_RATE_PER_MINUTE": os.getenv("APPLY_RATE_PER_MINUTE", "600"),
+            "APPLY_BURST": os.getenv("APPLY_BURST", str(args.apply_jobs)),
+        })
+        # Relative paths (store, ledger, session file, logs) all land in the temporary directory
+        cwd = os.getcwd()
+        os.chdir(tmp)
+
+        results = {
+            "meta": {
+                "timestamp": timestamp,
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "settings": vars(args),
+            },
+            "scenarios": {},
+        }
+        try:
+            with Backend() as backend:
+                for name in SCENARIOS:
+                    if name not in args.scenarios:
+                        continue
+                    print(f"▶️ {name} ...", flush=True)
+                    llm_calls = fake.calls
+                    summary = SCENARIO_RUNNERS[name](backend, args)
+                    summary["llm_calls"] = fake.calls - llm_calls
+                    results["scenarios"][name] = summary
+                    if "p50_ms" in summary:
+                        print(f"  {summary['runs']} ok, {len(summary['errors'])} failed: p50 {summary['p50_ms']:.0f} ms, "
+                              f"p95 {summary['p95_ms']:.0f} ms, {summary['requests_per_second']:.2f} req/s")
+                    else:
+                        print(f"  no successful runs: {summary['errors'][:1]}")
+        finally:
+            os.chdir(cwd)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+    if previous is not None:
+        compare(previous, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import streamlit as st
 import requests
+import json
+
+from job_client import submit_and_wait
 
 st.set_page_config(page_title="AI Resume Internship Matcher", layout="centered")
 st.title("🎯 AI Resume Internship Matcher")
@@ -51,23 +54,38 @@ if st.session_state.job_titles:
 
 # === Step 3: Scrape Internshala Internships ===
 if st.session_state.selected_title and st.button("🔎 Scrape Internships"):
+    st.session_state.internships = []
+    live_placeholder = st.empty()
+    live_results = live_placeholder.container()
     with st.spinner(f"Searching internships for '{st.session_state.selected_title}'..."):
         try:
-            response = requests.post("http://localhost:8000/scrape-jobs", json={"keyword": st.session_state.selected_title})
-            if response.status_code == 200:
-                data = response.json()
-                if "error" in data:
-                    st.error(f"❌ Error: {data['error']}")
+            # Listings arrive one per line (NDJSON) as soon as the scraper accepts them
+            with requests.post(
+                "http://localhost:8000/scrape-jobs/stream",
+                json={"keyword": st.session_state.selected_title},
+                stream=True,
+            ) as response:
+                if response.status_code != 200:
+                    st.error("❌ Server error during scraping.")
+                elif not response.headers.get("content-type", "").startswith("application/x-ndjson"):
+                    st.error(f"❌ Error: {response.json().get('error', 'Unknown error')}")
                 else:
-                    st.session_state.internships = data.get("internships", [])
-                    if st.session_state.internships:
-                        st.success(f"✅ Found {len(st.session_state.internships)} internships")
-                    else:
-                        st.warning("⚠️ No internships found.")
-            else:
-                st.error("❌ Server error during scraping.")
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        event = json.loads(line)
+                        if event["event"] == "listing" and event["type"] == "internship":
+                            internship = event["listing"]
+                            st.session_state.internships.append(internship)
+                            live_results.markdown(f"🔹 **{internship.get('Title', 'No Title')}** at *{internship.get('Company', 'Unknown')}*")
+                        elif event["event"] == "summary":
+                            if st.session_state.internships:
+                                st.success(f"✅ Found {len(st.session_state.internships)} internships")
+                            else:
+                                st.warning("⚠️ No internships found.")
         except Exception as e:
             st.error(f"❌ Exception during scraping: {e}")
+    live_placeholder.empty()
 
 # === Step 4: Display Internships ===
 if st.session_state.internships:
@@ -82,7 +100,10 @@ if st.session_state.internships:
 if st.session_state.internships and st.button("🚀 Auto Apply to Top Internship"):
     with st.spinner("Submitting your application automatically..."):
         try:
-            response = requests.post("http://localhost:8000/auto-apply")
+            # Rank the stored internships against this resume
+            response = submit_and_wait(
+                "http://localhost:8000/auto-apply", json={"resume_id": st.session_state.result.get("resume_id")}
+            )
             if response.status_code == 200:
                 result = response.json()
                 if result.get("status") == "success":
@@ -97,6 +118,13 @@ if st.session_state.internships and st.button("🚀 Auto Apply to Top Internship
                             🔗 [Link]({job['link']})  
                             🕒 {job['timestamp']}
                             """)
+
+                    stats = result.get("stats") or {}
+                    if stats.get("applied"):
+                        st.caption(
+                            f"⏱️ {stats['applied']} application(s) in {stats['seconds']}s on {stats['workers']} worker(s) "
+                            f"({stats['applications_per_minute']}/min)"
+                        )
                 else:
                     st.error("❌ Auto-apply failed.")
                     st.text(result.get("message", "Unknown error"))
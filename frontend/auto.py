@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import json
 import time
 
 st.set_page_config(page_title="AI Resume Internship Applier", layout="centered")
@@ -20,73 +21,57 @@ if resume_file:
         total_start = time.time()
 
         try:
-            # === Step 1: Resume Parsing ===
-            parse_start = time.time()
-            with st.spinner("📄 Parsing resume..."):
-                res = requests.post("http://localhost:8000/analyze-resume", files={"resume": resume_file})
-            parse_end = time.time()
-
-            if res.status_code != 200:
-                st.error("❌ Resume parsing failed.")
-                st.stop()
-
-            data = res.json()
-            if "error" in data:
-                st.error(f"❌ Resume parse error: {data['error']}")
+            # One server-side run: scraping starts once the top title is parsed, applying once the first internship is found
+            stage_names = {"analyze": "📄 Resume parsed", "scrape": "🔎 Internships scraped", "apply": "🚀 Auto-apply finished"}
+            progress = st.empty()
+            summary = None
+            st.session_state.internships = []
+            with st.spinner("📄 Parsing resume, searching and applying..."):
+                with requests.post(
+                    "http://localhost:8000/pipeline",
+                    files={"resume": (resume_file.name, resume_file.getvalue())},
+                    stream=True,
+                ) as response:
+                    if response.status_code != 200:
+                        st.error("❌ Pipeline API error.")
+                        st.stop()
+                    if not response.headers.get("content-type", "").startswith("application/x-ndjson"):
+                        st.error(f"❌ Error: {response.json().get('error', 'Unknown error')}")
+                        st.stop()
+
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        event = json.loads(line)
+                        if event["event"] == "title" and event["index"] == 0:
+                            st.session_state.selected_title = event["title"]
+                            st.info(f"✅ Top job title selected: **{event['title']}**")
+                        elif event["event"] == "listing" and event["type"] == "internship":
+                            st.session_state.internships.append(event["listing"])
+                            progress.caption(f"🎯 {len(st.session_state.internships)} internships found so far")
+                        elif event["event"] == "stage" and event["status"] == "finished":
+                            st.success(f"{stage_names.get(event['stage'], event['stage'])} at {event['at']:.2f} sec")
+                        elif event["event"] == "summary":
+                            summary = event
+
+            if summary is None or summary.get("error"):
+                st.error(f"❌ Pipeline failed: {(summary or {}).get('error', 'no result')}")
                 st.stop()
 
-            st.success(f"✅ Resume parsed in {parse_end - parse_start:.2f} sec")
-
-            st.session_state.job_titles = data.get("job_titles", [])
-            st.session_state.result = data
-
+            st.session_state.job_titles = summary.get("job_titles", [])
+            st.session_state.result = summary
             if not st.session_state.job_titles:
                 st.warning("⚠️ No job titles found in resume.")
                 st.stop()
-
-            # === Step 2: Auto-select Top Title ===
-            st.session_state.selected_title = st.session_state.job_titles[0]
-            st.info(f"✅ Top job title selected: **{st.session_state.selected_title}**")
-
-            # === Step 3: Internship Scraping ===
-            scrape_start = time.time()
-            with st.spinner("🔎 Fetching internships..."):
-                response = requests.post(
-                    "http://localhost:8000/scrape-jobs",
-                    json={"keyword": st.session_state.selected_title}
-                )
-            scrape_end = time.time()
-
-            if response.status_code != 200:
-                st.error("❌ Internship scraping failed.")
-                st.stop()
-
-            jobs = response.json()
-            st.session_state.internships = jobs.get("internships", [])
-
             if not st.session_state.internships:
                 st.warning("⚠️ No internships found.")
                 st.stop()
 
-            st.success(f"🎯 {len(st.session_state.internships)} internships found in {scrape_end - scrape_start:.2f} sec")
-
-            # === Step 4: Auto Apply ===
-            apply_start = time.time()
-            with st.spinner("🚀 Applying to top internships..."):
-                auto_res = requests.post("http://localhost:8000/auto-apply")
-            apply_end = time.time()
-
-            if auto_res.status_code != 200:
-                st.error("❌ Auto-apply API error.")
-                st.stop()
-
-            result = auto_res.json()
+            result = summary.get("apply") or {}
             if result.get("status") != "success":
-                st.error("❌ Auto-apply failed.")
+                st.error(f"❌ Auto-apply failed: {result.get('message', 'unknown error')}")
                 st.stop()
 
-            st.success(f"✅ Application submitted in {apply_end - apply_start:.2f} sec")
-
             applied_jobs = result.get("applied", [])
             if applied_jobs:
                 st.markdown("### ✅ Applied Internships")
@@ -96,6 +81,13 @@ if resume_file:
                     🔗 [Link]({job['link']})  
                     🕒 {job['timestamp']}
                     """)
+            else:
+                st.warning(result.get("message", "No applications were submitted."))
+
+            stages = summary.get("stages", {})
+            st.caption(" · ".join(
+                f"{name}: {stage['seconds']:.1f}s" for name, stage in stages.items() if "seconds" in stage
+            ) + f" — {summary['sequential_seconds']:.1f}s one after another, {summary['total_seconds']:.1f}s overlapped")
 
         except Exception as e:
             st.error(f"❌ Exception occurred: {e}")
@@ -0,0 +1,44 @@
+import requests
+import time
+
+API_URL = "http://localhost:8000"
+# Seconds to wait for a background job before giving up, and for each status request.
+JOB_TIMEOUT = 900
+REQUEST_TIMEOUT = 10
+
+
+class JobWaitError(Exception):
+    """The job could not be followed to the end: timed out, unknown to the backend, or status unreadable."""
+
+
+# === Background job helper ===
+def submit_and_wait(url, poll_interval=2, timeout=JOB_TIMEOUT, **kwargs):
+    """POST a long-running request, then poll its background job and return the result response.
+
+    Raises JobWaitError when the job does not finish within `timeout` seconds or its
+    status cannot be read (backend restarted, network error, non-JSON reply).
+    """
+    response = requests.post(url, **kwargs)
+    if response.status_code != 200 or "job_id" not in response.json():
+        return response
+
+    job_id = response.json()["job_id"]
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reply = requests.get(f"{API_URL}/jobs/{job_id}", timeout=REQUEST_TIMEOUT)
+            status = reply.json() if reply.status_code == 200 else None
+        except (requests.RequestException, ValueError) as e:
+            raise JobWaitError(f"Could not read the status of job {job_id}: {e}") from e
+        if status is None:
+            raise JobWaitError(f"Status request for job {job_id} failed with HTTP {reply.status_code}.")
+        # Job status always carries an "error" key; it is only set once the job failed or is unknown
+        if status.get("error") and "status" not in status:
+            # Unknown job: the backend restarted and lost its queue
+            raise JobWaitError(status["error"])
+        if status.get("error") or status.get("status") in ("succeeded", "failed", "cancelled"):
+            break
+        if time.monotonic() >= deadline:
+            raise JobWaitError(f"Job {job_id} did not finish within {timeout}s.")
+        time.sleep(poll_interval)
+    return requests.get(f"{API_URL}/jobs/{job_id}/result", timeout=REQUEST_TIMEOUT)